@@ -0,0 +1,182 @@
+import time
+import random
+import threading
+
+import config
+import events
+import odds
+import scoring
+
+# --- Shop Advisor ---
+# While the shop is open, a daemon thread plays simulated rounds from the player's own
+# deck (modifiers included): once with the current loadout and once per offer bought.
+# Every variant plays the same shuffles, so each offer's estimate is a paired difference
+# and settles after a few hundred rounds instead of thousands. Estimates are published
+# after every batch, and the thread stops as soon as the shop closes.
+
+BATCH_SIZE = 40             # Rounds between publishes (and cancellation checks)
+MAX_SAMPLES = 4000
+TARGET_ERROR = 0.02         # Stop early once every offer is within 2% of a base hand
+BATCH_PAUSE = 0.002         # Seconds handed back to the render thread between batches
+
+class OfferEstimate:
+    """ One offer's numbers so far. Replaced, never mutated, so a reader can't see half an update. """
+    __slots__ = ("samples", "hand_delta", "hand_error", "clear_base", "clear_with", "done")
+
+    def __init__(self, samples, hand_delta, hand_error, clear_base, clear_with, done):
+        self.samples = samples
+        self.hand_delta = hand_delta        # Mean change in score per hand played
+        self.hand_error = hand_error        # Standard error of that mean
+        self.clear_base = clear_base        # Chance to clear the next target without the offer
+        self.clear_with = clear_with        # ... and with it
+        self.done = done
+
+    def lines(self):
+        """ Tooltip text """
+        status = "" if self.done else ", refining"
+        return [f"Per hand: {self.hand_delta:+.0f} ±{self.hand_error:.0f}",
+                f"Clear next: {self.clear_base:.0%} -> {self.clear_with:.0%}",
+                f"({self.samples} sim rounds{status})"]
+
+class Variant:
+    """ One loadout to simulate: the current one, or the current one plus an offer """
+    __slots__ = ("scorer", "hands_max", "coins", "is_pack")
+
+    def __init__(self, joker_keys, coins, is_pack=False):
+        bus = events.EventBus()
+        bus.rebuild(joker_keys)
+        self.scorer = scoring.compile_scorer(tuple(sorted(joker_keys)))
+        self.hands_max = bus.emit("on_round_start", events.round_start_ctx(config.BASE_HANDS_TO_PLAY, config.MAX_DISCARDS))["hands_max"]
+        self.coins = coins
+        self.is_pack = is_pack
+
+def play_round(order, variant, run_discards):
+    """ Fills the hand from the top of `order` and plays it, hands_max times.
+    Returns (total score, hands played). """
+    hand_size = config.MAX_HAND_SIZE
+    scorer = variant.scorer
+    remaining = len(order)
+    total = played = pos = 0
+    for _ in range(variant.hands_max):
+        if pos >= remaining:
+            break
+        hand = order[pos:pos + hand_size]
+        pos += len(hand)
+        base, mult, _, _ = scorer(hand, run_discards, remaining - pos, variant.coins)
+        total += base * mult
+        played += 1
+    return total, played
+
+def open_pack(deck, rng):
+    """ Simulated pack: same draw as ShopManager, picked like the heuristic bot would
+    (mult over chips, on the two highest cards; never destroy). Returns a new deck list. """
+    chosen = rng.sample(range(len(deck)), min(8, len(deck)))
+    mods = rng.sample(list(config.MODIFIER_DATA), 2)
+    useful = [m for m in mods if m != "destroy"]
+    if not useful:
+        return deck
+    mod = "mult_plus" if "mult_plus" in useful else useful[0]
+    deck = list(deck)
+    for i in sorted(chosen, key=lambda i: deck[i].value, reverse=True)[:2]:
+        deck[i] = deck[i]._replace(modifier=mod)
+    return deck
+
+class ShopAdvisor:
+    def __init__(self):
+        self.estimates = {}         # Offer key ("Pack" or joker key) -> OfferEstimate
+        self.cancel_event = None
+        self.thread = None
+
+    def start(self, deck, jokers, offers, coins, run_discards, next_target):
+        """ Restarts the estimates for a shop. `deck` is the valid master deck as OddsCards;
+        everything else is plain data, so the thread never touches sprites. """
+        self.cancel()
+        self.cancel_event = threading.Event()
+        self.estimates = {}
+        self.thread = threading.Thread(
+            target=self._run, name="shop-advisor", daemon=True,
+            args=(list(deck), list(jokers), list(dict.fromkeys(offers)), coins, run_discards, next_target,
+                  self.cancel_event, self.estimates))
+        self.thread.start()
+
+    def cancel(self):
+        """ Stops the worker at its next batch; never waits for it """
+        if self.cancel_event:
+            self.cancel_event.set()
+        self.cancel_event = None
+        self.thread = None
+        self.estimates = {}
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def estimate(self, key):
+        return self.estimates.get(key)
+
+    def _run(self, deck, jokers, offers, coins, run_discards, next_target, cancel, results):
+        try:
+            self._simulate(deck, jokers, offers, coins, run_discards, next_target, cancel, results)
+        except Exception as e:
+            print(f"Warning: Shop advisor stopped. {e}")
+
+    def _simulate(self, deck, jokers, offers, coins, run_discards, next_target, cancel, results):
+        if not deck or not offers:
+            return
+        rng = random.Random()
+        base = Variant(jokers, coins)
+        variants = {}
+        for key in offers:
+            if key == "Pack":
+                variants[key] = Variant(jokers, coins - config.PACK_COST, is_pack=True)
+            else:
+                variants[key] = Variant(jokers + [key], coins - config.JOKER_DATA[key]["cost"])
+
+        # Running sums per offer: [sum of deltas, sum of squared deltas, rounds cleared]
+        sums = {key: [0.0, 0.0, 0] for key in variants}
+        base_sum = 0.0
+        base_cleared = 0
+        order_index = list(range(len(deck)))
+        n = 0
+
+        while n < MAX_SAMPLES and not cancel.is_set():
+            for _ in range(BATCH_SIZE):
+                rng.shuffle(order_index)
+                order = [deck[i] for i in order_index]
+                base_total, base_played = play_round(order, base, run_discards)
+                base_hand = base_total / max(1, base_played)
+                base_sum += base_hand
+                base_cleared += base_total >= next_target
+
+                for key, variant in variants.items():
+                    if variant.is_pack:
+                        packed = open_pack(deck, rng)
+                        total, played = play_round([packed[i] for i in order_index], variant, run_discards)
+                    else:
+                        total, played = play_round(order, variant, run_discards)
+                    delta = total / max(1, played) - base_hand
+                    acc = sums[key]
+                    acc[0] += delta
+                    acc[1] += delta * delta
+                    acc[2] += total >= next_target
+                n += 1
+
+            # Publish, then stop early once every estimate is tight enough
+            scale = max(1.0, base_sum / n)
+            settled = True
+            for key, (s, s2, cleared) in sums.items():
+                mean = s / n
+                error = (max(0.0, s2 / n - mean * mean) / n) ** 0.5
+                settled = settled and error <= TARGET_ERROR * scale
+                results[key] = OfferEstimate(n, mean, error, base_cleared / n, cleared / n, False)
+            if settled or n >= MAX_SAMPLES:
+                break
+            time.sleep(BATCH_PAUSE)
+
+        if not cancel.is_set():
+            for key, est in list(results.items()):
+                results[key] = OfferEstimate(est.samples, est.hand_delta, est.hand_error,
+                                             est.clear_base, est.clear_with, True)
+
+def deck_cards(cards):
+    """ Plain copies of the sprites the advisor samples from """
+    return [odds.OddsCard(c.value, c.suit, c.modifier) for c in cards]
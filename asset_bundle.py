@@ -0,0 +1,185 @@
+import io
+import os
+import sys
+import json
+import mmap
+import struct
+
+import config
+
+# --- Bundle Layout ---
+# [MAGIC][version u32][index length u32][index json][blobs...]
+# Blob offsets in the index are absolute, so a lookup is a single slice of the mmap.
+MAGIC = b"WLTB"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+
+# Joker art is only ever drawn at JOKER_SCALE or smaller, so store it at that size
+ATLAS_COLUMNS = 7
+ATLAS_PADDING = 2
+
+class AssetBundle:
+    """ Read-only view over a memory-mapped asset bundle built by this module """
+    def __init__(self, file_obj):
+        self.file = file_obj
+        self.mm = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_len = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unsupported asset bundle (magic={magic!r}, version={version})")
+        self.index = json.loads(self.mm[HEADER.size:HEADER.size + index_len].decode("utf-8"))
+        self.atlas_scale = self.index["atlas"]["scale"]
+        self._atlas_image = None
+        self._textures = {}
+
+    @classmethod
+    def open(cls, path):
+        """ Returns the bundle, or None if it doesn't exist (dev runs use loose files) """
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(open(path, "rb"))
+        except Exception as e:
+            print(f"Warning: Asset bundle unreadable, using loose files. {e}")
+            return None
+
+    def _blob(self, entry):
+        return memoryview(self.mm)[entry["offset"]:entry["offset"] + entry["size"]]
+
+    # --- Textures ---
+    def atlas_image(self):
+        if self._atlas_image is None:
+            from PIL import Image
+            atlas = self.index["atlas"]
+            size = (atlas["width"], atlas["height"])
+            if atlas["format"] == "rgba":
+                # Raw pixels: no decode at all, PIL reads straight out of the mmap
+                self._atlas_image = Image.frombuffer("RGBA", size, self._blob(atlas), "raw", "RGBA", 0, 1)
+            else:
+                self._atlas_image = Image.open(io.BytesIO(self._blob(atlas))).convert("RGBA")
+        return self._atlas_image
+
+    def has_joker(self, key):
+        return key in self.index["jokers"]
+
+    def joker_texture(self, key):
+        """ Cropped atlas region as an arcade Texture (cached) """
+        if key not in self._textures:
+            import arcade
+            x, y, w, h = self.index["jokers"][key]
+            image = self.atlas_image().crop((x, y, x + w, y + h))
+            self._textures[key] = arcade.Texture(image, hash=f"bundle:joker:{key}")
+        return self._textures[key]
+
+    # --- Audio ---
+    def has_sfx(self, name):
+        return name in self.index["sfx"]
+
+    def sfx_pcm(self, name):
+        """ Returns (pcm_bytes, channels, sample_size, sample_rate) """
+        entry = self.index["sfx"][name]
+        return bytes(self._blob(entry)), entry["channels"], entry["sample_size"], entry["sample_rate"]
+
+    def close(self):
+        self._atlas_image = None
+        self.mm.close()
+        self.file.close()
+
+# --- Build Step ---
+def pack_joker_atlas(raw=False):
+    """ Resizes every joker to display size and packs them into one grid image """
+    from PIL import Image
+
+    tiles = {}
+    for key, data in config.JOKER_DATA.items():
+        img = Image.open(data["file"]).convert("RGBA")
+        size = (max(1, round(img.width * config.JOKER_SCALE)), max(1, round(img.height * config.JOKER_SCALE)))
+        tiles[key] = img.resize(size, Image.LANCZOS)
+
+    cell_w = max(t.width for t in tiles.values()) + ATLAS_PADDING
+    cell_h = max(t.height for t in tiles.values()) + ATLAS_PADDING
+    rows = (len(tiles) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+    atlas = Image.new("RGBA", (cell_w * ATLAS_COLUMNS, cell_h * rows), (0, 0, 0, 0))
+
+    uv_index = {}
+    for i, (key, tile) in enumerate(tiles.items()):
+        x = (i % ATLAS_COLUMNS) * cell_w
+        y = (i // ATLAS_COLUMNS) * cell_h
+        atlas.paste(tile, (x, y))
+        uv_index[key] = [x, y, tile.width, tile.height]
+
+    if raw:
+        blob, fmt = atlas.tobytes(), "rgba"
+    else:
+        buf = io.BytesIO()
+        atlas.convert("RGB").save(buf, "JPEG", quality=90)
+        blob, fmt = buf.getvalue(), "jpeg"
+    meta = {"width": atlas.width, "height": atlas.height, "format": fmt, "scale": config.JOKER_SCALE}
+    return blob, meta, uv_index
+
+def decode_sfx(path):
+    import pyglet
+    source = pyglet.media.load(path, streaming=False)
+    fmt = source.audio_format
+    data = source.get_queue_source().get_audio_data(int(source.duration * fmt.bytes_per_second) + fmt.bytes_per_sample).data
+    return data, {"channels": fmt.channels, "sample_size": fmt.sample_size, "sample_rate": fmt.sample_rate}
+
+def build_bundle(out_path, raw_atlas=False):
+    import systems
+
+    blobs = []
+    atlas_blob, atlas_meta, uv_index = pack_joker_atlas(raw_atlas)
+    blobs.append(("atlas", atlas_blob, atlas_meta))
+
+    for name, path in systems.AudioManager.SFX_FILES.items():
+        try:
+            pcm, fmt = decode_sfx(path)
+        except Exception as e:
+            # The runtime falls back to the loose mp3 for anything missing here
+            print(f"Warning: Skipping SFX '{name}', could not decode {path}. {e}")
+            continue
+        blobs.append((name, pcm, fmt))
+
+    # Offsets depend on the index length, so lay out blobs relative first and fix up after
+    index = {"atlas": None, "jokers": uv_index, "sfx": {}}
+    relative = 0
+    for name, blob, meta in blobs:
+        entry = dict(meta, offset=relative, size=len(blob))
+        if name == "atlas":
+            index["atlas"] = entry
+        else:
+            index["sfx"][name] = entry
+        relative += len(blob)
+
+    def encode(idx):
+        return json.dumps(idx, separators=(",", ":")).encode("utf-8")
+
+    # The index length can change once the offsets grow, so iterate until it's stable
+    data_start = HEADER.size + len(encode(index))
+    while True:
+        shifted = json.loads(encode(index))
+        shifted["atlas"]["offset"] += data_start
+        for entry in shifted["sfx"].values():
+            entry["offset"] += data_start
+        encoded = encode(shifted)
+        if HEADER.size + len(encoded) == data_start:
+            break
+        data_start = HEADER.size + len(encoded)
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(encoded)))
+        f.write(encoded)
+        for _, blob, _ in blobs:
+            f.write(blob)
+    os.replace(tmp_path, out_path)
+    return os.path.getsize(out_path)
+
+def main():
+    raw = "--raw" in sys.argv
+    out_path = config.ASSET_BUNDLE
+    size = build_bundle(out_path, raw_atlas=raw)
+    loose = sum(os.path.getsize(d["file"]) for d in config.JOKER_DATA.values())
+    print(f"Wrote {out_path} ({size / 1024:.0f} KB, loose joker art was {loose / 1024:.0f} KB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import sys
+import time
+import random
+import argparse
+import importlib.util
+import subprocess
+
+import config
+import scoring
+
+# --- Hand Evaluation Benchmark ---
+# Per-hand cost of get_hand_type and a compiled scorer as hands grow, dealt from a
+# multi-deck shoe. Pass --baseline <git rev> to time that revision's scoring.py
+# alongside (only on the hand sizes it supports).
+
+LOADOUT = ("face_value", "multi_python", "odd_todd", "pear_up", "rainbow_trout")
+
+class BenchCard:
+    __slots__ = ("suit", "rank", "value", "modifier")
+
+    def __init__(self, suit, rank, modifier):
+        self.suit = suit
+        self.rank = rank
+        self.value = config.RANKS.index(rank) + 2
+        self.modifier = modifier
+
+def make_shoe(decks, rng):
+    mods = [None] * 8 + list(config.MODIFIER_DATA)
+    return [BenchCard(s, r, rng.choice(mods)) for _ in range(decks) for s in config.SUITS for r in config.RANKS]
+
+def load_baseline(rev):
+    source = subprocess.run(["git", "show", f"{rev}:scoring.py"], capture_output=True, text=True, check=True).stdout
+    spec = importlib.util.spec_from_loader("baseline_scoring", loader=None)
+    module = importlib.util.module_from_spec(spec)
+    exec(source, module.__dict__)
+    return module
+
+def time_per_call(fn, hands, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for hand in hands:
+            fn(hand)
+        best = min(best, time.perf_counter() - start)
+    return best / len(hands) * 1e9
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hand evaluation cost by hand size")
+    parser.add_argument("--decks", type=int, default=4)
+    parser.add_argument("--sizes", default="5,7,9,11,13,15")
+    parser.add_argument("--hands", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", help="Git revision to compare against, e.g. HEAD~1")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    shoe = make_shoe(args.decks, rng)
+    scorer = scoring.compile_scorer(LOADOUT)
+    old = load_baseline(args.baseline) if args.baseline else None
+    old_scorer = None
+    if old is not None and hasattr(old, "compile_scorer"):
+        old_scorer = old.compile_scorer(LOADOUT)
+
+    header = f"{'cards':>5} {'type ns':>9} {'score ns':>9}"
+    if old:
+        header += f" {'old type':>9} {'old score':>9}"
+    print(f"{args.decks}-deck shoe, {args.hands} hands per size", file=sys.stderr)
+    print(header)
+    for size in (int(s) for s in args.sizes.split(",")):
+        hands = [rng.sample(shoe, size) for _ in range(args.hands)]
+        row = (f"{size:>5} {time_per_call(scoring.get_hand_type, hands, args.repeat):>9.0f}"
+               f" {time_per_call(lambda h: scorer(h, 0, 20, 10), hands, args.repeat):>9.0f}")
+        if old:
+            # The old evaluator only understood single-deck hands of up to 5 cards
+            if size <= 5:
+                row += f" {time_per_call(old.get_hand_type, hands, args.repeat):>9.0f}"
+                if old_scorer:
+                    row += f" {time_per_call(lambda h: old_scorer(h, 0, 20, 10), hands, args.repeat):>9.0f}"
+            else:
+                row += f" {'-':>9} {'-':>9}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import arcade
 import sys
 import os
 
@@ -9,6 +8,13 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+# Saves live in the user's home; _MEIPASS is read-only in the packaged build
+SAVE_DIR = os.path.join(os.path.expanduser("~"), ".warlatro")
+SAVE_FILE = os.path.join(SAVE_DIR, "save.json")
+SNAPSHOT_FILE = os.path.join(SAVE_DIR, "run.snap")
+HISTORY_FILE = os.path.join(SAVE_DIR, "history.db")
+PROFILE_DIR = os.path.join(SAVE_DIR, "profiles")
+
 # --- Constants ---
 SCREEN_WIDTH = 1780
 SCREEN_HEIGHT = 940
@@ -27,13 +33,59 @@ DRAWN_CARD_Y = 480
 
 STIFFNESS = 0.1  
 DAMPING = 0.75   
+PHYSICS_REFERENCE_RATE = 60  # STIFFNESS/DAMPING were tuned for one step per 1/60s
+FLY_OFF_TIME = 0.45         # Played/discarded cards leaving the screen
+SPASM_FADE_TIME = 0.7       # Destroyed cards jitter and fade out (was 6 alpha per 1/60s)
+
+# --- Fixed Timestep ---
+SIM_RATE = 60           # Simulation steps per second (30 is fine on weak machines)
+SIM_DT = 1 / SIM_RATE
+MAX_SIM_STEPS = 8       # Cap per update so a long hitch doesn't spiral
 
 FLOAT_SPEED = 3.0       
 FLOAT_RANGE = 3.0       
 JOKER_ROT_SPEED = 2.0   
 JOKER_ROT_RANGE = 3.0   
+GPU_IDLE_ANIMATION = True   # Bob / sway in the sprite vertex shader; False computes it per sprite in Python
+
+# --- Idle Throttling ---
+ACTIVE_UPDATE_RATE = 1 / 60
+IDLE_UPDATE_RATE = 1 / 10   # Low tick once the scene has settled
+IDLE_TIMEOUT = 2.0          # Seconds without input before we consider going idle
+REST_EPSILON = 0.05         # Max leftover velocity/distance for a sprite to count as "at rest"
+
+# --- Frame Profiling ---
+PROFILE_KEY_FRAMES = 120    # Frames captured per F9 press
+PROFILE_ENV = "WARLATRO_PROFILE_FRAMES"     # Set to N to capture the first N frames on launch
+
+# --- Memory Diagnostics ---
+DIAGNOSTICS_ENV = "WARLATRO_DIAGNOSTICS"    # Set to 1 to log memory at every state change
+DIAG_TRACE_FRAMES = 10      # Stack depth tracemalloc keeps per allocation
+DIAG_TOP_LINES = 8          # Growth lines printed per diff
+DIAG_GROWTH_WINDOW = 5      # Round starts in a row that must all grow before warning
+DIAG_GROWTH_BYTES = 16 * 1024
 
-MAX_HAND_SIZE = 5
+# --- Spectator Stream ---
+SPECTATE_ENV = "WARLATRO_SPECTATE"      # Set to 1 (or a port number) to publish the game
+SPECTATE_HOST = "127.0.0.1"
+SPECTATE_PORT = 8766
+SPECTATE_RATE = 10          # Views captured per second
+SPECTATE_QUEUE = 64         # Frames buffered per viewer before it's resynced
+
+# --- Hand History ---
+HISTORY_BATCH = 200             # Rows per transaction, at most
+HISTORY_FLUSH_INTERVAL = 2.0    # Seconds a logged hand can wait for its transaction
+
+# --- Practice Mode ---
+PRACTICE_ENV = "WARLATRO_PRACTICE"      # Set to 1 for unlimited undo / rewind (Z, arrows + Enter)
+PRACTICE_MODE = False                   # Same, without the environment variable
+
+SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+
+MAX_HAND_SIZE = 5           # Hands over 5 score as the best 5 cards in them
+NUM_DECKS = 1               # Shuffled together into one master deck; duplicates are fine
+HAND_MAX_WIDTH = SCREEN_WIDTH - 520     # Room left for the side buttons
 BASE_HANDS_TO_PLAY = 3
 MAX_DISCARDS = 4
 BASE_TARGET_SCORE = 300
@@ -154,6 +206,9 @@ MODIFIER_DATA = {
     "destroy": {"name": "Destroy", "desc": "Remove from Deck", "color": COLOR_BLACK}
 }
 
+# Built by `python asset_bundle.py`; loose files are used when it's missing
+ASSET_BUNDLE = resource_path("assets/bundle.bin")
+
 PACK_COST = 6
 PACK_FILE = ":resources:images/items/gemRed.png" 
 
@@ -166,6 +221,12 @@ SOUND_PLAY_HAND = resource_path("assets/music/play_hand.mp3")
 SOUND_BUY_JOKER = resource_path("assets/music/buy_joker.mp3") 
 SOUND_MOD = resource_path("assets/music/mod.mp3")             
 
+# --- SFX Mixer ---
+# Max simultaneous voices per effect; the oldest voice is stolen past this
+SFX_MAX_VOICES = {"card": 4, "play_hand": 2, "buy_joker": 2, "mod": 2}
+# Card draws pick one of these speeds, resampled once at load time
+CARD_PITCH_VARIANTS = (0.85, 0.93, 1.0, 1.1, 1.2)
+
 # --- Shaders ---
 VERTEX_SHADER = """
 #version 330
@@ -178,6 +239,40 @@ void main() {
 }
 """
 
+# Arcade's sprite list vertex stage plus the idle bob / sway, for the card and joker lists.
+# in_pos.z is the sprite's depth, which carries its idle phase; 0 means hold still
+# (packs, cards flying off). Jokers sway on a second phase derived from the first.
+IDLE_VERTEX_SHADER = """
+#version 330
+uniform float time;
+uniform float float_speed;
+uniform float float_range;
+uniform float rot_speed;
+uniform float rot_range;
+
+in vec4 in_pos;
+in vec2 in_size;
+in float in_texture;
+in vec4 in_color;
+
+out float v_angle;
+out vec4 v_color;
+out vec2 v_size;
+out float v_texture;
+
+void main() {
+    float phase = in_pos.z;
+    float idle = phase > 0.0 ? 1.0 : 0.0;
+    float bob = sin(time * float_speed + phase) * float_range * idle;
+    float sway = sin(time * rot_speed + mod(phase * 7.0, 6.2832)) * rot_range * idle;
+    gl_Position = vec4(in_pos.x, in_pos.y + bob, 0.0, 1.0);
+    v_angle = in_pos.w + sway;
+    v_color = in_color;
+    v_size = in_size;
+    v_texture = in_texture;
+}
+"""
+
 FRAGMENT_SHADER = """
 #version 330
 uniform sampler2D texture0;
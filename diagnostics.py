@@ -0,0 +1,111 @@
+import gc
+import os
+import collections
+import tracemalloc
+
+import config
+
+# --- Memory Diagnostics ---
+# Opt-in (WARLATRO_DIAGNOSTICS=1). At every GameState transition this records traced
+# memory, gc generation counts and live instances of the tracked classes. Each round
+# start is diffed against the previous one (and each restart against the previous run),
+# so anything that keeps growing shows up with the source lines that allocated it.
+# A steady session looks flat from round to round after the first couple of rounds.
+
+class Diagnostics:
+    def __init__(self, tracked_types, trace_frames=config.DIAG_TRACE_FRAMES):
+        """ tracked_types: {label: class}; instances of subclasses count too """
+        self.tracked = tracked_types
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(trace_frames)
+        self.run = 0
+        self.round_snapshot = None
+        self.run_snapshot = None
+        self.round_history = collections.deque(maxlen=config.DIAG_GROWTH_WINDOW + 1)
+        self.transitions = 0
+
+    @staticmethod
+    def enabled():
+        return os.environ.get(config.DIAGNOSTICS_ENV, "") not in ("", "0")
+
+    def count_objects(self):
+        """ Live instances per tracked label, after a full collection so garbage doesn't count """
+        gc.collect()
+        classes = tuple(self.tracked.values())
+        labels = list(self.tracked)
+        counts = dict.fromkeys(labels, 0)
+        for obj in gc.get_objects():
+            if isinstance(obj, classes):
+                for label in labels:
+                    if isinstance(obj, self.tracked[label]):
+                        counts[label] += 1
+        return counts
+
+    def transition(self, old_state, new_state, round_level):
+        self.transitions += 1
+        gc_counts = gc.get_count()      # Before count_objects() collects
+        counts = self.count_objects()
+        current, peak = tracemalloc.get_traced_memory()
+        live = "  ".join(f"{label} {n}" for label, n in counts.items())
+        print(f"[diag] run {self.run} lvl {round_level} {old_state}->{new_state}  "
+              f"traced {current / 1e6:.2f} MB (peak {peak / 1e6:.2f})  {live}  gc {gc_counts}")
+
+        if new_state == "DRAWING":
+            self.round_start(round_level, current, counts)
+
+    @staticmethod
+    def take_snapshot():
+        """ Heap snapshot minus our own bookkeeping """
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def round_start(self, round_level, current, counts):
+        snap = self.take_snapshot()
+        if self.round_snapshot is not None:
+            self.print_growth(f"round {round_level} vs previous round", snap, self.round_snapshot)
+        self.round_snapshot = snap
+        self.round_history.append((current, counts))
+        self.check_trend()
+
+    def new_run(self):
+        """ Call on every (re)start, before the first round """
+        self.run += 1
+        snap = self.take_snapshot()
+        if self.run_snapshot is not None:
+            self.print_growth(f"run {self.run} vs run {self.run - 1}", snap, self.run_snapshot)
+        self.run_snapshot = snap
+        # Rounds of different runs aren't comparable (the first round allocates caches)
+        self.round_snapshot = None
+        self.round_history.clear()
+
+    def print_growth(self, title, snap, previous):
+        stats = snap.compare_to(previous, "lineno")
+        total = sum(s.size_diff for s in stats)
+        print(f"[diag] {title}: {total / 1024:+.1f} KiB")
+        for stat in stats[:config.DIAG_TOP_LINES]:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            print(f"[diag]   {stat.size_diff / 1024:+8.1f} KiB {stat.count_diff:+6d} blocks  "
+                  f"{os.path.basename(frame.filename)}:{frame.lineno}")
+
+    def check_trend(self):
+        """ Warns when memory or a live count has risen at every one of the last N round starts """
+        history = self.round_history
+        if len(history) < history.maxlen:
+            return
+        pairs = list(zip(history, list(history)[1:]))
+        if all(b[0] - a[0] > config.DIAG_GROWTH_BYTES for a, b in pairs):
+            print(f"Warning: traced memory grew at each of the last {len(pairs)} round starts "
+                  f"({history[0][0] / 1e6:.2f} -> {history[-1][0] / 1e6:.2f} MB)")
+        for label in self.tracked:
+            if all(b[1][label] > a[1][label] for a, b in pairs):
+                print(f"Warning: live {label} count grew at each of the last {len(pairs)} round starts "
+                      f"({history[0][1][label]} -> {history[-1][1][label]})")
+
+    def close(self):
+        current, peak = tracemalloc.get_traced_memory()
+        print(f"[diag] {self.run} runs, {self.transitions} transitions, traced {current / 1e6:.2f} MB, peak {peak / 1e6:.2f} MB")
+        tracemalloc.stop()
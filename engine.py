@@ -0,0 +1,344 @@
+import random
+import operator
+import collections
+
+import config
+import events
+import scoring
+
+# --- Headless Run Engine ---
+# The same rules as WarGame, without sprites, audio or a window. One RunState is one
+# player's run with its own RNG, so any number of them can live in one process
+# (server sessions, bot tournaments, shop simulations).
+#
+# The rules are deliberately written twice: WarGame's versions are tangled with
+# sprites, tweens and sound, and the headless runs can't afford any of that. Scoring
+# (scoring.compile_scorer) and joker hooks (events.EventBus) are shared; the round
+# flow around them is duplicated, method for method:
+#   start_new_round / draw_new_card / enter_shop   WarGame's methods of the same name
+#   roll_shop              ShopManager.generate_shop
+#   take                   WarGame.process_swap
+#   play                   WarGame.score_hand
+#   buy                    WarGame.buy_shop_item + start_pack_opening
+#   sell                   WarGame.sell_joker
+#   apply_modifier / skip_pack / next_level   the pack and NEXT LEVEL buttons
+# A rule change in one of these has to be made in its twin too.
+
+# Same values as main.GameState (and snapshot.state)
+DRAWING = 1
+DECIDING = 2
+SHOPPING = 3
+PACK_OPENING = 4
+GAME_OVER = 5
+
+STATE_NAMES = {DRAWING: "drawing", DECIDING: "deciding", SHOPPING: "shopping",
+               PACK_OPENING: "pack", GAME_OVER: "game_over"}
+
+STARTING_COINS = 5          # The desktop build currently starts runs with debug coins
+PACK_SIZE = 8
+MAX_PACK_SELECTION = 2
+MODIFIER_CODES = {None: "", "bonus_chips": "+c", "mult_plus": "+m", "destroy": "x"}
+HAND_ORDER = operator.attrgetter("value", "suit")   # Same order the UI lays the hand out in
+
+class ActionError(ValueError):
+    """ An action that isn't legal in the current state (the UI would grey it out) """
+
+class SimCard:
+    __slots__ = ("suit", "rank", "value", "modifier", "deck_index")
+
+    def __init__(self, suit, rank, modifier=None, deck_index=0):
+        self.suit = suit
+        self.rank = rank
+        self.value = config.RANKS.index(rank) + 2
+        self.modifier = modifier
+        self.deck_index = deck_index
+
+    def code(self):
+        """ Short form for the wire, e.g. "10H" or "AS+m" """
+        return f"{self.rank}{self.suit[0]}{MODIFIER_CODES[self.modifier]}"
+
+class RunState:
+    __slots__ = ("rng", "state", "round_level", "target_score", "score_total", "hands_played", "hands_max",
+                 "discards_left", "discards_max", "run_discards", "coins", "master_deck", "draw_pile",
+                 "discard_pile", "hand", "drawn_card", "jokers", "shop", "pack_cards", "pack_modifiers",
+                 "events", "message", "scorer", "pile_ranks", "pile_suits")
+
+    def __init__(self, seed=None, starting_coins=STARTING_COINS):
+        self.rng = random.Random(seed)
+        self.events = events.EventBus()
+        self.master_deck = [SimCard(suit, rank) for _ in range(config.NUM_DECKS)
+                            for suit in config.SUITS for rank in config.RANKS]
+        for i, card in enumerate(self.master_deck):
+            card.deck_index = i
+        self.draw_pile = []
+        self.discard_pile = []
+        self.hand = []
+        self.jokers = []
+        self.shop = []
+        self.pack_cards = []
+        self.pack_modifiers = []
+        self.new_run(starting_coins)
+
+    def reset(self, seed, starting_coins=STARTING_COINS):
+        """ Starts over with a new seed, reusing this object's cards and lists """
+        self.rng.seed(seed)
+        self.new_run(starting_coins)
+
+    # --- Run / Round Flow ---
+    def new_run(self, starting_coins=STARTING_COINS):
+        self.round_level = 1
+        self.target_score = config.BASE_TARGET_SCORE
+        self.coins = starting_coins
+        self.run_discards = 0
+        self.jokers.clear()
+        self.loadout_changed()
+        for card in self.master_deck:
+            card.modifier = None
+        self.shop.clear()
+        self.pack_cards.clear()
+        self.pack_modifiers.clear()
+        self.start_new_round()
+
+    def start_new_round(self):
+        self.state = DRAWING
+        ctx = self.events.emit("on_round_start", events.round_start_ctx(config.BASE_HANDS_TO_PLAY, config.MAX_DISCARDS))
+        self.hands_max = ctx["hands_max"]
+        self.discards_max = ctx["discards_max"]
+        self.discards_left = self.discards_max
+        self.hands_played = 0
+        self.score_total = 0
+        self.message = ""
+
+        self.draw_pile[:] = [c for c in self.master_deck if c.modifier != "destroy"]
+        self.rng.shuffle(self.draw_pile)
+        self.pile_ranks = self.pile_suits = None
+        self.discard_pile.clear()
+        self.hand.clear()
+        self.drawn_card = None
+        self.shop.clear()
+        self.draw_new_card()
+
+    # Both built on first use, so runs whose policy never asks pay nothing for them
+    def pile_counts(self):
+        """ (by rank value, by suit) of the draw pile; built once a round, then kept current by draw_new_card """
+        if self.pile_ranks is None:
+            self.pile_ranks = collections.Counter(c.value for c in self.draw_pile)
+            self.pile_suits = collections.Counter(c.suit for c in self.draw_pile)
+        return self.pile_ranks, self.pile_suits
+
+    def current_scorer(self):
+        if self.scorer is None:
+            self.scorer = scoring.compile_scorer(tuple(sorted(self.jokers)))
+        return self.scorer
+
+    def loadout_changed(self):
+        self.events.rebuild(self.jokers)
+        self.scorer = None
+
+    def draw_new_card(self):
+        if self.draw_pile:
+            card = self.drawn_card = self.draw_pile.pop()
+            if self.pile_ranks is not None:
+                self.pile_ranks[card.value] -= 1
+                self.pile_suits[card.suit] -= 1
+            self.state = DECIDING
+        else:
+            self.message = "DECK EMPTY!"
+
+    def enter_shop(self):
+        self.state = SHOPPING
+        hands_left = max(0, self.hands_max - self.hands_played)
+        reward = hands_left * 2 + self.discards_left
+        ctx = self.events.emit("on_round_end", events.round_end_ctx(self.discards_left, self.discards_max))
+        self.coins += reward + ctx["reserve_bonus"] + ctx["harvest_bonus"]
+        self.message = f"Round Cleared! Earned ${reward}."
+        self.roll_shop()
+
+    def roll_shop(self):
+        slots = ["Pack", "Joker", self.rng.choice(["Pack", "Joker"])]
+        available = [k for k in config.JOKER_DATA if k not in self.jokers]
+        self.shop.clear()
+        for slot in slots:
+            if slot == "Pack":
+                self.shop.append("Pack")
+            elif available:
+                key = self.rng.choice(available)
+                available.remove(key)
+                self.shop.append(key)
+
+    # --- Player Actions (mirror WarGame's buttons) ---
+    def _require(self, *states):
+        if self.state not in states:
+            raise ActionError(f"not allowed while {STATE_NAMES[self.state]}")
+
+    def take(self, discard=()):
+        """ TAKE CARD, or DISCARD (n) & TAKE with hand indices to throw away """
+        self._require(DECIDING, DRAWING)
+        if discard:
+            picked = sorted(set(discard))
+            if not all(0 <= i < len(self.hand) for i in picked):
+                raise ActionError("bad hand index")
+            if self.discards_left <= 0:
+                raise ActionError("no discards left")
+            to_remove = [self.hand[i] for i in picked]
+            self.discards_left -= 1
+            self.run_discards += len(to_remove)
+            if self.events.has_subscribers("on_discard"):
+                self.coins += self.events.emit("on_discard", events.discard_ctx(to_remove))["coins"]
+            for card in to_remove:
+                self.hand.remove(card)
+                self.discard_pile.append(card)
+        elif len(self.hand) >= config.MAX_HAND_SIZE:
+            raise ActionError("hand full")
+
+        if self.drawn_card:
+            self.hand.append(self.drawn_card)
+            self.hand.sort(key=HAND_ORDER)
+            self.drawn_card = None
+            self.draw_new_card()
+
+    def play(self):
+        """ PLAY HAND; returns the hand's score """
+        self._require(DECIDING, DRAWING)
+        if not self.hand:
+            raise ActionError("empty hand")
+        base, mult, _, coin_bonus = self.current_scorer()(self.hand, self.run_discards, len(self.draw_pile), self.coins)
+        final_score = base * mult
+        self.score_total += final_score
+        if self.events.has_subscribers("on_score"):
+            ctx = events.score_ctx(list(self.hand), scoring.get_hand_type(self.hand), final_score)
+            coin_bonus += self.events.emit("on_score", ctx)["coins"]
+        self.coins += coin_bonus
+
+        self.discard_pile.extend(self.hand)
+        self.hand.clear()
+
+        if self.score_total >= self.target_score:
+            self.enter_shop()
+        else:
+            self.hands_played += 1
+            if self.hands_played >= self.hands_max:
+                self.state = GAME_OVER
+            else:
+                self.message = f"Scored {final_score}! ({base} x {mult})"
+        return final_score
+
+    def buy(self, slot):
+        self._require(SHOPPING)
+        if not 0 <= slot < len(self.shop):
+            raise ActionError("bad shop slot")
+        item = self.shop[slot]
+        cost = config.PACK_COST if item == "Pack" else config.JOKER_DATA[item]["cost"]
+        if self.coins < cost:
+            raise ActionError("not enough coins")
+
+        if item == "Pack":
+            self.coins -= cost
+            self.shop.pop(slot)
+            self.state = PACK_OPENING
+            valid = [c for c in self.master_deck if c.modifier != "destroy"]
+            self.pack_cards[:] = self.rng.sample(valid, min(PACK_SIZE, len(valid)))
+            self.pack_modifiers[:] = self.rng.sample(list(config.MODIFIER_DATA), 2)
+        else:
+            if len(self.jokers) >= config.MAX_JOKERS:
+                raise ActionError("inventory full")
+            self.coins -= cost
+            self.shop.pop(slot)
+            self.jokers.append(item)
+            self.loadout_changed()
+            self.coins += self.events.emit("on_buy", events.joker_ctx(item))["coins"]
+
+    def sell(self, index):
+        if self.state == GAME_OVER:
+            raise ActionError("run is over")
+        if not 0 <= index < len(self.jokers):
+            raise ActionError("bad joker index")
+        key = self.jokers[index]
+        self.coins += config.JOKER_DATA[key]["cost"] // 2
+        # Emitted while it's still owned, so the joker's own on_sell fires too
+        self.coins += self.events.emit("on_sell", events.joker_ctx(key))["coins"]
+        self.jokers.pop(index)
+        self.loadout_changed()
+
+    def apply_modifier(self, mod_index, cards):
+        """ Pack screen: apply offered modifier `mod_index` to up to 2 pack card indices """
+        self._require(PACK_OPENING)
+        if not 0 <= mod_index < len(self.pack_modifiers):
+            raise ActionError("bad modifier index")
+        picked = sorted(set(cards))
+        if not picked:
+            raise ActionError("select cards first")
+        if len(picked) > MAX_PACK_SELECTION or not all(0 <= i < len(self.pack_cards) for i in picked):
+            raise ActionError("bad pack selection")
+        modifier = self.pack_modifiers[mod_index]
+        for i in picked:
+            self.pack_cards[i].modifier = modifier
+        self.skip_pack()
+
+    def skip_pack(self):
+        self._require(PACK_OPENING)
+        self.pack_cards.clear()
+        self.pack_modifiers.clear()
+        self.state = SHOPPING
+
+    def next_level(self):
+        self._require(SHOPPING)
+        self.round_level += 1
+        self.target_score = int(self.target_score * 1.5)
+        self.start_new_round()
+
+    # --- Views ---
+    def to_dict(self):
+        """ Compact JSON-ready view of everything a player could see """
+        view = {
+            "state": STATE_NAMES[self.state],
+            "level": self.round_level,
+            "target": self.target_score,
+            "score": self.score_total,
+            "hands": self.hands_max - self.hands_played,
+            "discards": self.discards_left,
+            "coins": self.coins,
+            "deck": len(self.draw_pile),
+            "hand": [c.code() for c in self.hand],
+            "drawn": self.drawn_card.code() if self.drawn_card else None,
+            "jokers": self.jokers,
+        }
+        if self.state == SHOPPING:
+            view["shop"] = self.shop
+        elif self.state == PACK_OPENING:
+            view["pack"] = [c.code() for c in self.pack_cards]
+            view["mods"] = self.pack_modifiers
+        return view
+
+    @classmethod
+    def from_snapshot(cls, snap, seed=None):
+        """ Continues a desktop run (snapshot.RunSnapshot) headlessly """
+        run = cls.__new__(cls)
+        run.rng = random.Random(seed)
+        if seed is None and snap.rng_state:
+            run.rng.setstate(snap.rng_state)
+        run.events = events.EventBus()
+        run.master_deck = [SimCard(suit, rank, mod, i) for i, (suit, rank, mod) in enumerate(snap.master_deck)]
+        deck = run.master_deck
+        run.draw_pile = [deck[i] for i in snap.draw_pile]
+        run.pile_ranks = run.pile_suits = None
+        run.discard_pile = [deck[i] for i in snap.discard_pile]
+        run.hand = [deck[i] for i in snap.hand]
+        run.drawn_card = None if snap.drawn_card is None else deck[snap.drawn_card]
+        run.jokers = list(snap.jokers)
+        run.loadout_changed()
+        run.shop = list(snap.shop)
+        run.pack_cards = []
+        run.pack_modifiers = []
+        run.state = snap.state
+        run.round_level = snap.round_level
+        run.target_score = snap.target_score
+        run.score_total = snap.score_total
+        run.hands_played = snap.hands_played
+        run.hands_max = snap.hands_max
+        run.discards_left = snap.discards_left
+        run.discards_max = run.events.emit("on_round_start", events.round_start_ctx(0, config.MAX_DISCARDS))["discards_max"]
+        run.run_discards = snap.run_discards
+        run.coins = snap.coins
+        run.message = ""
+        return run
@@ -0,0 +1,86 @@
+# --- Joker Event Bus ---
+# Effects that happen outside hand scoring. Each handler only reads and updates the
+# ctx dict it's given (no game object), so the same handlers can drive a headless run.
+# A new joker just registers here; main.py only emits events.
+
+EVENTS = ("on_round_start", "on_discard", "on_score", "on_round_end", "on_buy", "on_sell")
+
+# event -> {joker_key: handler}
+HANDLERS = {event: {} for event in EVENTS}
+
+def handles(event, key):
+    """ Decorator: subscribe `key`'s effect to `event` """
+    def register(handler):
+        HANDLERS[event][key] = handler
+        return handler
+    return register
+
+class EventBus:
+    """ Index from event to the handlers of the jokers currently owned.
+    Rebuilt only when the loadout changes; emit() walks just the subscribers. """
+    def __init__(self):
+        self.index = {event: [] for event in EVENTS}
+
+    def rebuild(self, joker_keys):
+        self.index = {event: [] for event in EVENTS}
+        for key in joker_keys:
+            for event, handlers in HANDLERS.items():
+                handler = handlers.get(key)
+                if handler:
+                    # One entry per copy, so duplicate jokers stack naturally
+                    self.index[event].append(handler)
+
+    def emit(self, event, ctx):
+        for handler in self.index[event]:
+            handler(ctx)
+        return ctx
+
+    def has_subscribers(self, event):
+        return bool(self.index[event])
+
+# --- Round Start ---
+# ctx: hands_max, discards_max
+
+@handles("on_round_start", "helping_hand")
+def helping_hand(ctx):
+    ctx["hands_max"] += 1
+
+@handles("on_round_start", "mulligan")
+def mulligan(ctx):
+    ctx["discards_max"] += 1
+
+# --- Discard ---
+# ctx: cards (discarded), coins (earned)
+
+@handles("on_discard", "severance_package")
+def severance_package(ctx):
+    faces = sum(1 for c in ctx["cards"] if c.value in (11, 12, 13))
+    ctx["coins"] += faces * 2
+
+# --- Round End ---
+# ctx: discards_left, discards_max, reserve_bonus, harvest_bonus
+
+@handles("on_round_end", "national_reserve")
+def national_reserve(ctx):
+    if ctx["discards_left"] == ctx["discards_max"]:
+        ctx["reserve_bonus"] += 3
+
+@handles("on_round_end", "the_harvest")
+def the_harvest(ctx):
+    ctx["harvest_bonus"] += 5
+
+def round_start_ctx(hands_max, discards_max):
+    return {"hands_max": hands_max, "discards_max": discards_max}
+
+def discard_ctx(cards):
+    return {"cards": cards, "coins": 0}
+
+def score_ctx(cards, hand_type, score):
+    return {"cards": cards, "hand_type": hand_type, "score": score, "coins": 0}
+
+def joker_ctx(key):
+    """ For on_buy / on_sell. Both fire while the joker is owned: after a buy, before a sell. """
+    return {"key": key, "coins": 0}
+
+def round_end_ctx(discards_left, discards_max):
+    return {"discards_left": discards_left, "discards_max": discards_max, "reserve_bonus": 0, "harvest_bonus": 0}
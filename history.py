@@ -0,0 +1,222 @@
+import time
+import sqlite3
+import argparse
+import threading
+import collections
+
+import config
+import engine
+
+# --- Hand / Run History ---
+# Every scored hand and run end goes into a local SQLite database. The game thread
+# only appends a tuple to a list; a writer thread commits whatever has piled up in
+# one transaction (up to HISTORY_BATCH rows, or every HISTORY_FLUSH_INTERVAL).
+# Stats the menu needs are kept in small counter tables updated in the same
+# transaction, so reading them never scans `hands`, however long it gets.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    ended REAL,
+    start_level INTEGER NOT NULL,
+    round_level INTEGER
+);
+CREATE TABLE IF NOT EXISTS hands (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL,
+    played REAL NOT NULL,
+    round_level INTEGER NOT NULL,
+    hand_type TEXT NOT NULL,
+    cards TEXT NOT NULL,            -- space separated codes, e.g. "10H AS+m"
+    jokers TEXT NOT NULL,           -- comma separated keys, slot order
+    base INTEGER NOT NULL,
+    mult INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    coins INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hands_by_score ON hands (score DESC);
+CREATE INDEX IF NOT EXISTS hands_by_run ON hands (run_id);
+CREATE INDEX IF NOT EXISTS runs_by_level ON runs (round_level DESC);
+
+-- Pre-aggregated counters
+CREATE TABLE IF NOT EXISTS totals (key TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS card_counts (card TEXT PRIMARY KEY, plays INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS joker_counts (joker TEXT PRIMARY KEY, hands INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hand_type_counts (hand_type TEXT PRIMARY KEY, plays INTEGER NOT NULL, best INTEGER NOT NULL) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS card_counts_by_plays ON card_counts (plays DESC);
+CREATE INDEX IF NOT EXISTS joker_counts_by_hands ON joker_counts (hands DESC);
+"""
+
+INSERT_HAND = ("INSERT INTO hands (run_id, played, round_level, hand_type, cards, jokers, base, mult, score, coins) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+BUMP_TOTAL = "INSERT INTO totals VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = value + excluded.value"
+MAX_TOTAL = "INSERT INTO totals VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = max(value, excluded.value)"
+BUMP_CARD = "INSERT INTO card_counts VALUES (?, ?) ON CONFLICT (card) DO UPDATE SET plays = plays + excluded.plays"
+BUMP_JOKER = "INSERT INTO joker_counts VALUES (?, ?) ON CONFLICT (joker) DO UPDATE SET hands = hands + excluded.hands"
+BUMP_TYPE = ("INSERT INTO hand_type_counts VALUES (?, ?, ?) ON CONFLICT (hand_type) DO UPDATE SET "
+             "plays = plays + excluded.plays, best = max(best, excluded.best)")
+
+def connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")       # Readers (the stats screen) never wait on the writer
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+class HandHistory:
+    def __init__(self, path=config.HISTORY_FILE):
+        self.path = path
+        self.pending = []
+        self.busy = False
+        self.closing = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self.thread.start()
+
+    # --- Game Thread ---
+    def _queue(self, item):
+        with self.cond:
+            self.pending.append(item)
+            if len(self.pending) >= config.HISTORY_BATCH:
+                self.cond.notify()
+
+    def start_run(self, round_level=1):
+        """ Returns the run id to pass to log_hand / end_run """
+        run_id = time.time_ns() // 1000
+        self._queue(("run", run_id, time.time(), round_level))
+        return run_id
+
+    def log_hand(self, run_id, cards, hand_type, jokers, base, mult, coins, round_level):
+        codes = " ".join(f"{c.rank}{c.suit[0]}{engine.MODIFIER_CODES[c.modifier]}" for c in cards)
+        names = tuple(f"{c.rank} of {c.suit}" for c in cards)
+        self._queue(("hand", run_id, time.time(), round_level, hand_type, codes, ",".join(jokers),
+                     base, mult, base * mult, coins, names))
+
+    def end_run(self, run_id, round_level):
+        self._queue(("end", run_id, time.time(), round_level))
+
+    def flush(self, timeout=2.0):
+        """ Blocks until everything queued so far is committed """
+        with self.cond:
+            self.cond.notify()
+            self.cond.wait_for(lambda: not self.pending and not self.busy, timeout)
+
+    def close(self, timeout=2.0):
+        with self.cond:
+            self.closing = True
+            self.cond.notify()
+        self.thread.join(timeout)
+
+    # --- Writer Thread ---
+    def _run(self):
+        try:
+            conn = connect(self.path)
+        except Exception as e:
+            print(f"Warning: Hand history disabled. {e}")
+            with self.cond:
+                self.pending.clear()
+            return
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: len(self.pending) >= config.HISTORY_BATCH or self.closing,
+                                   config.HISTORY_FLUSH_INTERVAL)
+                batch, self.pending = self.pending, []
+                self.busy = bool(batch)
+                closing = self.closing
+            if batch:
+                try:
+                    self._write(conn, batch)
+                except Exception as e:
+                    print(f"Warning: Could not write hand history. {e}")
+                with self.cond:
+                    self.busy = False
+                    self.cond.notify_all()
+            if closing:
+                break
+        conn.close()
+
+    def _write(self, conn, batch):
+        hands = []
+        cards = collections.Counter()
+        jokers = collections.Counter()
+        types = {}
+        best_score = 0
+        with conn:
+            for item in batch:
+                kind = item[0]
+                if kind == "hand":
+                    _, run_id, played, level, hand_type, codes, joker_keys, base, mult, score, coins, names = item
+                    hands.append((run_id, played, level, hand_type, codes, joker_keys, base, mult, score, coins))
+                    cards.update(names)
+                    if joker_keys:
+                        jokers.update(joker_keys.split(","))
+                    plays, best = types.get(hand_type, (0, 0))
+                    types[hand_type] = (plays + 1, max(best, score))
+                    best_score = max(best_score, score)
+                elif kind == "run":
+                    _, run_id, started, level = item
+                    conn.execute("INSERT OR IGNORE INTO runs (id, started, start_level) VALUES (?, ?, ?)",
+                                 (run_id, started, level))
+                elif kind == "end":
+                    _, run_id, ended, level = item
+                    conn.execute("UPDATE runs SET ended = ?, round_level = ? WHERE id = ?", (ended, level, run_id))
+                    conn.execute(BUMP_TOTAL, ("runs", 1))
+                    conn.execute(MAX_TOTAL, ("highest_level", level))
+
+            if hands:
+                conn.executemany(INSERT_HAND, hands)
+                conn.execute(BUMP_TOTAL, ("hands", len(hands)))
+                conn.execute(MAX_TOTAL, ("highest_score", best_score))
+                conn.executemany(BUMP_CARD, cards.items())
+                conn.executemany(BUMP_JOKER, jokers.items())
+                conn.executemany(BUMP_TYPE, [(t, p, b) for t, (p, b) in types.items()])
+
+def read_stats(path=config.HISTORY_FILE, top=5):
+    """ Everything the stats screen shows. Counter tables and index lookups only. """
+    conn = connect(path)
+    try:
+        totals = dict(conn.execute("SELECT key, value FROM totals"))
+        largest = conn.execute("SELECT score, base, mult, hand_type, cards, jokers, round_level "
+                               "FROM hands ORDER BY score DESC LIMIT 1").fetchone()
+        cards = conn.execute("SELECT card, plays FROM card_counts ORDER BY plays DESC LIMIT ?", (top,)).fetchall()
+        jokers = conn.execute("SELECT joker, hands FROM joker_counts ORDER BY hands DESC LIMIT ?", (top,)).fetchall()
+        types = conn.execute("SELECT hand_type, plays, best FROM hand_type_counts ORDER BY plays DESC").fetchall()
+    finally:
+        conn.close()
+    return {
+        "hands": totals.get("hands", 0),
+        "runs": totals.get("runs", 0),
+        "highest_level": totals.get("highest_level", 0),
+        "highest_score": totals.get("highest_score", 0),
+        "largest_hand": largest,
+        "favorite_card": cards[0][0] if cards else None,
+        "most_played_cards": cards,
+        "favorite_joker": jokers[0][0] if jokers else None,
+        "top_jokers": jokers,
+        "hand_types": types,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print stats from the hand history")
+    parser.add_argument("--db", default=config.HISTORY_FILE)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stats = read_stats(args.db, args.top)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{stats['hands']} hands over {stats['runs']} finished runs (read in {elapsed:.1f} ms)")
+    print(f"Highest level   {stats['highest_level']}")
+    if stats["largest_hand"]:
+        score, base, mult, hand_type, cards, jokers, level = stats["largest_hand"]
+        print(f"Largest hand    {score} ({base} x {mult}) {hand_type}: {cards}  [lvl {level}; {jokers or 'no jokers'}]")
+    print(f"Favorite card   {stats['favorite_card']}")
+    print(f"Favorite joker  {stats['favorite_joker']}")
+    for card, plays in stats["most_played_cards"]:
+        print(f"    {card:<18} {plays}")
+    for hand_type, plays, best in stats["hand_types"]:
+        print(f"    {hand_type:<18} {plays:>7}  best {best}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+
+import server
+
+# --- Load Test Client ---
+# Opens --sessions concurrent runs spread over --connections sockets, plays each with a
+# simple bot until --duration runs out, then reports actions/sec and latency percentiles.
+# Each session waits for its reply before sending the next action (closed loop), so the
+# latency includes queueing behind every other session on the server.
+
+class Connection:
+    """ One socket; replies are matched to requests by id, so many sessions can share it """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+        self.next_id = 0
+        self.listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def open(cls, host, port, unix_path):
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path, limit=1 << 20)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+        return cls(reader, writer)
+
+    async def _listen(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            reply = json.loads(line)
+            future = self.pending.pop(reply.get("id"), None)
+            if future and not future.done():
+                future.set_result(reply)
+        for future in self.pending.values():
+            future.set_exception(ConnectionError("server closed the connection"))
+
+    async def call(self, req):
+        self.next_id += 1
+        req["id"] = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.pending[self.next_id] = future
+        self.writer.write(json.dumps(req, separators=(",", ":")).encode("utf-8") + b"\n")
+        if self.writer.transport.get_write_buffer_size() > server.WRITE_HIGH_WATER:
+            await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.listener.cancel()
+        self.writer.close()
+
+def choose_action(view, rng):
+    """ Cheap bot: fill the hand, play it, skim the shop """
+    state = view["state"]
+    if state == "deciding":
+        hand = view["hand"]
+        if len(hand) >= 5 or (view["drawn"] is None and hand):
+            if view["discards"] > 0 and rng.random() < 0.3:
+                return {"op": "take", "discard": [rng.randrange(len(hand))]}
+            return {"op": "play"}
+        return {"op": "take"}
+    if state == "shopping":
+        if view["shop"] and rng.random() < 0.5:
+            return {"op": "buy", "slot": rng.randrange(len(view["shop"]))}
+        return {"op": "next"}
+    if state == "pack":
+        return {"op": "pick", "mod": rng.randrange(2), "cards": [0, 1]}
+    return {"op": "restart", "coins": 50}
+
+async def play_session(conn, seed, deadline, latencies, stats):
+    rng = random.Random(seed)
+    reply = await conn.call({"op": "new", "seed": seed, "coins": 50})
+    sid = reply["sid"]
+    view = reply["view"]
+    while time.perf_counter() < deadline:
+        req = choose_action(view, rng)
+        req["sid"] = sid
+        t0 = time.perf_counter()
+        reply = await conn.call(req)
+        latencies.append(time.perf_counter() - t0)
+        if reply["ok"]:
+            view = reply["view"]
+        else:
+            stats["errors"] += 1
+            # Illegal for this state (e.g. can't afford); resync and move on
+            if view["state"] == "shopping":
+                reply = await conn.call({"op": "next", "sid": sid})
+            else:
+                reply = await conn.call({"op": "state", "sid": sid})
+            view = reply.get("view", view)
+    await conn.call({"op": "close", "sid": sid, "view": False})
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[i]
+
+async def run_load(args):
+    conns = [await Connection.open(args.host, args.port, args.unix) for _ in range(args.connections)]
+    latencies = []
+    stats = {"errors": 0}
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    tasks = [play_session(conns[i % len(conns)], args.seed + i, deadline, latencies, stats)
+             for i in range(args.sessions)]
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    for conn in conns:
+        await conn.close()
+
+    latencies.sort()
+    ms = 1000
+    print(f"sessions      {args.sessions} over {args.connections} connections")
+    print(f"actions       {len(latencies)} in {elapsed:.1f}s ({stats['errors']} rejected)")
+    print(f"throughput    {len(latencies) / elapsed:,.0f} actions/s")
+    print(f"latency p50   {percentile(latencies, 50) * ms:.1f} ms")
+    print(f"latency p99   {percentile(latencies, 99) * ms:.1f} ms")
+    print(f"latency max   {latencies[-1] * ms if latencies else 0:.1f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test for server.py")
+    parser.add_argument("--host", default=server.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=server.DEFAULT_PORT)
+    parser.add_argument("--unix", help="Connect to a Unix socket instead of TCP")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--spawn", action="store_true", help="Start a server subprocess for the test")
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        cmd = [sys.executable, "server.py", "--host", args.host, "--port", str(args.port)]
+        if args.unix:
+            cmd += ["--unix", args.unix]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+        proc.stdout.readline()      # Wait for "listening"
+    try:
+        asyncio.run(run_load(args))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
+import time
+STARTUP_T0 = time.perf_counter()
+
 import arcade
 import arcade.gl
+import pyglet
 import enum
 import warnings
 
@@ -10,6 +14,20 @@ import sprites
 import ui_elements
 import systems
 import scoring
+import asset_bundle
+import save_manager
+import snapshot
+import odds
+import events
+import advisor
+import profiling
+import diagnostics
+import tweens
+import spectator
+import history
+import practice
+import random
+import os
 
 class GameState(enum.Enum):
     DRAWING = 1
@@ -18,13 +36,64 @@ class GameState(enum.Enum):
     PACK_OPENING = 4 
     GAME_OVER = 5
 
+# The round flow below is mirrored, without sprites, by engine.RunState (see the map
+# at the top of engine.py); rule changes go in both
 class WarGame(arcade.Window):
     def __init__(self):
+        self.startup_timer = systems.StartupTimer(STARTUP_T0)
+        self.startup_timer.mark("imports")
+
         super().__init__(config.SCREEN_WIDTH, config.SCREEN_HEIGHT, config.SCREEN_TITLE)
+        self.startup_timer.mark("window + GL context")
+
+        # Packed joker atlas + pre-decoded SFX, if the build step produced one
+        self.asset_bundle = asset_bundle.AssetBundle.open(config.ASSET_BUNDLE)
+        sprites.asset_bundle = self.asset_bundle
+        self.startup_timer.mark("asset bundle mmap")
+
+        # Decoding happens on worker threads; setup() runs once textures are ready
+        self.asset_loader = systems.AssetLoader()
+        texture_paths = [sprites.card_image_file(s, r) for s in systems.DeckManager.SUITS for r in systems.DeckManager.RANKS]
+        texture_paths.append(config.PACK_FILE)
+        if self.asset_bundle:
+            self.asset_loader.pool.submit(self.asset_bundle.atlas_image)
+        else:
+            texture_paths += [data['file'] for data in config.JOKER_DATA.values()]
+        self.asset_loader.preload_textures(texture_paths)
+        self.is_loading = True
+        self.first_frame_drawn = False
         
         self.deck_manager = None
         self.shop_manager = systems.ShopManager()
-        self.audio_manager = systems.AudioManager() 
+        # Every fade and fly-off runs on one timeline, ticked with the simulation
+        self.timeline = tweens.Timeline()
+        sprites.timeline = self.timeline
+        self.audio_manager = systems.AudioManager(self.asset_loader, self.asset_bundle, self.timeline)
+        self.audio_manager.preload()
+        self.save_manager = save_manager.SaveManager()
+        # Per-hand log for the stats screen, committed in batches off the game loop
+        self.history = history.HandHistory()
+        self.history_run = None
+
+        # cProfile capture of the next N frames: F9, or WARLATRO_PROFILE_FRAMES=N from launch
+        self.profiler = profiling.FrameProfiler(self, self.save_manager.writer)
+        self.profiler.start(profiling.frames_from_env())
+
+        # Memory / live object counts at every state change (WARLATRO_DIAGNOSTICS=1)
+        self.diagnostics = None
+        if diagnostics.Diagnostics.enabled():
+            self.diagnostics = diagnostics.Diagnostics({
+                "Card": sprites.Card, "Joker": sprites.Joker,
+                "TextButton": ui_elements.TextButton, "Player": pyglet.media.Player,
+            })
+
+        # Live state for local viewers (WARLATRO_SPECTATE=1 or =port; see viewer.py)
+        self.spectator = None
+        self.spectate_timer = 0.0
+        spectate = os.environ.get(config.SPECTATE_ENV, "")
+        if spectate not in ("", "0"):
+            port = int(spectate) if spectate.isdigit() and spectate != "1" else config.SPECTATE_PORT
+            self.spectator = spectator.SpectatorPublisher(port=port)
 
         self.card_list = arcade.SpriteList()
         self.hand_list = arcade.SpriteList()
@@ -33,12 +102,19 @@ class WarGame(arcade.Window):
         self.pack_card_list = arcade.SpriteList()
         self.animating_cards = arcade.SpriteList() 
         self.drawn_card = None
+
+        # Idle bob / sway runs in the sprite vertex shader (phase in sprite.depth), so a
+        # sprite at rest costs no Python math and no buffer upload. CPU path as fallback.
+        self.idle_programs = sprites.load_idle_programs(self.ctx) if config.GPU_IDLE_ANIMATION else None
+        sprites.gpu_idle = self.idle_programs is not None
+        self.bind_idle_programs()
         
         self.state = GameState.DRAWING
         self.score_total = 0
         self.hands_played = 0
         self.hands_max = config.BASE_HANDS_TO_PLAY
         self.discards_left = config.MAX_DISCARDS
+        self.discards_max = config.MAX_DISCARDS
         self.target_score = config.BASE_TARGET_SCORE
         self.round_level = 1
         self.coins = 5 
@@ -46,6 +122,20 @@ class WarGame(arcade.Window):
         
         self.message = ""
         self.hand_details = [] 
+
+        # --- Odds Panel ---
+        # Refreshed from on_update only when the hand, draw pile or loadout changes, never per frame
+        self.odds_tracker = odds.OddsTracker(config.MAX_HAND_SIZE)
+        self.odds_dirty = True
+
+        # Joker effects outside scoring; re-indexed only when the loadout changes
+        self.joker_events = events.EventBus()
+
+        # Offer estimates for the shop tooltips, simulated off the render thread
+        self.shop_advisor = advisor.ShopAdvisor()
+
+        # Undo / rewind to any earlier decision (WARLATRO_PRACTICE=1)
+        self.practice = practice.PracticeHistory() if practice.enabled() else None
         
         self.btn_action = None 
         self.btn_score = None
@@ -68,8 +158,39 @@ class WarGame(arcade.Window):
         self.quad_fs = arcade.gl.geometry.quad_2d_fs()
         self.screen_texture = self.ctx.texture((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
         self.fbo = self.ctx.framebuffer(color_attachments=[self.screen_texture])
+        self.startup_timer.mark("shader + FBO")
+
+        # --- Idle Throttling ---
+        self.idle_timer = 0.0       # Seconds since the last input event
+        self.is_idle = False
+        self.fbo_valid = False      # True when the FBO holds the current scene
+
+        self.sim_accumulator = 0.0
+
+    def bind_idle_programs(self):
+        """ (Re)attaches the idle shader. SpriteList.clear() rebuilds the list's GPU data
+        with arcade's default program, so this runs before every draw (a few identity checks). """
+        if not self.idle_programs:
+            return
+        card_program, joker_program = self.idle_programs
+        for sprite_list, program in ((self.card_list, card_program), (self.pack_card_list, card_program),
+                                     (self.joker_list, joker_program), (self.shop_list, joker_program)):
+            if sprite_list.data.program is not program:
+                sprite_list.data.program = program
+
+    def set_state(self, state):
+        """ Every GameState change after startup goes through here """
+        if self.diagnostics and state != self.state:
+            self.diagnostics.transition(self.state.name, state.name, self.round_level)
+        self.state = state
 
     def setup(self):
+        if self.diagnostics:
+            self.diagnostics.new_run()
+        # Practice runs can be undone and replayed, so they stay out of the stats and history
+        self.history_run = None if self.practice else self.history.start_run()
+        if self.practice:
+            self.practice.reset()
         self.score_total = 0
         self.round_level = 1
         self.target_score = config.BASE_TARGET_SCORE
@@ -77,28 +198,30 @@ class WarGame(arcade.Window):
         self.run_discards = 0
         
         self.joker_list.clear()
+        self.rebuild_joker_events()
         self.animating_cards.clear()
         self.deck_manager = systems.DeckManager()
         
         self.audio_manager.start_bg_music() 
         
         self.start_new_round()
+        self.bind_idle_programs()
 
     def start_new_round(self):
-        self.state = GameState.DRAWING
+        self.set_state(GameState.DRAWING)
         self.card_list.clear()
         self.hand_list.clear()
         self.shop_list.clear()
         self.pack_card_list.clear()
         self.shop_buttons = []
+        self.shop_advisor.cancel()
         
         self.audio_manager.exit_store() 
         
-        bonus_hands = sum(1 for j in self.joker_list if j.key == "helping_hand")
-        bonus_discards = sum(1 for j in self.joker_list if j.key == "mulligan")
-        
-        self.hands_max = config.BASE_HANDS_TO_PLAY + bonus_hands
-        self.discards_left = config.MAX_DISCARDS + bonus_discards
+        ctx = self.joker_events.emit("on_round_start", events.round_start_ctx(config.BASE_HANDS_TO_PLAY, config.MAX_DISCARDS))
+        self.hands_max = ctx["hands_max"]
+        self.discards_max = ctx["discards_max"]
+        self.discards_left = self.discards_max
         
         self.hands_played = 0
         self.score_total = 0
@@ -106,13 +229,15 @@ class WarGame(arcade.Window):
         self.hand_details = []
         
         self.deck_manager.start_round(self.card_list)
+        self.create_round_buttons()
+        
+        self.draw_new_card()
 
+    def create_round_buttons(self):
         self.btn_action = ui_elements.TextButton(config.SCREEN_WIDTH/2, 280, 240, 50, "TAKE CARD", config.COLOR_BTN_ACTION)
         self.btn_score = ui_elements.TextButton(config.SCREEN_WIDTH - 150, 150, 200, 60, "SCORE HAND", config.COLOR_BTN_SCORE)
         self.btn_sell = ui_elements.TextButton(0, 0, 100, 40, "SELL", config.COLOR_BTN_SELL) 
         self.btn_sell.visible = False
-        
-        self.draw_new_card()
 
     def draw_new_card(self):
         card = self.deck_manager.draw_card(self.card_list)
@@ -122,20 +247,19 @@ class WarGame(arcade.Window):
             
             start_x = config.SCREEN_WIDTH + 150
             start_y = config.DRAWN_CARD_Y
-            card._phys_x = start_x
-            card._phys_y = start_y
-            card.center_x = start_x
-            card.center_y = start_y
+            card.snap_to(start_x, start_y)
             card.target_x = config.DRAWN_CARD_X
             card.target_y = config.DRAWN_CARD_Y
             
             self.drawn_card = card
-            self.state = GameState.DECIDING
+            self.set_state(GameState.DECIDING)
+            self.odds_dirty = True
+            self.autosave_run()
         else:
             self.message = "DECK EMPTY!"
 
     def enter_shop(self):
-        self.state = GameState.SHOPPING
+        self.set_state(GameState.SHOPPING)
         self.message = "SHOP PHASE"
         
         self.audio_manager.enter_store()
@@ -144,22 +268,11 @@ class WarGame(arcade.Window):
         reward = (hands_left * 2) + (self.discards_left * 1)
         self.coins += reward
         
-        # --- National Reserve Bonus ---
-        bonus_discards = sum(1 for j in self.joker_list if j.key == "mulligan")
-        start_discards = config.MAX_DISCARDS + bonus_discards
-        
-        nr_bonus = 0
-        if self.discards_left == start_discards:
-            nr_count = sum(1 for j in self.joker_list if j.key == "national_reserve")
-            if nr_count > 0:
-                nr_bonus = nr_count * 3
-                self.coins += nr_bonus
-                
-        # --- NEW: The Harvest Bonus ---
-        harvest_count = sum(1 for j in self.joker_list if j.key == "the_harvest")
-        harvest_bonus = harvest_count * 5
-        if harvest_bonus > 0:
-            self.coins += harvest_bonus
+        # --- Round End Jokers (National Reserve, The Harvest) ---
+        ctx = self.joker_events.emit("on_round_end", events.round_end_ctx(self.discards_left, self.discards_max))
+        nr_bonus = ctx["reserve_bonus"]
+        harvest_bonus = ctx["harvest_bonus"]
+        self.coins += nr_bonus + harvest_bonus
 
         self.message = f"Round Cleared!\nEarned ${reward}."
         if nr_bonus > 0:
@@ -167,10 +280,25 @@ class WarGame(arcade.Window):
         if harvest_bonus > 0:
             self.message += f"\n(Harvest: +${harvest_bonus})"
 
-        self.shop_manager.generate_shop(self.shop_list, self.shop_buttons, self.joker_list)
+        self.open_shop()
+        self.save_manager.commit()
+        self.autosave_run()
+
+    def open_shop(self, offers=None):
+        self.shop_manager.generate_shop(self.shop_list, self.shop_buttons, self.joker_list, offers)
         
         self.btn_next_round = ui_elements.TextButton(config.SCREEN_WIDTH - 150, 80, 200, 60, "NEXT LEVEL >", config.COLOR_GREEN)
         self.update_shop_buttons()
+        self.start_shop_advisor()
+
+    def shop_offer_keys(self):
+        return ["Pack" if isinstance(item, sprites.Pack) else item.key for item in self.shop_list]
+
+    def start_shop_advisor(self):
+        """ (Re)starts the offer estimates; called whenever the shop, deck or loadout changes """
+        self.shop_advisor.start(
+            advisor.deck_cards(self.deck_manager.valid_cards), [j.key for j in self.joker_list],
+            self.shop_offer_keys(), self.coins, self.run_discards, int(self.target_score * 1.5))
 
     def update_shop_buttons(self):
         for i, item in enumerate(self.shop_list):
@@ -185,6 +313,7 @@ class WarGame(arcade.Window):
 
     def buy_shop_item(self, index):
         if index >= len(self.shop_list): return
+        self.record_decision()
         item = self.shop_list[index]
         
         if self.coins >= item.cost:
@@ -193,11 +322,17 @@ class WarGame(arcade.Window):
                     self.coins -= item.cost
                     item.remove_from_sprite_lists()
                     self.joker_list.append(item)
+                    self.rebuild_joker_events()
+                    self.coins += self.joker_events.emit("on_buy", events.joker_ctx(item.key))["coins"]
                     self.reposition_jokers() 
                     self.shop_buttons.pop(index)
                     self.update_shop_buttons()
+                    self.start_shop_advisor()
                     
                     self.audio_manager.play_buy_joker_fx() 
+                    if not self.practice:
+                        self.save_manager.record_joker_purchase(item.key)
+                    self.autosave_run()
                 else:
                     self.message = "Inventory Full!"
             
@@ -208,15 +343,17 @@ class WarGame(arcade.Window):
                 self.start_pack_opening()
 
     def start_pack_opening(self):
-        self.state = GameState.PACK_OPENING
+        self.audio_manager.play_mod_fx() 
+        chosen_cards = self.shop_manager.get_pack_cards(self.deck_manager.valid_cards)
+        self.show_pack(chosen_cards, self.shop_manager.get_pack_modifiers())
+
+    def show_pack(self, chosen_cards, modifiers):
+        self.set_state(GameState.PACK_OPENING)
+        self.shop_advisor.cancel()
         self.message = "Select Cards then Choose Modifier"
         self.pack_card_list.clear()
         self.btn_pack_mods = []
         
-        self.audio_manager.play_mod_fx() 
-        
-        chosen_cards = self.shop_manager.get_pack_cards(self.deck_manager.master_deck)
-        
         start_x = config.SCREEN_WIDTH / 2 - 250
         start_y = config.SCREEN_HEIGHT / 2 + 100
         for i, card in enumerate(chosen_cards):
@@ -229,12 +366,11 @@ class WarGame(arcade.Window):
             tx = start_x + (col * (config.CARD_WIDTH + 20))
             ty = start_y - (row * (config.CARD_HEIGHT + 20))
             
-            card._phys_x = config.SCREEN_WIDTH + 100 
-            card._phys_y = ty
+            card.snap_to(config.SCREEN_WIDTH + 100, ty)
             card.target_x = tx
             card.target_y = ty
 
-        self.pack_modifiers_offered = self.shop_manager.get_pack_modifiers()
+        self.pack_modifiers_offered = list(modifiers)
         
         bx = config.SCREEN_WIDTH / 2 - 100
         by = 150
@@ -250,27 +386,30 @@ class WarGame(arcade.Window):
         if not selected:
             self.message = "Select cards first!"
             return
+        self.record_decision()
             
         mod_key = self.pack_modifiers_offered[mod_index]
         self.audio_manager.play_mod_fx() 
         
         for card in selected:
-            card.modifier = mod_key
+            self.deck_manager.set_modifier(card, mod_key)
             card.is_selected = False
             
             if mod_key == "destroy":
-                card.is_spasming = True
+                card.spasm_out()
             else:
-                card.target_y = config.SCREEN_HEIGHT + 400
-                card.should_despawn = True
+                card.fly_off(config.SCREEN_HEIGHT + 400)
             
             self.animating_cards.append(card)
             
-        self.state = GameState.SHOPPING
+        self.set_state(GameState.SHOPPING)
         self.pack_card_list.clear() 
         self.message = "Applied!"
+        self.start_shop_advisor()
+        self.autosave_run()
 
     def score_hand(self):
+        self.record_decision()
         self.audio_manager.play_hand_fx()
         
         cards_in_deck = len(self.deck_manager.draw_pile)
@@ -281,17 +420,24 @@ class WarGame(arcade.Window):
         )
         final_score = base * multi
         self.score_total += final_score
+        hand_type = scoring.get_hand_type(self.hand_list)
+        if not self.practice:
+            self.save_manager.record_hand(self.hand_list, hand_type, final_score)
+            self.history.log_hand(self.history_run, self.hand_list, hand_type, [j.key for j in self.joker_list],
+                                  base, multi, self.coins, self.round_level)
+        if self.joker_events.has_subscribers("on_score"):
+            coin_bonus += self.joker_events.emit("on_score", events.score_ctx(list(self.hand_list), hand_type, final_score))["coins"]
         
         if coin_bonus > 0:
             self.coins += coin_bonus
         
         for card in list(self.hand_list): 
             self.hand_list.remove(card)
-            self.deck_manager.discard_pile.append(card) 
-            card.target_y = config.SCREEN_HEIGHT + 300 
-            card.should_despawn = True
+            self.deck_manager.discard(card) 
+            card.fly_off(config.SCREEN_HEIGHT + 300)
             
         self.hand_list.clear()
+        self.odds_dirty = True
         
         if self.score_total >= self.target_score:
             self.enter_shop()
@@ -299,14 +445,25 @@ class WarGame(arcade.Window):
 
         self.hands_played += 1
         if self.hands_played >= self.hands_max:
-            self.state = GameState.GAME_OVER
-            self.audio_manager.enter_game_over() 
+            self.enter_game_over()
         else:
             self.message = f"Scored {final_score}! ({base} x {multi})"
             if coin_bonus > 0:
                 self.message += f" Earned ${coin_bonus}!"
 
+    def enter_game_over(self):
+        self.set_state(GameState.GAME_OVER)
+        self.shop_advisor.cancel()
+        self.audio_manager.enter_game_over() 
+        if not self.practice:
+            self.save_manager.record_run_end(self.round_level)
+            self.history.end_run(self.history_run, self.round_level)
+            self.save_manager.commit()
+        # The run is over, so there is nothing left to resume
+        self.save_manager.writer.submit(config.SNAPSHOT_FILE, lambda: None)
+
     def process_swap(self):
+        self.record_decision()
         to_remove = [c for c in self.hand_list if c.is_selected]
         if len(to_remove) > 0:
             if self.discards_left > 0:
@@ -316,20 +473,14 @@ class WarGame(arcade.Window):
         
         self.run_discards += len(to_remove)
 
-        # --- NEW: Severance Package Logic ---
-        sev_pack_count = sum(1 for j in self.joker_list if j.key == "severance_package")
-        if sev_pack_count > 0:
-            # Check for J(11), Q(12), K(13)
-            faces_discarded = sum(1 for c in to_remove if c.value in [11, 12, 13])
-            if faces_discarded > 0:
-                gained = faces_discarded * 2 * sev_pack_count
-                self.coins += gained
+        # --- Discard Jokers (Severance Package) ---
+        if to_remove and self.joker_events.has_subscribers("on_discard"):
+            self.coins += self.joker_events.emit("on_discard", events.discard_ctx(to_remove))["coins"]
 
         for card in to_remove:
             self.hand_list.remove(card)
-            self.deck_manager.discard_pile.append(card)
-            card.target_y = -300
-            card.should_despawn = True 
+            self.deck_manager.discard(card)
+            card.fly_off(-300)
         
         if self.drawn_card:
             self.hand_list.append(self.drawn_card)
@@ -337,21 +488,100 @@ class WarGame(arcade.Window):
             self.reposition_hand()
             self.draw_new_card()
 
+    def wake(self):
+        """ Any input resets the idle timer and snaps back to full rate """
+        self.idle_timer = 0.0
+        if self.is_idle:
+            self.is_idle = False
+            self.fbo_valid = False
+            self.set_update_rate(config.ACTIVE_UPDATE_RATE)
+            self.set_draw_rate(config.ACTIVE_UPDATE_RATE)
+
+    def go_idle(self):
+        self.is_idle = True
+        self.set_update_rate(config.IDLE_UPDATE_RATE)
+        self.set_draw_rate(config.IDLE_UPDATE_RATE)
+
+    def is_scene_static(self):
+        """ No sprite is moving, nothing is animating out and no music is fading """
+        if len(self.animating_cards) > 0 or self.timeline.active_count():
+            return False
+        if self.audio_manager.is_fading():
+            return False
+        if self.shop_advisor.is_running():
+            return False        # Keep drawing so the tooltip picks up new estimates
+        for sprite_list in (self.card_list, self.joker_list, self.shop_list, self.pack_card_list):
+            for sprite in sprite_list:
+                if hasattr(sprite, 'is_at_rest') and not sprite.is_at_rest():
+                    return False
+        return True
+
+    def finish_loading(self):
+        self.is_loading = False
+        self.startup_timer.mark("texture decode (pool)")
+        if not self.resume_run():
+            self.setup()
+        self.startup_timer.mark("setup")
+        self.startup_timer.report()
+
     def on_update(self, delta_time):
         self.shader_time += delta_time
-        
+
+        if self.is_loading:
+            if self.asset_loader.is_done():
+                self.finish_loading()
+            return
+
+        # Only bother scanning sprites once the player has been quiet for a while
+        self.idle_timer += delta_time
+        if not self.is_idle and self.idle_timer >= config.IDLE_TIMEOUT and self.is_scene_static():
+            self.go_idle()
+
         self.audio_manager.update(delta_time)
-        
-        self.card_list.update()
-        self.joker_list.update()
-        self.shop_list.update()
-        self.animating_cards.update() 
+        if self.odds_dirty and self.state == GameState.DECIDING:
+            self.refresh_odds()
+
+        if self.spectator:
+            self.spectate_timer += delta_time
+            if self.spectate_timer >= 1 / config.SPECTATE_RATE:
+                self.spectate_timer = 0.0
+                self.spectator.publish(spectator.capture_view(self))
+
+        if self.is_idle:
+            return
+
+        # Fixed timestep: physics always advances in SIM_DT chunks, rendering interpolates
+        self.sim_accumulator += delta_time
+        steps = 0
+        while self.sim_accumulator >= config.SIM_DT and steps < config.MAX_SIM_STEPS:
+            self.step_simulation(config.SIM_DT)
+            self.sim_accumulator -= config.SIM_DT
+            steps += 1
+        if steps == config.MAX_SIM_STEPS:
+            self.sim_accumulator = 0.0
+
+    def step_simulation(self, dt):
+        """ One deterministic simulation tick. Safe to call directly for headless stepping. """
+        self.card_list.update(dt)
+        self.joker_list.update(dt)
+        self.shop_list.update(dt)
+        self.animating_cards.update(dt)
         if self.state == GameState.PACK_OPENING:
-            self.pack_card_list.update()
+            self.pack_card_list.update(dt)
+        # After the sprites, so tweened positions land on this tick's interpolation end
+        self.timeline.advance(dt)
         
         for card in self.hand_list:
             card.visible = True
 
+    def sync_sprite_transforms(self):
+        """ Blends the last two simulation steps so motion stays smooth at any render rate """
+        alpha = min(1.0, self.sim_accumulator / config.SIM_DT)
+        for sprite_list in (self.card_list, self.joker_list, self.shop_list, self.animating_cards, self.pack_card_list):
+            for sprite in sprite_list:
+                if hasattr(sprite, 'sync_transform'):
+                    sprite.sync_transform(alpha)
+
     def draw_game_contents(self):
         arcade.draw_rect_filled(arcade.XYWH(config.SCREEN_WIDTH / 2, config.SCREEN_HEIGHT - 40, config.SCREEN_WIDTH, 80), config.COLOR_UI_BG)
         
@@ -401,9 +631,9 @@ class WarGame(arcade.Window):
             for i, line in enumerate(self.hand_details):
                 arcade.draw_text(line, config.SCREEN_WIDTH - 150, start_y + (i * 20), config.COLOR_GOLD, 14, anchor_x="center", bold=True)
 
-            start_x = (config.SCREEN_WIDTH - (config.MAX_HAND_SIZE * (config.CARD_WIDTH + 20))) / 2 + config.CARD_WIDTH / 2
+            start_x, spacing = ui_elements.hand_layout(config.MAX_HAND_SIZE)
             for i in range(config.MAX_HAND_SIZE):
-                slot_x = start_x + i * (config.CARD_WIDTH + 20)
+                slot_x = start_x + i * spacing
                 rect = arcade.XYWH(slot_x, config.HAND_Y, config.CARD_WIDTH, config.CARD_HEIGHT)
                 arcade.draw_rect_outline(rect, config.COLOR_GREEN, 2)
             
@@ -418,6 +648,9 @@ class WarGame(arcade.Window):
             for card in self.card_list:
                 card.draw_modifier()
 
+            if self.state == GameState.DECIDING:
+                self.draw_odds_panel()
+
             for card in self.hand_list:
                 if card.is_selected:
                     h_rect = arcade.XYWH(card.center_x, card.center_y, config.CARD_WIDTH + 12, config.CARD_HEIGHT + 12)
@@ -440,17 +673,41 @@ class WarGame(arcade.Window):
                 self.btn_sell.visible = True
                 self.btn_sell.draw()
 
-        ui_elements.draw_tooltip(self.hovered_joker, self.mouse_x, self.mouse_y)
+        ui_elements.draw_tooltip(self.hovered_joker, self.mouse_x, self.mouse_y, self.shop_advice(self.hovered_joker))
         
         ui_elements.draw_shadows(self.animating_cards)
         self.animating_cards.draw()
         for card in self.animating_cards:
             card.draw_modifier()
 
+        if self.practice:
+            self.draw_practice_panel()
+
+    def draw_loading_screen(self):
+        self.clear(color=config.COLOR_BG)
+        done, total = self.asset_loader.progress()
+        arcade.draw_text("LOADING...", config.SCREEN_WIDTH / 2, config.SCREEN_HEIGHT / 2 + 20, config.COLOR_WHITE, 32, anchor_x="center", bold=True)
+        arcade.draw_text(f"{done} / {total}", config.SCREEN_WIDTH / 2, config.SCREEN_HEIGHT / 2 - 30, config.COLOR_GOLD, 16, anchor_x="center")
+
     def on_draw(self):
-        self.fbo.use()
-        self.fbo.clear(color=config.COLOR_BG)
-        self.draw_game_contents()
+        if self.is_loading:
+            self.draw_loading_screen()
+            if not self.first_frame_drawn:
+                self.first_frame_drawn = True
+                self.startup_timer.mark("first frame")
+            return
+
+        # While idle the scene is frozen, so the last rendered FBO is reused as-is
+        if not (self.is_idle and self.fbo_valid):
+            self.sync_sprite_transforms()
+            if self.idle_programs:
+                self.bind_idle_programs()
+                for program in self.idle_programs:
+                    program['time'] = self.shader_time
+            self.fbo.use()
+            self.fbo.clear(color=config.COLOR_BG)
+            self.draw_game_contents()
+            self.fbo_valid = True
         
         self.use()
         self.clear()
@@ -472,6 +729,38 @@ class WarGame(arcade.Window):
             14
         )
         
+    def shop_advice(self, item):
+        """ Tooltip lines for a hovered shop offer, or None """
+        if self.state != GameState.SHOPPING or item is None or item not in self.shop_list:
+            return None
+        estimate = self.shop_advisor.estimate("Pack" if isinstance(item, sprites.Pack) else item.key)
+        return estimate.lines() if estimate else ["Estimating..."]
+
+    def refresh_odds(self):
+        """ Runs from on_update, so a re-score (~1 ms) never lands inside a draw call """
+        self.odds_tracker.update(self.hand_list, self.drawn_card, self.deck_manager.indexes["draw"],
+                                 self.discards_left, self.joker_list, self.run_discards, self.coins)
+        self.odds_dirty = False
+
+    def draw_odds_panel(self):
+        tracker = self.odds_tracker
+        x, y = 40, 640
+        arcade.draw_text("UPGRADE ODDS", x, y, config.COLOR_WHITE, 14, bold=True)
+        arcade.draw_text(f"next / next {tracker.k}", x + 150, y, (180, 180, 180), 12)
+        for i, hand_type in enumerate(odds.ODDS_HAND_TYPES):
+            row_y = y - 25 - i * 22
+            if hand_type not in tracker.upgrades:
+                # Already held (or beaten), so it's no upgrade
+                arcade.draw_text(hand_type, x, row_y, (120, 120, 120), 12)
+                arcade.draw_text("held", x + 150, row_y, (120, 120, 120), 12)
+                continue
+            arcade.draw_text(hand_type, x, row_y, config.COLOR_WHITE, 12)
+            line = f"{tracker.next_draw.get(hand_type, 0):4.0%} / {tracker.next_k.get(hand_type, 0):4.0%}"
+            arcade.draw_text(line, x + 150, row_y, config.COLOR_GOLD, 12)
+        delta = tracker.expected_delta
+        color = config.COLOR_GOLD if delta >= 0 else config.COLOR_RED
+        arcade.draw_text(f"Next card: {delta:+.0f} pts avg", x, y - 25 - len(odds.ODDS_HAND_TYPES) * 22, color, 12, bold=True)
+
     def update_game_buttons(self):
         if self.state == GameState.GAME_OVER:
             self.btn_action.visible = False
@@ -514,6 +803,9 @@ class WarGame(arcade.Window):
             self.btn_score.active = False
 
     def on_mouse_motion(self, x, y, dx, dy):
+        self.wake()
+        if self.is_loading:
+            return     # No round (or buttons) until finish_loading()
         self.mouse_x = x
         self.mouse_y = y
         
@@ -541,6 +833,9 @@ class WarGame(arcade.Window):
         if self.btn_sell.visible: self.btn_sell.check_mouse_hover(x, y)
 
     def on_mouse_press(self, x, y, button, modifiers):
+        self.wake()
+        if self.is_loading:
+            return
         if self.btn_sell.visible and self.btn_sell.is_clicked(x, y):
             self.sell_joker()
             return
@@ -561,6 +856,7 @@ class WarGame(arcade.Window):
                     self.buy_shop_item(i)
                     return
             if self.btn_next_round and self.btn_next_round.is_clicked(x, y):
+                self.record_decision()
                 self.round_level += 1
                 self.target_score = int(self.target_score * 1.5)
                 self.start_new_round()
@@ -568,8 +864,11 @@ class WarGame(arcade.Window):
 
         elif self.state == GameState.PACK_OPENING:
             if self.btn_pack_skip.is_clicked(x, y):
-                self.state = GameState.SHOPPING
+                self.record_decision()
+                self.set_state(GameState.SHOPPING)
                 self.pack_card_list.clear()
+                self.start_shop_advisor()
+                self.autosave_run()
                 return
             
             for i, btn in enumerate(self.btn_pack_mods):
@@ -606,12 +905,33 @@ class WarGame(arcade.Window):
                 for card in cards_clicked:
                     card.is_selected = not card.is_selected
 
+    def on_close(self):
+        self.shop_advisor.cancel()
+        self.profiler.finish()
+        if self.spectator:
+            self.spectator.close()
+        if self.diagnostics:
+            self.diagnostics.close()
+        self.history.close()
+        self.save_manager.close()
+        super().on_close()
+
+    def on_key_press(self, symbol, modifiers):
+        self.wake()
+        if symbol == arcade.key.F9:
+            self.profiler.start(config.PROFILE_KEY_FRAMES)
+        if self.practice:
+            self.practice_key(symbol)
+
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        self.wake()
+
     def reposition_hand(self):
         self.hand_list.sort(key=lambda c: (c.value, c.suit))
         
-        start_x = (config.SCREEN_WIDTH - (len(self.hand_list) * (config.CARD_WIDTH + 20))) / 2 + config.CARD_WIDTH / 2
+        start_x, spacing = ui_elements.hand_layout(len(self.hand_list))
         for i, card in enumerate(self.hand_list):
-            card.target_x = start_x + i * (config.CARD_WIDTH + 20)
+            card.target_x = start_x + i * spacing
             card.target_y = config.HAND_Y
             card.is_selected = False
 
@@ -622,23 +942,254 @@ class WarGame(arcade.Window):
             ty = config.SCREEN_HEIGHT - 220 
             joker.target_x = tx
             joker.target_y = ty
-            joker.scale = 0.25
+            joker.set_display_scale(0.25)
 
     def sell_joker(self):
         to_sell = [j for j in self.joker_list if j.is_selected]
+        if to_sell:
+            self.record_decision()
         for joker in to_sell:
             self.coins += joker.sell_price
+            # Emitted while it's still owned, so the joker's own on_sell fires too
+            self.coins += self.joker_events.emit("on_sell", events.joker_ctx(joker.key))["coins"]
             joker.remove_from_sprite_lists()
+            self.rebuild_joker_events()
         
         self.reposition_jokers()
         self.btn_sell.visible = False
+        self.odds_dirty = True
         
         if self.state == GameState.SHOPPING:
             self.update_shop_buttons()
+            self.start_shop_advisor()
+            self.autosave_run()
+
+    def rebuild_joker_events(self):
+        self.joker_events.rebuild([j.key for j in self.joker_list])
+
+    # --- Run Snapshots ---
+    def capture_snapshot(self):
+        """ Plain-data copy of the run. Only valid at safe points (DECIDING / SHOPPING). """
+        deck = self.deck_manager
+        snap = snapshot.RunSnapshot()
+        snap.state = self.state.value
+        snap.round_level = self.round_level
+        snap.target_score = self.target_score
+        snap.score_total = self.score_total
+        snap.hands_played = self.hands_played
+        snap.hands_max = self.hands_max
+        snap.discards_left = self.discards_left
+        snap.run_discards = self.run_discards
+        snap.coins = self.coins
+        snap.master_deck = [(c.suit, c.rank, c.modifier) for c in deck.master_deck]
+        snap.draw_pile = [c.deck_index for c in deck.draw_pile]
+        snap.discard_pile = [c.deck_index for c in deck.discard_pile]
+        snap.hand = [c.deck_index for c in self.hand_list]
+        snap.drawn_card = self.drawn_card.deck_index if self.drawn_card else None
+        snap.jokers = [j.key for j in self.joker_list]
+        if self.state == GameState.SHOPPING:
+            snap.shop = self.shop_offer_keys()
+        snap.rng_state = random.getstate()
+        snap.history_run = self.history_run
+        return snap
+
+    def autosave_run(self):
+        """ Captures on the main thread (cheap), encodes and writes on the writer thread """
+        snap = self.capture_snapshot()
+        self.save_manager.writer.submit(config.SNAPSHOT_FILE, snap.to_bytes_or_clear)
+
+    def resume_run(self):
+        """ Restores the autosaved run if there is one. Returns False to start fresh. """
+        if not os.path.exists(config.SNAPSHOT_FILE):
+            return False
+        try:
+            with open(config.SNAPSHOT_FILE, "rb") as f:
+                snap = snapshot.RunSnapshot.from_bytes(f.read())
+            self.restore_snapshot(snap)
+        except Exception as e:
+            print(f"Warning: Could not resume run, starting fresh. {e}")
+            return False
+        return True
+
+    def restore_snapshot(self, snap):
+        if self.diagnostics:
+            self.diagnostics.new_run()
+        # Carry on logging into the run's existing history row; only a snapshot that
+        # predates run ids (or was saved in practice mode) starts a new one
+        if self.practice:
+            self.history_run = None
+        else:
+            self.history_run = snap.history_run or self.history.start_run(snap.round_level)
+        if self.practice:
+            self.practice.reset()
+        self.score_total = snap.score_total
+        self.round_level = snap.round_level
+        self.target_score = snap.target_score
+        self.hands_played = snap.hands_played
+        self.hands_max = snap.hands_max
+        self.discards_left = snap.discards_left
+        self.run_discards = snap.run_discards
+        self.coins = snap.coins
+        self.message = ""
+        self.hand_details = []
+
+        self.card_list.clear()
+        self.hand_list.clear()
+        self.shop_list.clear()
+        self.pack_card_list.clear()
+        self.animating_cards.clear()
+        self.shop_buttons = []
+
+        self.deck_manager = systems.DeckManager(snap.master_deck)
+        master = self.deck_manager.master_deck
+        self.deck_manager.set_piles([master[i] for i in snap.draw_pile], [master[i] for i in snap.discard_pile])
+        self.deck_manager.stage_draw_pile(self.card_list)
+
+        self.joker_list.clear()
+        for key in snap.jokers:
+            self.joker_list.append(sprites.Joker(key, config.JOKER_SCALE))
+        self.rebuild_joker_events()
+        # Not in the snapshot; round start handlers are pure, so just ask them again
+        self.discards_max = self.joker_events.emit("on_round_start", events.round_start_ctx(0, config.MAX_DISCARDS))["discards_max"]
+        self.reposition_jokers()
+        for joker in self.joker_list:
+            joker.snap_to(joker.target_x, joker.target_y)
+
+        self.create_round_buttons()
+        self.drawn_card = None
+
+        if snap.state == GameState.SHOPPING.value:
+            self.set_state(GameState.SHOPPING)
+            self.message = "SHOP PHASE"
+            self.audio_manager.enter_store()
+            self.open_shop(snap.shop)
+        else:
+            self.set_state(GameState.DECIDING)
+            self.odds_dirty = True
+            self.audio_manager.start_bg_music()
+            for i in snap.hand:
+                card = master[i]
+                card.visible = True
+                self.hand_list.append(card)
+                self.card_list.append(card)
+            self.reposition_hand()
+            for card in self.hand_list:
+                card.snap_to(card.target_x, card.target_y)
+            if snap.drawn_card is not None:
+                card = master[snap.drawn_card]
+                card.visible = True
+                card.snap_to(config.DRAWN_CARD_X, config.DRAWN_CARD_Y)
+                card.target_x = config.DRAWN_CARD_X
+                card.target_y = config.DRAWN_CARD_Y
+                self.card_list.append(card)
+                self.drawn_card = card
+
+        # Sprite construction above consumes randomness, so the RNG goes back last
+        random.setstate(snap.rng_state)
+
+    # --- Practice Mode ---
+    def record_decision(self):
+        """ Called right before every player action, so it can be undone """
+        if self.practice:
+            self.practice.record(self, self.state.value)
+
+    def practice_key(self, symbol):
+        if symbol in (arcade.key.Z, arcade.key.BACKSPACE):
+            frame = self.practice.undo()
+            if frame:
+                self.restore_frame(frame)
+        elif symbol == arcade.key.LEFT:
+            self.practice.move_cursor(-1)
+        elif symbol == arcade.key.RIGHT:
+            self.practice.move_cursor(1)
+        elif symbol == arcade.key.ENTER and self.practice.cursor is not None:
+            self.restore_frame(self.practice.rewind(self.practice.cursor))
+        elif symbol == arcade.key.ESCAPE:
+            self.practice.cursor = None
+
+    def restore_frame(self, frame):
+        """ Rebinds the existing sprites to a recorded decision point """
+        (state, self.round_level, self.target_score, self.score_total, self.hands_played, self.hands_max,
+         self.discards_left, self.discards_max, self.run_discards, self.coins, self.message) = frame.scalars
+        state = GameState(state)
+        self.shop_advisor.cancel()
+        self.hand_details = []
+
+        self.card_list.clear()
+        self.hand_list.clear()
+        self.shop_list.clear()
+        self.pack_card_list.clear()
+        self.animating_cards.clear()
+        self.practice.restore_deck(frame, self.deck_manager)
+        self.deck_manager.stage_draw_pile(self.card_list)
+
+        # Cards and jokers spring back from wherever they are now
+        for card in frame.hand:
+            card.visible = True
+            self.hand_list.append(card)
+            self.card_list.append(card)
+        self.reposition_hand()
+        self.drawn_card = frame.drawn
+        if frame.drawn:
+            frame.drawn.visible = True
+            frame.drawn.target_x = config.DRAWN_CARD_X
+            frame.drawn.target_y = config.DRAWN_CARD_Y
+            self.card_list.append(frame.drawn)
+
+        self.joker_list.clear()
+        for joker in frame.jokers:
+            joker.is_selected = False
+            self.joker_list.append(joker)
+        self.rebuild_joker_events()
+        self.reposition_jokers()
+        self.btn_sell.visible = False
+
+        # Shop offers go back to their slots, above their own buttons
+        self.shop_buttons = []
+        for item, btn in frame.shop:
+            x, y = btn.center_x, btn.center_y + 170
+            if isinstance(item, sprites.Joker):
+                item.set_display_scale(config.JOKER_SCALE)
+                item.snap_to(x, y)
+                item.target_x = x
+                item.target_y = y
+                item.vel_x = item.vel_y = 0
+            else:
+                item.center_x = x
+                item.center_y = y
+            item.is_selected = False
+            self.shop_list.append(item)
+            self.shop_buttons.append(btn)
+
+        if state in (GameState.DRAWING, GameState.DECIDING):
+            self.set_state(state)
+            self.odds_dirty = True
+            self.audio_manager.start_bg_music()
+        else:
+            self.audio_manager.enter_store()
+            self.update_shop_buttons()
+            if state == GameState.PACK_OPENING:
+                message = self.message
+                self.show_pack(*frame.pack)
+                self.message = message
+            else:
+                self.set_state(state)
+                self.start_shop_advisor()
+        if state in (GameState.DECIDING, GameState.SHOPPING):
+            self.autosave_run()
+
+    def draw_practice_panel(self):
+        practice_history = self.practice
+        x, y = 20, 70
+        arcade.draw_text(f"PRACTICE  Z undo  ←/→ + Enter rewind  ({len(practice_history.frames)} points)",
+                         x, y, (180, 180, 180), 12)
+        if practice_history.cursor is not None:
+            frame = practice_history.frames[practice_history.cursor]
+            label = frame.label({s.value: s.name.lower() for s in GameState})
+            arcade.draw_text(f"Rewind to #{practice_history.cursor + 1}: {label}", x, y + 22, config.COLOR_GOLD, 14, bold=True)
 
 def main():
     window = WarGame()
-    window.setup()
     arcade.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+import collections
+from functools import lru_cache
+from math import comb
+
+import config
+import scoring
+
+# Hand types shown in the odds panel, in the order they're listed
+ODDS_HAND_TYPES = ("Pair", "Two Pair", "3 of a Kind", "Straight", "Flush", "Full House")
+# High Card 0 ... Straight Flush 8; the panel only offers types above the hand's own
+HAND_RANKS = {hand_type: rank for rank, hand_type in enumerate(reversed(list(scoring.HAND_BASE)))}
+
+# Minimal card for "what if I drew this" scoring; scoring only reads these fields
+OddsCard = collections.namedtuple("OddsCard", "value suit modifier")
+
+# --- Exact Hypergeometric Counts ---
+# Each function returns, for a draw of exactly k cards from the pile, the NUMBER of
+# k-card subsets that make the hand; dividing by C(N, k) gives the probability.
+# "Make" is optimistic: the player may keep any 5 of hand + drawn cards.
+# Inputs are canonicalised before the lru_cache so equivalent positions share work.
+
+def _comb_row(n, k):
+    """ [C(n, 0), C(n, 1), ...] up to the most cards that could be drawn from n """
+    return [comb(n, j) for j in range(min(n, k) + 1)]
+
+@lru_cache(maxsize=4096)
+def _rank_pattern_ways(pattern, k):
+    """ pattern: sorted ((in_hand, in_pile), ...) per rank. Ranks are interchangeable for
+    pair-type hands, so the order doesn't matter and many positions share one entry.
+    Returns ways for (Pair, Two Pair, 3 of a Kind, Full House). """
+    rest = sum(n for _, n in pattern)
+    full_house = 0      # Ways that already have everything; finished off in bulk
+    # state: (drawn, ranks with 2+ capped at 2, any rank with 3+)
+    states = {(0, 0, 0): 1}
+    for in_hand, in_pile in pattern:
+        rest -= in_pile
+        row = _comb_row(in_pile, k)
+        nxt = collections.defaultdict(int)
+        for (drawn, pairs, trips), ways in states.items():
+            for j in range(min(len(row), k - drawn + 1)):
+                have = in_hand + j
+                p = pairs + 1 if have >= 2 and pairs < 2 else pairs
+                t = 1 if have >= 3 else trips
+                if p == 2 and t:
+                    # Full house made: any fill of the remaining draws keeps it
+                    full_house += ways * row[j] * comb(rest, k - drawn - j)
+                else:
+                    nxt[(drawn + j, p, t)] += ways * row[j]
+        states = nxt
+
+    pair = two_pair = trips_ways = full_house
+    for (drawn, pairs, trips), ways in states.items():
+        if drawn != k:
+            continue
+        if pairs >= 1: pair += ways
+        if pairs >= 2: two_pair += ways
+        if trips: trips_ways += ways
+    return pair, two_pair, trips_ways, full_house
+
+@lru_cache(maxsize=4096)
+def _flush_ways(pattern, k):
+    """ pattern: sorted ((in_hand, in_pile), ...) per suit """
+    rest = sum(n for _, n in pattern)
+    made = 0
+    states = {0: 1}     # drawn -> ways, flush not made yet
+    for in_hand, in_pile in pattern:
+        rest -= in_pile
+        row = _comb_row(in_pile, k)
+        nxt = collections.defaultdict(int)
+        for drawn, ways in states.items():
+            for j in range(min(len(row), k - drawn + 1)):
+                if in_hand + j >= 5:
+                    made += ways * row[j] * comb(rest, k - drawn - j)
+                else:
+                    nxt[drawn + j] += ways * row[j]
+        states = nxt
+    return made
+
+@lru_cache(maxsize=4096)
+def _straight_ways(hand_ranks, pile_counts, k):
+    """ hand_ranks: frozenset of values held; pile_counts: counts for values 2..14 """
+    # The ace plays both ends: it's decided first and carried in the state for the A-high run
+    rest = sum(pile_counts) - pile_counts[12]
+    row = _comb_row(pile_counts[12], k)
+    held_ace = 14 in hand_ranks
+    # state: (drawn, current run length, ace present)
+    states = collections.defaultdict(int)
+    for j in range(min(len(row), k + 1)):
+        ace = held_ace or j > 0
+        states[(j, int(ace), ace)] += row[j]
+
+    made = 0
+    for value in range(2, 14):
+        in_pile = pile_counts[value - 2]
+        rest -= in_pile
+        row = _comb_row(in_pile, k)
+        held = value in hand_ranks
+        # Runs that can't reach 5 even with every higher rank (and the ace) are dropped
+        reach = 13 - value
+        nxt = collections.defaultdict(int)
+        for (drawn, run, ace), ways in states.items():
+            for j in range(min(len(row), k - drawn + 1)):
+                if held or j > 0:
+                    r = run + 1
+                    if r == 5:
+                        made += ways * row[j] * comb(rest, k - drawn - j)
+                        continue
+                else:
+                    r = 0
+                if r + reach + ace >= 5:
+                    nxt[(drawn + j, r, ace)] += ways * row[j]
+        states = nxt
+
+    for (drawn, run, ace), ways in states.items():
+        if drawn == k and ace and run == 4:
+            made += ways
+    return made
+
+def make_probabilities(known_cards, pile_by_rank, pile_by_suit, pile_total, k):
+    """ Exact chance that hand + the next k draws can make each of ODDS_HAND_TYPES """
+    k = max(0, min(k, pile_total))
+    all_ways = comb(pile_total, k)
+    if all_ways == 0:
+        return {t: 0.0 for t in ODDS_HAND_TYPES}
+
+    hand_ranks = collections.Counter(c.value for c in known_cards)
+    hand_suits = collections.Counter(c.suit for c in known_cards)
+
+    rank_pattern = tuple(sorted((hand_ranks[v], pile_by_rank[v]) for v in range(2, 15)))
+    suit_pattern = tuple(sorted((hand_suits[s], pile_by_suit[s]) for s in config.SUITS))
+    pile_counts = tuple(pile_by_rank[v] for v in range(2, 15))
+
+    pair, two_pair, trips, full_house = _rank_pattern_ways(rank_pattern, k)
+    return {
+        "Pair": pair / all_ways,
+        "Two Pair": two_pair / all_ways,
+        "3 of a Kind": trips / all_ways,
+        "Straight": _straight_ways(frozenset(hand_ranks), pile_counts, k) / all_ways,
+        "Flush": _flush_ways(suit_pattern, k) / all_ways,
+        "Full House": full_house / all_ways,
+    }
+
+class OddsTracker:
+    """ Keeps the odds panel current. Call update() only when the hand, the draw pile
+    or the loadout actually changed, and outside of drawing; the panel just reads the
+    last result. `upgrades` lists the ODDS_HAND_TYPES that would beat the hand held now.
+
+    The hypergeometric parts are memoised on canonical keys, and the per-card score of
+    "hand + that card" is cached on what it depends on: the known cards, the loadout,
+    run discards and coins. The pile size only joins that key when a joker reading it
+    (scoring.DECK_SIZE_JOKERS) is owned, so a draw that leaves the known cards alone
+    re-weights the cached scores by the new counts instead of re-scoring the pile.
+
+    Descoped from "a fraction of a millisecond per update": a take changes the known
+    cards, and then every distinct card left in the pile is re-scored (each candidate
+    swap, once the hand is full). With five jokers that's about 1-1.5 ms typical and
+    up to ~5 ms, nearly all of it in the scorer. It runs once per take, from on_update. """
+    def __init__(self, max_hand_size):
+        self.max_hand_size = max_hand_size
+        self.next_draw = {}
+        self.next_k = {}
+        self.k = 0
+        self.expected_delta = 0.0
+        self.upgrades = ODDS_HAND_TYPES
+        self._score_context = None
+        self._class_scores = {}
+
+    def update(self, hand_cards, drawn_card, pile_index, discards_left, joker_list, run_discards, coins):
+        known = [OddsCard(c.value, c.suit, c.modifier) for c in hand_cards]
+        # A pending card with room in hand is as good as held
+        if drawn_card is not None and len(known) < self.max_hand_size:
+            known.append(OddsCard(drawn_card.value, drawn_card.suit, drawn_card.modifier))
+
+        held = HAND_RANKS.get(scoring.get_hand_type(known), -1)     # "Empty" below everything
+        self.upgrades = tuple(t for t in ODDS_HAND_TYPES if HAND_RANKS[t] > held)
+
+        free_slots = max(0, self.max_hand_size - len(known))
+        self.k = min(pile_index.total, free_slots + discards_left)
+        self.next_draw = make_probabilities(known, pile_index.by_rank, pile_index.by_suit, pile_index.total, 1)
+        self.next_k = make_probabilities(known, pile_index.by_rank, pile_index.by_suit, pile_index.total, self.k)
+        self.expected_delta = self._expected_delta(known, pile_index, joker_list, run_discards, coins)
+
+    def _expected_delta(self, known, pile_index, joker_list, run_discards, coins):
+        """ Expected score change from taking the next card (best single swap if the hand is full) """
+        if pile_index.total <= 0:
+            return 0.0
+        cards_in_deck = pile_index.total - 1
+        loadout = scoring.loadout_key(joker_list)
+        deck_size = cards_in_deck if scoring.DECK_SIZE_JOKERS.intersection(loadout) else None
+        context = (tuple(known), loadout, run_discards, coins, deck_size)
+        if context != self._score_context:
+            self._score_context = context
+            self._class_scores = {}
+
+        scorer = scoring.compile_scorer(loadout)
+        def score(cards):
+            base, mult, _, _ = scorer(cards, run_discards, cards_in_deck, coins)
+            return base * mult
+
+        current = score(known) if known else 0
+        total = 0.0
+        for card_key, count in pile_index.by_card.items():
+            if count <= 0:
+                continue
+            value = self._class_scores.get(card_key)
+            if value is None:
+                card = OddsCard(*card_key)
+                if len(known) < self.max_hand_size:
+                    value = score(known + [card])
+                else:
+                    value = current
+                    for i in range(len(known)):
+                        value = max(value, score(known[:i] + known[i + 1:] + [card]))
+                self._class_scores[card_key] = value
+            total += count * (value - current)
+        return total / pile_index.total
@@ -0,0 +1,241 @@
+import types
+import random
+import collections
+
+import config
+import engine
+
+# --- Player Policies ---
+# A policy gets a PlayerView each turn and returns an action tuple:
+#   ("take", (hand indices to discard...))   ("play",)
+#   ("buy", slot)   ("sell", joker index)   ("pick", modifier index, (pack indices...))
+#   ("skip",)   ("next",)
+# Policies don't own any game state, so one instance can play any number of runs.
+
+TAKE = "take"
+PLAY = "play"
+BUY = "buy"
+SELL = "sell"
+PICK = "pick"
+SKIP = "skip"
+NEXT = "next"
+
+# What a policy sees of a card: an immutable copy, so it can't edit the run's deck.
+# One shared instance per (suit, rank, modifier); scoring reads these fields as is.
+CardView = collections.namedtuple("CardView", "suit rank value modifier")
+_CARD_VIEWS = {}
+
+def card_view(card):
+    key = (card.suit, card.rank, card.modifier)
+    view = _CARD_VIEWS.get(key)
+    if view is None:
+        view = _CARD_VIEWS[key] = CardView(card.suit, card.rank, card.value, card.modifier)
+    return view
+
+class PlayerView:
+    """ Read-only window onto a RunState: what a player could see on screen.
+    Cards come out as CardViews and counts as read-only mappings. """
+    __slots__ = ("_run",)
+
+    def __init__(self, run):
+        self._run = run
+
+    @property
+    def state(self): return self._run.state
+    @property
+    def hand(self): return tuple(map(card_view, self._run.hand))
+    @property
+    def drawn_card(self):
+        card = self._run.drawn_card
+        return None if card is None else card_view(card)
+    @property
+    def jokers(self): return tuple(self._run.jokers)
+    @property
+    def coins(self): return self._run.coins
+    @property
+    def discards_left(self): return self._run.discards_left
+    @property
+    def hands_left(self): return self._run.hands_max - self._run.hands_played
+    @property
+    def round_level(self): return self._run.round_level
+    @property
+    def score_needed(self): return self._run.target_score - self._run.score_total
+    @property
+    def shop(self): return tuple(self._run.shop)
+    @property
+    def pack_cards(self): return tuple(map(card_view, self._run.pack_cards))
+    @property
+    def pack_modifiers(self): return tuple(self._run.pack_modifiers)
+    @property
+    def hand_size(self): return len(self._run.hand)
+    @property
+    def deck_size(self): return len(self._run.draw_pile)
+
+    def deck_counts(self):
+        """ (by rank value, by suit) for the cards still to draw; the run keeps these current """
+        by_rank, by_suit = self._run.pile_counts()
+        return types.MappingProxyType(by_rank), types.MappingProxyType(by_suit)
+
+    def score(self, cards):
+        """ What `cards` would score right now, with the current jokers/coins/deck """
+        if not cards:
+            return 0
+        run = self._run
+        base, mult, _, _ = run.current_scorer()(cards, run.run_discards, len(run.draw_pile), run.coins)
+        return base * mult
+
+def apply_action(run, action):
+    """ Performs a policy action on a RunState; raises engine.ActionError if it's illegal """
+    op = action[0]
+    if op == TAKE:
+        run.take(action[1] if len(action) > 1 else ())
+    elif op == PLAY:
+        run.play()
+    elif op == BUY:
+        run.buy(action[1])
+    elif op == SELL:
+        run.sell(action[1])
+    elif op == PICK:
+        run.apply_modifier(action[1], action[2])
+    elif op == SKIP:
+        run.skip_pack()
+    elif op == NEXT:
+        run.next_level()
+    else:
+        raise engine.ActionError(f"unknown action {op!r}")
+
+def fallback_action(view):
+    """ Always-legal move, used when a policy returns something illegal """
+    if view.state == engine.SHOPPING:
+        return (NEXT,)
+    if view.state == engine.PACK_OPENING:
+        return (SKIP,)
+    if view.hand_size and (view.drawn_card is None or view.hand_size >= config.MAX_HAND_SIZE):
+        return (PLAY,)
+    return (TAKE,)
+
+class Policy:
+    name = "base"
+
+    def reset(self, seed):
+        """ Called before every run """
+
+    def act(self, view):
+        raise NotImplementedError
+
+class RandomPolicy(Policy):
+    """ Uniformly random among (mostly) legal moves; the baseline """
+    name = "random"
+
+    def __init__(self):
+        self.rng = random.Random()
+
+    def reset(self, seed):
+        self.rng.seed(seed)
+
+    def act(self, view):
+        rng = self.rng
+        if view.state == engine.SHOPPING:
+            affordable = [i for i, item in enumerate(view.shop) if _cost(item) <= view.coins]
+            if affordable and rng.random() < 0.5:
+                return (BUY, rng.choice(affordable))
+            return (NEXT,)
+        if view.state == engine.PACK_OPENING:
+            # Late in a run, with most of the deck destroyed, a pack can hold fewer than 2 cards
+            n = len(view.pack_cards)
+            if not n or rng.random() < 0.5:
+                return (SKIP,)
+            return (PICK, rng.randrange(len(view.pack_modifiers)), tuple(rng.sample(range(n), min(2, n))))
+
+        hand = view.hand
+        full = len(hand) >= config.MAX_HAND_SIZE
+        if hand and (full or view.drawn_card is None or rng.random() < 0.2):
+            if full and view.discards_left > 0 and view.drawn_card is not None and rng.random() < 0.5:
+                return (TAKE, (rng.randrange(len(hand)),))
+            return (PLAY,)
+        return (TAKE,)
+
+class GreedyPolicy(Policy):
+    """ Fills the hand and plays it; buys the first joker it can afford """
+    name = "greedy"
+
+    def act(self, view):
+        if view.state == engine.SHOPPING:
+            if len(view.jokers) < config.MAX_JOKERS:
+                for i, item in enumerate(view.shop):
+                    if item != "Pack" and _cost(item) <= view.coins:
+                        return (BUY, i)
+            return (NEXT,)
+        if view.state == engine.PACK_OPENING:
+            return (SKIP,)
+        if view.hand_size >= config.MAX_HAND_SIZE or view.drawn_card is None:
+            return (PLAY,)
+        return (TAKE,)
+
+# Rough value order for the heuristic shop: x-mult first, then flat mult, chips, economy
+JOKER_PRIORITY = [
+    "double_trouble", "rainbow_trout", "multi_python", "capital_gains", "pear_up", "triple_treat",
+    "the_regular", "inflation", "face_value", "diamond_geezer", "waste_management", "helping_hand",
+    "mulligan", "odd_todd", "club_sandwich", "national_reserve", "potato_chip", "petty_cash",
+    "the_harvest", "wishing_well", "severance_package",
+]
+JOKER_RANK = {key: i for i, key in enumerate(JOKER_PRIORITY)}
+
+class HeuristicPolicy(Policy):
+    """ Plays as soon as the hand clears the round, otherwise swaps toward the best hand;
+    shops by a fixed joker ranking and spends spare coins on packs """
+    name = "heuristic"
+
+    def act(self, view):
+        if view.state == engine.SHOPPING:
+            return self.shop(view)
+        if view.state == engine.PACK_OPENING:
+            return self.pack(view)
+
+        hand = view.hand
+        drawn = view.drawn_card
+        current = view.score(hand)
+        if hand and current >= view.score_needed:
+            return (PLAY,)
+        if drawn is None:
+            return (PLAY,) if hand else (TAKE,)
+        if len(hand) < config.MAX_HAND_SIZE:
+            return (TAKE,)
+
+        # Full hand: swap out whichever card gains the most, if any
+        if view.discards_left > 0:
+            best_i, best = None, current
+            for i in range(len(hand)):
+                score = view.score(hand[:i] + hand[i + 1:] + (drawn,))
+                if score > best:
+                    best_i, best = i, score
+            if best_i is not None:
+                return (TAKE, (best_i,))
+        return (PLAY,)
+
+    def shop(self, view):
+        offers = view.shop
+        if len(view.jokers) < config.MAX_JOKERS:
+            jokers = [(JOKER_RANK.get(item, len(JOKER_RANK)), i) for i, item in enumerate(offers)
+                      if item != "Pack" and _cost(item) <= view.coins]
+            if jokers:
+                return (BUY, min(jokers)[1])
+        if "Pack" in offers and view.coins >= config.PACK_COST * 2:
+            return (BUY, offers.index("Pack"))
+        return (NEXT,)
+
+    def pack(self, view):
+        mods = view.pack_modifiers
+        useful = [i for i, mod in enumerate(mods) if mod != "destroy"]
+        cards = view.pack_cards
+        if not useful or not cards:
+            return (SKIP,)
+        # Mult beats chips on the two highest cards offered
+        mod_index = max(useful, key=lambda i: mods[i] == "mult_plus")
+        best = sorted(range(len(cards)), key=lambda i: cards[i].value, reverse=True)[:2]
+        return (PICK, mod_index, tuple(best))
+
+def _cost(item):
+    return config.PACK_COST if item == "Pack" else config.JOKER_DATA[item]["cost"]
+
+POLICIES = {cls.name: cls for cls in (RandomPolicy, GreedyPolicy, HeuristicPolicy)}
@@ -0,0 +1,156 @@
+import os
+
+import config
+
+# --- Practice Mode ---
+# Unlimited undo, and rewinding to any earlier decision point of the run. Right before
+# every decision (take/discard, play, buy, sell, pack pick or skip, next level) the run
+# is recorded as a Frame. Frames are persistent and share every field that didn't
+# change with the frame before them:
+#   draw pile   the round's shuffled order as one tuple, plus how many are still in it
+#   discards    a cons list (card, rest), so each discard adds one pair
+#   hand, jokers, shop   small tuples of the sprites themselves
+#   modifiers   one tuple for the whole deck, replaced only when a pack changes it
+# Recording therefore costs O(fields that changed), and restoring a frame puts the
+# existing sprites back where it says; nothing is reconstructed.
+# Randomness isn't part of a frame: a rewound shop or shuffle rolls again.
+# Undone actions would otherwise be counted twice, so a practice session records
+# nothing in the save stats or the run history (see WarGame.setup).
+
+def enabled():
+    return config.PRACTICE_MODE or os.environ.get(config.PRACTICE_ENV, "") not in ("", "0")
+
+def unroll(cons):
+    """ Cons list -> list, oldest first """
+    items = []
+    while cons is not None:
+        item, cons = cons
+        items.append(item)
+    items.reverse()
+    return items
+
+def _share(new, old):
+    """ The previous frame's object when nothing changed, so frames share it """
+    return old if old == new else new
+
+class Frame:
+    __slots__ = ("scalars", "order", "draw_count", "discards", "hand", "drawn",
+                 "jokers", "modifiers", "shop", "pack")
+
+    def same_as(self, other):
+        return (self.scalars == other.scalars and self.order is other.order
+                and self.draw_count == other.draw_count and self.discards is other.discards
+                and self.hand == other.hand and self.drawn is other.drawn
+                and self.jokers == other.jokers and self.modifiers is other.modifiers
+                and self.shop == other.shop and self.pack == other.pack)
+
+    def label(self, state_names):
+        state, level, target, score, _, _, _, _, _, coins, _ = self.scalars
+        return f"Lvl {level} {state_names[state]}  {score}/{target}  ${coins}  hand {len(self.hand)}"
+
+class PracticeHistory:
+    def __init__(self):
+        self.frames = []
+        self.cursor = None          # Frame picked in the rewind panel, if any
+        self.reset()
+
+    def reset(self):
+        """ New run: forget every frame """
+        self.frames.clear()
+        self.cursor = None
+        # The live piles the cached tuples below were built from
+        self._order_source = None
+        self._order = ()
+        self._discard_source = None
+        self._discard_count = 0
+        self._discards = None
+        self._modifier_version = -1
+        self._modifiers = ()
+
+    def record(self, game, state_value):
+        """ Call right before an action. A repeat of the last frame (the previous
+        action changed nothing, e.g. a buy without the coins) isn't stored again. """
+        frame = self.capture(game, state_value)
+        if self.frames and self.frames[-1].same_as(frame):
+            return
+        self.frames.append(frame)
+        self.cursor = None
+
+    def capture(self, game, state_value):
+        deck = game.deck_manager
+        prev = self.frames[-1] if self.frames else None
+
+        # Cards only ever leave the top of the draw pile, so its start-of-round order
+        # (or whatever it was when first seen) stays valid with a shorter count
+        if deck.draw_pile is not self._order_source:
+            self._order_source = deck.draw_pile
+            self._order = tuple(deck.draw_pile)
+        # ...and only ever join the discard pile at the end
+        pile = deck.discard_pile
+        if pile is not self._discard_source or len(pile) < self._discard_count:
+            self._discard_source = pile
+            self._discard_count = 0
+            self._discards = None
+        for i in range(self._discard_count, len(pile)):
+            self._discards = (pile[i], self._discards)
+        self._discard_count = len(pile)
+        if deck.modifier_version != self._modifier_version:
+            self._modifier_version = deck.modifier_version
+            self._modifiers = tuple(c.modifier for c in deck.master_deck)
+
+        frame = Frame()
+        frame.scalars = (state_value, game.round_level, game.target_score, game.score_total,
+                         game.hands_played, game.hands_max, game.discards_left, game.discards_max,
+                         game.run_discards, game.coins, game.message)
+        frame.order = self._order
+        frame.draw_count = len(deck.draw_pile)
+        frame.discards = self._discards
+        frame.hand = tuple(game.hand_list)
+        frame.drawn = game.drawn_card
+        frame.jokers = tuple(game.joker_list)
+        frame.modifiers = self._modifiers
+        frame.shop = tuple(zip(game.shop_list, game.shop_buttons))
+        frame.pack = (tuple(game.pack_card_list), tuple(game.pack_modifiers_offered)) if game.pack_card_list else None
+        if prev is not None:
+            for name in ("scalars", "hand", "jokers", "shop", "pack"):
+                setattr(frame, name, _share(getattr(frame, name), getattr(prev, name)))
+        return frame
+
+    # --- Undo / Rewind ---
+    def undo(self):
+        """ The frame before the last action, or None. It's dropped from the history:
+        restoring it makes it the present, which is recorded again on the next action. """
+        if not self.frames:
+            return None
+        return self.rewind(len(self.frames) - 1)
+
+    def rewind(self, index):
+        """ Jumps back to frame `index`, discarding it and everything after it """
+        frame = self.frames[index]
+        del self.frames[index:]
+        self.cursor = None
+        return frame
+
+    def move_cursor(self, step):
+        if not self.frames:
+            return
+        if self.cursor is None:
+            self.cursor = len(self.frames)
+        self.cursor = min(len(self.frames) - 1, max(0, self.cursor + step))
+
+    def restore_deck(self, frame, deck):
+        """ Rebinds the deck's card sprites to the frame's piles and modifiers """
+        if frame.modifiers is not self._modifiers or deck.modifier_version != self._modifier_version:
+            deck.restore_modifiers(frame.modifiers)
+        for card in deck.master_deck:
+            card.recall()
+        deck.set_piles(list(frame.order[:frame.draw_count]), unroll(frame.discards))
+
+        # Keep sharing with the restored frame from here on
+        self._order_source = deck.draw_pile
+        self._order = frame.order
+        self._discard_source = deck.discard_pile
+        self._discard_count = len(deck.discard_pile)
+        self._discards = frame.discards
+        self._modifier_version = deck.modifier_version
+        self._modifiers = frame.modifiers
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import marshal
+import pstats
+import cProfile
+
+import config
+
+# --- Frame Profiler ---
+# Captures the next N frames of on_update/on_draw in cProfile. While idle it isn't
+# installed at all: start() shadows the two window methods with instance attributes
+# (pyglet looks handlers up by name on every dispatch) and finish() deletes them, so
+# the normal path runs the class methods directly.
+#
+# Each capture writes three files to config.PROFILE_DIR, named
+#   <time>_<states>_<frames>f_worst<ms>ms.{prof,collapsed,json}
+# .prof loads in pstats/snakeviz; .collapsed is "a;b;c <microseconds>" per stack for
+# flamegraph.pl / speedscope; .json has the per-frame timings and game states.
+
+HOOKED = ("on_update", "on_draw")
+
+class FrameProfiler:
+    def __init__(self, window, writer, out_dir=config.PROFILE_DIR):
+        self.window = window
+        self.writer = writer        # save_manager.BackgroundWriter; files are written off the game loop
+        self.out_dir = out_dir
+        self.profile = None
+        self.frames_left = 0
+        self.frames = []            # (state, update ms, draw ms)
+        self.update_ms = 0.0
+        self.started = ""
+
+    def is_active(self):
+        return self.profile is not None
+
+    def start(self, frames):
+        """ Profiles the next `frames` draws (and the updates between them). Ignored mid-capture. """
+        if self.profile is not None or frames <= 0:
+            return
+        self.profile = cProfile.Profile()
+        self.frames_left = frames
+        self.frames = []
+        self.update_ms = 0.0
+        self.started = time.strftime("%Y%m%d-%H%M%S")
+        window = self.window
+        for name in HOOKED:
+            setattr(window, name, self._wrap(name, getattr(type(window), name).__get__(window)))
+        print(f"Profiling {frames} frames...")
+
+    def _wrap(self, name, method):
+        profile = self.profile
+        is_draw = name == "on_draw"
+
+        def profiled(*args):
+            t0 = time.perf_counter()
+            profile.enable()
+            try:
+                return method(*args)
+            finally:
+                profile.disable()
+                ms = (time.perf_counter() - t0) * 1000
+                if is_draw:
+                    self._end_frame(ms)
+                else:
+                    self.update_ms += ms
+        return profiled
+
+    def _end_frame(self, draw_ms):
+        self.frames.append((_state_name(self.window), round(self.update_ms, 3), round(draw_ms, 3)))
+        self.update_ms = 0.0
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.finish()
+
+    def finish(self):
+        """ Unhooks the window and queues the files """
+        if self.profile is None:
+            return
+        for name in HOOKED:
+            self.window.__dict__.pop(name, None)
+        profile, frames = self.profile, self.frames
+        self.profile = None
+
+        states = list(dict.fromkeys(state for state, _, _ in frames))
+        worst = max((u + d for _, u, d in frames), default=0.0)
+        stem = os.path.join(self.out_dir, f"{self.started}_{'-'.join(states)}_{len(frames)}f_worst{worst:.0f}ms")
+
+        # Stats are built once, on the writer thread, and shared by the three files
+        cache = {}
+        def stats():
+            if "stats" not in cache:
+                cache["stats"] = pstats.Stats(profile).stats
+            return cache["stats"]
+
+        meta = {
+            "started": self.started,
+            "states": states,
+            "frames": [{"state": s, "update_ms": u, "draw_ms": d, "total_ms": round(u + d, 3)} for s, u, d in frames],
+            "worst_ms": round(worst, 3),
+            "mean_ms": round(sum(u + d for _, u, d in frames) / max(1, len(frames)), 3),
+        }
+        self.writer.submit(stem + ".prof", lambda: marshal.dumps(stats()))
+        self.writer.submit(stem + ".collapsed", lambda: collapsed_stacks(stats()).encode("utf-8"))
+        self.writer.submit(stem + ".json", lambda: json.dumps(meta, indent=2).encode("utf-8"))
+        print(f"Profile written to {stem}.*")
+
+def _state_name(window):
+    state = getattr(window, "state", None)
+    return getattr(state, "name", str(state))
+
+def _label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name     # Builtins, e.g. <built-in method time.perf_counter>
+    return f"{os.path.basename(filename)}:{name}:{line}"
+
+def collapsed_stacks(stats):
+    """ pstats data -> folded stacks. cProfile only keeps caller/callee pairs, so deeper
+    stacks are rebuilt by splitting each function's time across its callers in
+    proportion to the time each call edge accounts for. """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+
+    lines = {}
+    def walk(func, stack, share):
+        _, _, tt, ct, _ = stats[func]
+        path = stack + (_label(func),)
+        self_us = int(tt * share * 1e6)
+        if self_us > 0:
+            key = ";".join(path)
+            lines[key] = lines.get(key, 0) + self_us
+        for callee in callees.get(func, ()):
+            if _label(callee) in path:
+                continue        # Recursion: already counted further up this stack
+            callee_ct = stats[callee][3]
+            edge_ct = stats[callee][4][func][3]
+            if callee_ct > 0 and share * edge_ct >= 1e-6:     # Drop sub-microsecond branches
+                walk(callee, path, share * edge_ct / callee_ct)
+
+    roots = [func for func, (_, _, _, _, callers) in stats.items() if not callers]
+    for root in roots:
+        walk(root, (), 1.0)
+    return "".join(f"{stack} {us}\n" for stack, us in sorted(lines.items()))
+
+def frames_from_env():
+    """ N from WARLATRO_PROFILE_FRAMES, or 0 """
+    try:
+        return max(0, int(os.environ.get(config.PROFILE_ENV, "0")))
+    except ValueError:
+        print(f"Warning: {config.PROFILE_ENV} should be a frame count.")
+        return 0
@@ -0,0 +1,175 @@
+import os
+import json
+import hashlib
+import threading
+
+import config
+
+SAVE_VERSION = 1
+
+DEFAULT_SAVE_DATA = {
+    "highest_score": 0,         # Best single hand
+    "highest_level": 1,
+    "total_hands_played": 0,
+    "total_runs": 0,
+    "favorite_joker": None,     # Most purchased
+    "favorite_card": None,      # Most played, e.g. "A of Spades"
+    "joker_purchases": {},
+    "card_plays": {},
+    "hand_types": {},
+    "unlocks": {},
+}
+
+def atomic_write(path, data):
+    """ Writes bytes so that `path` is always either the old or the new file, never half of one """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class BackgroundWriter:
+    """ One daemon thread that writes files off the game loop.
+    Jobs are keyed by path and only the latest payload per path is kept,
+    so a burst of saves collapses into a single write. """
+    def __init__(self):
+        self.pending = {}
+        self.busy = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, path, make_bytes):
+        """ `make_bytes` runs on the writer thread, so serialization doesn't cost a frame either.
+        Returning None deletes the file instead. """
+        with self.cond:
+            self.pending[path] = make_bytes
+            self.cond.notify()
+
+    def flush(self, timeout=2.0):
+        """ Blocks until everything queued so far is on disk (used on exit) """
+        with self.cond:
+            self.cond.wait_for(lambda: not self.pending and not self.busy, timeout)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.pending)
+                path, make_bytes = self.pending.popitem()
+                self.busy = True
+            try:
+                data = make_bytes()
+                if data is None:
+                    if os.path.exists(path):
+                        os.remove(path)
+                else:
+                    atomic_write(path, data)
+            except Exception as e:
+                print(f"Warning: Could not write {path}. {e}")
+            with self.cond:
+                self.busy = False
+                self.cond.notify_all()
+
+def _checksum(payload):
+    return hashlib.sha256(payload).hexdigest()
+
+class SaveManager:
+    """ Lifetime stats and unlocks.
+    Updates only touch the in-memory dict and mark keys dirty; commit() hands a copy
+    to the writer thread and is called once per transition into SHOPPING or GAME_OVER. """
+    def __init__(self, path=None, writer=None):
+        self.path = path or config.SAVE_FILE
+        self.writer = writer or BackgroundWriter()
+        self.dirty = set()
+        self.data = self.load_save_data()
+
+    # --- Load / Write ---
+    def load_save_data(self):
+        """ Single read. Returns defaults if the file is missing or fails its checksum. """
+        data = {k: (dict(v) if isinstance(v, dict) else v) for k, v in DEFAULT_SAVE_DATA.items()}
+        try:
+            with open(self.path, "rb") as f:
+                envelope = json.loads(f.read())
+        except FileNotFoundError:
+            return data
+        except Exception as e:
+            print(f"Warning: Save file unreadable, starting fresh. {e}")
+            return data
+
+        payload = json.dumps(envelope.get("data"), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        if envelope.get("checksum") != _checksum(payload):
+            print("Warning: Save file failed its checksum, starting fresh.")
+            return data
+        if envelope.get("version") != SAVE_VERSION:
+            # Only version 1 exists so far; future migrations hook in here, off the hot path
+            print(f"Warning: Unknown save version {envelope.get('version')}, starting fresh.")
+            return data
+
+        data.update(envelope["data"])
+        return data
+
+    def _encode(self, snapshot):
+        payload = json.dumps(snapshot, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        envelope = {"version": SAVE_VERSION, "checksum": _checksum(payload), "data": snapshot}
+        return json.dumps(envelope, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    def _snapshot(self):
+        # Values are flat or one level of dict, so this is a full copy without deepcopy's overhead
+        return {k: (dict(v) if isinstance(v, dict) else v) for k, v in self.data.items()}
+
+    def commit(self):
+        """ Queues a background write if anything changed since the last one """
+        if not self.dirty:
+            return
+        self.dirty.clear()
+        snapshot = self._snapshot()
+        self.writer.submit(self.path, lambda: self._encode(snapshot))
+
+    def write_save_data(self):
+        """ Synchronous write, for shutdown """
+        self.dirty.clear()
+        atomic_write(self.path, self._encode(self._snapshot()))
+
+    def close(self):
+        self.commit()
+        self.writer.flush()
+
+    # --- Stat Updates ---
+    def _bump(self, table, key, amount=1):
+        counts = self.data[table]
+        counts[key] = counts.get(key, 0) + amount
+        self.dirty.add(table)
+        return counts[key]
+
+    def record_hand(self, hand_cards, hand_type, score):
+        self.data["total_hands_played"] += 1
+        self.dirty.add("total_hands_played")
+        self._bump("hand_types", hand_type)
+
+        if score > self.data["highest_score"]:
+            self.data["highest_score"] = score
+            self.dirty.add("highest_score")
+
+        for card in hand_cards:
+            key = f"{card.rank} of {card.suit}"
+            count = self._bump("card_plays", key)
+            favorite = self.data["favorite_card"]
+            if favorite is None or count > self.data["card_plays"].get(favorite, 0):
+                self.data["favorite_card"] = key
+                self.dirty.add("favorite_card")
+
+    def record_joker_purchase(self, key):
+        count = self._bump("joker_purchases", key)
+        favorite = self.data["favorite_joker"]
+        if favorite is None or count > self.data["joker_purchases"].get(favorite, 0):
+            self.data["favorite_joker"] = key
+            self.dirty.add("favorite_joker")
+
+    def record_run_end(self, round_level):
+        self.data["total_runs"] += 1
+        self.dirty.add("total_runs")
+        if round_level > self.data["highest_level"]:
+            self.data["highest_level"] = round_level
+            self.dirty.add("highest_level")
@@ -0,0 +1,170 @@
+import sys
+import csv
+import json
+import time
+import argparse
+import functools
+import itertools
+import collections
+import concurrent.futures
+
+import config
+import engine
+import scoring
+
+# --- Batch Scoring CLI ---
+# Scores hands from JSONL (stdin or files) with the game's own scorer, one record per line:
+#   {"cards": ["10H", "AS+m", "KD"], "jokers": ["club_sandwich"], "run_discards": 3,
+#    "cards_in_deck": 20, "coins": 5}
+# Modifiers ride on the card codes (engine.MODIFIER_CODES), or come as a "modifiers"
+# list of keys alongside "cards". An "id" is passed through. Every stage is a generator,
+# so memory stays flat however long the input is; with --workers, chunks go to a process
+# pool with only a few in flight at once. Logic modules only, no arcade.
+#   python score_cli.py hands.jsonl --format csv > scored.csv
+
+FIELDS = ["line", "id", "hand_type", "base", "mult", "total", "coin_bonus", "error"]
+DEFAULT_CHUNK = 1000
+
+SUIT_CODES = {suit[0]: suit for suit in config.SUITS}
+MODIFIER_KEYS = {code: key for key, code in engine.MODIFIER_CODES.items() if code}
+
+@functools.lru_cache(maxsize=1024)
+def parse_card(code, modifier=None):
+    """ "10H" / "AS+m" -> SimCard; an explicit modifier key wins over the code's.
+    Cached: the scorer only reads cards, so every hand shares one object per code. """
+    body, suffix = code, ""
+    for mod_code, key in MODIFIER_KEYS.items():
+        if code.endswith(mod_code):
+            body, suffix = code[:-len(mod_code)], key
+            break
+    rank, suit = body[:-1], SUIT_CODES.get(body[-1:])
+    if suit is None or rank not in config.RANKS:
+        raise ValueError(f"bad card {code!r}")
+    modifier = modifier or suffix or None
+    if modifier is not None and modifier not in config.MODIFIER_DATA:
+        raise ValueError(f"unknown modifier {modifier!r}")
+    return engine.SimCard(suit, rank, modifier)
+
+@functools.lru_cache(maxsize=1024)
+def loadout_scorer(jokers):
+    """ The scorer calculate_hand_score() would use, keyed by joker keys rather than sprites """
+    for key in jokers:
+        if key not in config.JOKER_DATA:
+            raise ValueError(f"unknown joker {key!r}")
+    return scoring.compile_scorer(tuple(sorted(jokers)))
+
+def score_record(record):
+    """ One parsed JSON record -> (hand_type, base, mult, coin_bonus) """
+    codes = record["cards"]
+    modifiers = record.get("modifiers") or [None] * len(codes)
+    if len(modifiers) != len(codes):
+        raise ValueError("modifiers and cards differ in length")
+    hand = [parse_card(code, mod) for code, mod in zip(codes, modifiers)]
+    scorer = loadout_scorer(tuple(record.get("jokers") or ()))
+    base, mult, _, coin_bonus = scorer(hand, int(record.get("run_discards", 0)),
+                                       int(record.get("cards_in_deck", 0)), int(record.get("coins", 0)))
+    return scoring.get_hand_type(hand), base, mult, coin_bonus
+
+def score_line(number, line):
+    """ Never raises for a bad record (int(Infinity) is an OverflowError); it becomes the row's error """
+    row = {"line": number}
+    try:
+        record = json.loads(line)
+        row["id"] = record.get("id")
+        hand_type, base, mult, coin_bonus = score_record(record)
+        row.update(hand_type=hand_type, base=base, mult=mult, total=base * mult, coin_bonus=coin_bonus)
+    except (ValueError, KeyError, TypeError, AttributeError, OverflowError) as e:
+        row["error"] = str(e) or type(e).__name__
+    return row
+
+def score_chunk(chunk):
+    """ Worker entry point: [(line number, text), ...] -> rows """
+    return [score_line(number, line) for number, line in chunk]
+
+# --- Pipeline ---
+def read_lines(paths):
+    """ (line number, text) for every non-blank line; "-" is stdin """
+    number = 0
+    for path in paths or ["-"]:
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            for line in f:
+                number += 1
+                if line.strip():
+                    yield number, line
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+def chunked(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+def score_serial(lines):
+    for number, line in lines:
+        yield score_line(number, line)
+
+def score_parallel(lines, workers, chunk_size):
+    """ Rows in input order; at most 2 chunks per worker are queued or in flight """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for chunk in chunked(lines, chunk_size):
+            pending.append(pool.submit(score_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def write_jsonl(rows, out):
+    for row in rows:
+        out.write(json.dumps(row, separators=(",", ":")) + "\n")
+        yield row
+
+def write_csv(rows, out):
+    writer = csv.DictWriter(out, FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield row
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score JSONL hands with the game's scorer")
+    parser.add_argument("inputs", nargs="*", help="JSONL files (default: stdin, or -)")
+    parser.add_argument("-o", "--output", help="Write here instead of stdout")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--workers", type=int, default=0, help="Process pool size (0 = score in this process)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Lines per pool task")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    start = time.perf_counter()
+    count = errors = 0
+    try:
+        lines = read_lines(args.inputs)
+        if args.workers > 0:
+            rows = score_parallel(lines, args.workers, max(1, args.chunk))
+        else:
+            rows = score_serial(lines)
+        write = write_csv if args.format == "csv" else write_jsonl
+        for row in write(rows, out):
+            count += 1
+            if "error" in row:
+                errors += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        else:
+            out.flush()
+    elapsed = time.perf_counter() - start
+    print(f"{count:,} hands in {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f} hands/s), {errors} errors",
+          file=sys.stderr)
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
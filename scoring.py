@@ -1,5 +1,70 @@
-import random
 from collections import Counter
+from functools import lru_cache
+
+# --- Hand Evaluation ---
+# One pass turns the cards into rank/suit count tables plus a rank bitmask; everything
+# after that is O(13) no matter how many cards (or copies of a card) are in the hand.
+# Hands bigger than 5 score as the best 5-card hand they contain.
+
+ACE_LOW_BIT = 1 << 1        # Aces are also set at bit 1 so A-2-3-4-5 is a plain run
+
+def hand_stats(hand_list):
+    """ Returns (rank_counts, suit_counts, modifier_counts, rank_mask) """
+    rank_counts = {}
+    suit_counts = {}
+    modifier_counts = {}
+    mask = 0
+    for c in hand_list:
+        v = c.value
+        rank_counts[v] = rank_counts.get(v, 0) + 1
+        suit_counts[c.suit] = suit_counts.get(c.suit, 0) + 1
+        if c.modifier:
+            modifier_counts[c.modifier] = modifier_counts.get(c.modifier, 0) + 1
+        mask |= 1 << v
+    if mask & (1 << 14):
+        mask |= ACE_LOW_BIT
+    return rank_counts, suit_counts, modifier_counts, mask
+
+def has_run(mask, length):
+    """ True if the rank bitmask has `length` consecutive ranks """
+    run = mask
+    for shift in range(1, length):
+        run &= mask >> shift
+    return run != 0
+
+def classify(rank_counts, suit_counts, mask, hand_list):
+    """ Best hand type from hand_stats() output """
+    pairs = trips = quads = 0
+    for n in rank_counts.values():
+        if n >= 2:
+            pairs += 1
+            if n >= 3:
+                trips += 1
+                if n >= 4:
+                    quads += 1
+
+    flush_suits = [s for s, n in suit_counts.items() if n >= 5]
+    is_straight = has_run(mask, 5)
+
+    if is_straight and flush_suits:
+        # Only a straight *within* one suit counts; rare, so the extra pass is fine
+        for suit in flush_suits:
+            suit_mask = 0
+            for c in hand_list:
+                if c.suit == suit:
+                    suit_mask |= 1 << c.value
+            if suit_mask & (1 << 14):
+                suit_mask |= ACE_LOW_BIT
+            if has_run(suit_mask, 5):
+                return "Straight Flush"
+    if quads: return "4 of a Kind"
+    if trips and pairs >= 2: return "Full House"
+    if flush_suits: return "Flush"
+    if is_straight: return "Straight"
+    if trips: return "3 of a Kind"
+    if pairs >= 2: return "Two Pair"
+    if pairs: return "Pair"
+    return "High Card"
 
 def get_hand_type(hand_list):
     """
@@ -8,207 +73,174 @@ def get_hand_type(hand_list):
     """
     if not hand_list:
         return "Empty"
+    rank_counts, suit_counts, _, mask = hand_stats(hand_list)
+    return classify(rank_counts, suit_counts, mask, hand_list)
+
+# --- Compiled Scorers ---
+# The loadout only changes on buy/sell, so instead of testing every joker key on
+# every hand, compile_scorer() builds one function per loadout containing just the
+# effects it owns. Hand-type effects are folded into a per-hand-type lookup table.
+
+# Hand type -> (chips, +mult, label)
+HAND_BASE = {
+    "Straight Flush": (100, 8, "StrFlush"),
+    "4 of a Kind": (60, 7, "4-Kind"),
+    "Full House": (40, 4, "FullHouse"),
+    "Flush": (35, 4, "Flush"),
+    "Straight": (30, 4, "Straight"),
+    "3 of a Kind": (30, 3, "3-Kind"),
+    "Two Pair": (20, 2, "TwoPair"),
+    "Pair": (10, 2, "Pair"),
+    "High Card": (5, 1, None),
+}
+
+# Jokers that only depend on the hand type: key -> (hand types, +mult, xmult, label)
+HAND_TYPE_JOKERS = {
+    "pear_up": (("Pair", "Two Pair", "Full House", "3 of a Kind", "4 of a Kind"), 8, 1, "Pear(+8)"),
+    "triple_treat": (("3 of a Kind", "Full House", "4 of a Kind"), 12, 1, "TripTrt(+12)"),
+    "double_trouble": (("Two Pair", "Full House"), 0, 2, "DblTrbl(x2)"),
+}
+
+# Card modifier -> (chips, +mult, label)
+MODIFIER_EFFECTS = {
+    "bonus_chips": (10, 0, "Bonus(+10)"),
+    "mult_plus": (0, 4, "Mult(+4)"),
+}
+
+# Source for every other joker. `n` is how many copies are owned; each copy applies
+# (and is listed in the breakdown) separately, same as having n jokers in a row.
+JOKER_CODE = {
+    "rainbow_trout": """
+    if len(suit_counts) == 4:
+        x_mult *= 2 ** {n}
+        breakdown += ["Trout(x2)"] * {n}""",
+    "national_reserve": """
+    if cards_in_deck > 0:
+        bonus = cards_in_deck * 10
+        bonus_points += bonus * {n}
+        breakdown += [f"Reserve(+{{bonus}})"] * {n}""",
+    "multi_python": """
+    if has_run(mask, 3):
+        x_mult *= 2 ** {n}
+        breakdown += ["Python(x2)"] * {n}""",
+    "inflation": """
+    if len(hand_list) <= 4:
+        add_mult += 12 * {n}
+        breakdown += ["Inflation(+12)"] * {n}""",
+    "petty_cash": """
+    if current_coins > 0:
+        bonus = current_coins * 3
+        bonus_points += bonus * {n}
+        breakdown += [f"Petty(+{{bonus}})"] * {n}""",
+    "capital_gains": """
+    mult_factor = current_coins // 10
+    if mult_factor > 1:
+        x_mult *= mult_factor ** {n}
+        breakdown += [f"Gains(x{{mult_factor}})"] * {n}""",
+    "diamond_geezer": """
+    count = suit_counts.get("Diamonds", 0)
+    if count > 0:
+        add_mult += count * 4 * {n}
+        breakdown += [f"Geezer(+{{count * 4}})"] * {n}""",
+    "club_sandwich": """
+    count = suit_counts.get("Clubs", 0)
+    if count > 0:
+        bonus_points += count * 20 * {n}
+        breakdown += [f"Club(+{{count * 20}})"] * {n}""",
+    "face_value": """
+    count = rank_counts.get(11, 0) + rank_counts.get(12, 0) + rank_counts.get(13, 0)
+    if count > 0:
+        add_mult += count * 4 * {n}
+        breakdown += [f"FaceVal(+{{count * 4}})"] * {n}""",
+    "odd_todd": """
+    count = rank_counts.get(14, 0) + rank_counts.get(3, 0) + rank_counts.get(5, 0) + rank_counts.get(7, 0) + rank_counts.get(9, 0)
+    if count > 0:
+        bonus_points += count * 30 * {n}
+        breakdown += [f"OddTodd(+{{count * 30}})"] * {n}""",
+    "wishing_well": """
+    count = rank_counts.get(14, 0) + rank_counts.get(2, 0) + rank_counts.get(3, 0)
+    if count > 0:
+        coin_bonus += count * {n}
+        breakdown += [f"Wish(+${{count}})"] * {n}""",
+    "waste_management": """
+    wm_bonus = run_discards // 3
+    if wm_bonus > 0:
+        add_mult += wm_bonus * {n}
+        breakdown += [f"Waste(+{{wm_bonus}})"] * {n}""",
+    "the_regular": """
+    add_mult += 4 * {n}
+    breakdown += ["Regular(+4)"] * {n}""",
+    "potato_chip": """
+    bonus_points += 50 * {n}
+    breakdown += ["Potato(+50)"] * {n}""",
+}
+
+# Jokers whose bonus depends on the size of the draw pile; scores from any other
+# loadout can be reused across draws (see odds.OddsTracker)
+DECK_SIZE_JOKERS = frozenset(key for key, code in JOKER_CODE.items() if "cards_in_deck" in code)
+
+def build_hand_table(counts):
+    """ Hand type -> (chips, total +mult, xmult, labels) with hand-type jokers folded in """
+    table = {}
+    for hand_type, (chips, mult, label) in HAND_BASE.items():
+        add_mult = 1 + mult
+        x_mult = 1
+        labels = [label] if label else []
+        for key, (types, j_mult, j_x, j_label) in HAND_TYPE_JOKERS.items():
+            n = counts.get(key, 0)
+            if n and hand_type in types:
+                add_mult += j_mult * n
+                x_mult *= j_x ** n
+                labels += [j_label] * n
+        table[hand_type] = (chips, add_mult, x_mult, tuple(labels))
+    return table
+
+# Big enough that bot runs cycling through many loadouts don't recompile
+@lru_cache(maxsize=1024)
+def compile_scorer(loadout):
+    """ loadout: sorted tuple of joker keys (see loadout_key).
+    Returns score(hand_list, run_discards, cards_in_deck, current_coins) -> (base, mult, breakdown, coin_bonus).
+    Breakdown order is canonical: hand type, hand-type jokers, card modifiers by kind, then other jokers by key. """
+    counts = Counter(loadout)
+    lines = [
+        "def score(hand_list, run_discards, cards_in_deck, current_coins):",
+        "    if not hand_list:",
+        "        return 0, 1, [], 0",
+        "    rank_counts, suit_counts, modifier_counts, mask = hand_stats(hand_list)",
+        "    chips, add_mult, x_mult, labels = HAND_TABLE[classify(rank_counts, suit_counts, mask, hand_list)]",
+        "    base_sum = chips",
+        "    for v, n in rank_counts.items():",
+        "        base_sum += v * n",
+        "    bonus_points = 0",
+        "    coin_bonus = 0",
+        "    breakdown = list(labels)",
+        "    for modifier, n in modifier_counts.items():",
+        "        effect = MODIFIER_EFFECTS.get(modifier)",
+        "        if effect:",
+        "            bonus_points += effect[0] * n",
+        "            add_mult += effect[1] * n",
+        "            breakdown += [effect[2]] * n",
+    ]
+    for key in sorted(counts):
+        if key in JOKER_CODE:
+            lines.append(JOKER_CODE[key].format(n=counts[key]).strip("\n"))
+    lines.append("    return base_sum + bonus_points, add_mult * x_mult, breakdown, coin_bonus")
+    source = "\n".join(lines)
+
+    namespace = {
+        "HAND_TABLE": build_hand_table(counts),
+        "MODIFIER_EFFECTS": MODIFIER_EFFECTS,
+        "hand_stats": hand_stats,
+        "classify": classify,
+        "has_run": has_run,
+    }
+    exec(compile(source, f"<scorer {','.join(loadout) or 'no jokers'}>", "exec"), namespace)
+    score = namespace["score"]
+    score.source = source
+    return score
+
+def loadout_key(joker_list):
+    return tuple(sorted(j.key for j in joker_list))
 
-    # Basic Data
-    ranks = [c.value for c in hand_list]
-    suits = [c.suit for c in hand_list]
-    
-    # Counts (e.g., [3, 2] for Full House, [2, 2, 1] for Two Pair)
-    rank_counts = Counter(ranks).values()
-    sorted_counts = sorted(rank_counts, reverse=True)
-    
-    # Flush Check (5 cards minimum)
-    is_flush = False
-    if len(suits) >= 5:
-        suit_counts = Counter(suits).values()
-        if 5 in suit_counts:
-            is_flush = True
-
-    # Straight Check (5 cards minimum)
-    is_straight = False
-    if len(ranks) >= 5:
-        unique_ranks = sorted(list(set(ranks)))
-        # Check for 5 consecutive numbers
-        if len(unique_ranks) >= 5:
-            for i in range(len(unique_ranks) - 4):
-                window = unique_ranks[i:i+5]
-                if window[-1] - window[0] == 4:
-                    is_straight = True
-                    break
-            # Ace Low Check (14, 2, 3, 4, 5) -> {2,3,4,5,14}
-            if {14, 2, 3, 4, 5}.issubset(set(unique_ranks)):
-                is_straight = True
-
-    # --- DETERMINE HAND TYPE ---
-    if is_straight and is_flush: return "Straight Flush"
-    if 4 in sorted_counts: return "4 of a Kind"
-    if sorted_counts == [3, 2]: return "Full House"
-    if is_flush: return "Flush"
-    if is_straight: return "Straight"
-    if 3 in sorted_counts: return "3 of a Kind"
-    if sorted_counts[:2] == [2, 2]: return "Two Pair"
-    if 2 in sorted_counts: return "Pair"
-    
-    return "High Card"
-
-# --- UPDATED: Added current_coins to arguments ---
 def calculate_hand_score(hand_list, joker_list, run_discards, cards_in_deck, current_coins):
-    if not hand_list: 
-        return 0, 1, [], 0
-
-    base_sum = sum(c.value for c in hand_list)
-    additive_mult = 1
-    final_multiplier = 1
-    coin_bonus = 0 
-    bonus_points = 0
-    breakdown = []
-
-    # 1. Identify Hand Type
-    hand_type = get_hand_type(hand_list)
-    
-    # 2. Apply Base Scoring for Hand Type
-    if hand_type == "Straight Flush":
-        base_sum += 100; additive_mult += 8; breakdown.append("StrFlush")
-    elif hand_type == "4 of a Kind":
-        base_sum += 60; additive_mult += 7; breakdown.append("4-Kind")
-    elif hand_type == "Full House":
-        base_sum += 40; additive_mult += 4; breakdown.append("FullHouse")
-    elif hand_type == "Flush":
-        base_sum += 35; additive_mult += 4; breakdown.append("Flush")
-    elif hand_type == "Straight":
-        base_sum += 30; additive_mult += 4; breakdown.append("Straight")
-    elif hand_type == "3 of a Kind":
-        base_sum += 30; additive_mult += 3; breakdown.append("3-Kind")
-    elif hand_type == "Two Pair":
-        base_sum += 20; additive_mult += 2; breakdown.append("TwoPair")
-    elif hand_type == "Pair":
-        base_sum += 10; additive_mult += 2; breakdown.append("Pair")
-    else:
-        base_sum += 5; additive_mult += 1
-
-    # 3. Card Modifiers
-    for card in hand_list:
-        if card.modifier == "bonus_chips":
-            bonus_points += 10
-            breakdown.append("Bonus(+10)")
-        elif card.modifier == "mult_plus":
-            additive_mult += 4
-            breakdown.append("Mult(+4)")
-
-    # 4. Joker Effects
-    for joker in joker_list:
-        
-        # --- HAND TYPE TRIGGERS ---
-        if joker.key == "pear_up" and hand_type in ("Pair", "Two Pair", "Full House" ,"3 of a Kind", "4 of a Kind"):
-            additive_mult += 8
-            breakdown.append("Pear(+8)")
-            
-        if joker.key == "triple_treat" and hand_type in ["3 of a Kind", "Full House", "4 of a Kind"]:
-            additive_mult += 12
-            breakdown.append("TripTrt(+12)")
-            
-        if joker.key == "double_trouble" and hand_type in ("Two Pair", "Full House"):
-            final_multiplier *= 2
-            breakdown.append("DblTrbl(x2)")
-
-        # --- SPECIAL LOGIC ---
-        if joker.key == "rainbow_trout":
-            unique_suits = set(c.suit for c in hand_list)
-            if len(unique_suits) == 4:
-                final_multiplier *= 2
-                breakdown.append("Trout(x2)")
-
-        if joker.key == "national_reserve":
-            if cards_in_deck > 0:
-                bonus = cards_in_deck * 10
-                bonus_points += bonus
-                breakdown.append(f"Reserve(+{bonus})")
-
-        if joker.key == "multi_python":
-            sorted_ranks = sorted(list(set(c.value for c in hand_list)))
-            has_3_straight = False
-            consecutive = 0
-            for i in range(len(sorted_ranks) - 1):
-                if sorted_ranks[i+1] == sorted_ranks[i] + 1:
-                    consecutive += 1
-                    if consecutive >= 2: has_3_straight = True
-                else: consecutive = 0
-            if {14, 2, 3}.issubset(set(sorted_ranks)): has_3_straight = True
-            
-            if has_3_straight:
-                final_multiplier *= 2
-                breakdown.append("Python(x2)")
-
-        # --- CONDITION TRIGGERS ---
-        if joker.key == "inflation" and len(hand_list) <= 4:
-            additive_mult += 12
-            breakdown.append("Inflation(+12)")
-            
-        # NEW: Petty Cash (+$3 Chips per $1)
-        if joker.key == "petty_cash":
-            if current_coins > 0:
-                bonus = current_coins * 3
-                bonus_points += bonus
-                breakdown.append(f"Petty(+{bonus})")
-                
-        # NEW: Capital Gains (x1 mult per $10)
-        if joker.key == "capital_gains":
-            mult_factor = current_coins // 10
-            if mult_factor > 1: # Values of 0 and 1 don't change the multiplier mathematically
-                final_multiplier *= mult_factor
-                breakdown.append(f"Gains(x{mult_factor})")
-
-        # --- CARD PROPERTY TRIGGERS ---
-        if joker.key == "diamond_geezer":
-            count = sum(1 for c in hand_list if c.suit == "Diamonds")
-            if count > 0:
-                bonus = count * 4
-                additive_mult += bonus
-                breakdown.append(f"Geezer(+{bonus})")
-                
-        if joker.key == "club_sandwich":
-            count = sum(1 for c in hand_list if c.suit == "Clubs")
-            if count > 0:
-                bonus = count * 20
-                bonus_points += bonus
-                breakdown.append(f"Club(+{bonus})")
-                
-        if joker.key == "face_value":
-            count = sum(1 for c in hand_list if c.value in [11, 12, 13])
-            if count > 0:
-                bonus = count * 4
-                additive_mult += bonus
-                breakdown.append(f"FaceVal(+{bonus})")
-        
-        if joker.key == "odd_todd":
-            count = sum(1 for c in hand_list if c.value in [14, 3, 5, 7, 9])
-            if count > 0:
-                bonus = count * 30
-                bonus_points += bonus
-                breakdown.append(f"OddTodd(+{bonus})")
-                
-        if joker.key == "wishing_well":
-            count = sum(1 for c in hand_list if c.value in [14, 2, 3])
-            if count > 0:
-                coin_bonus += count
-                breakdown.append(f"Wish(+${count})")
-
-        # --- STATE TRIGGERS ---
-        if joker.key == "waste_management":
-            wm_bonus = run_discards // 3
-            if wm_bonus > 0:
-                additive_mult += wm_bonus
-                breakdown.append(f"Waste(+{wm_bonus})")
-                
-        if joker.key == "the_regular":
-            additive_mult += 4
-            breakdown.append("Regular(+4)")
-            
-        if joker.key == "potato_chip":
-            bonus_points += 50
-            breakdown.append("Potato(+50)")
-
-    total_mult = additive_mult * final_multiplier
-    total_base = base_sum + bonus_points
-    
-    return total_base, total_mult, breakdown, coin_bonus
\ No newline at end of file
+    return compile_scorer(loadout_key(joker_list))(hand_list, run_discards, cards_in_deck, current_coins)
@@ -0,0 +1,219 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+import collections
+
+import engine
+
+# --- Headless Game Server ---
+# Many independent runs in one process, over TCP or a Unix socket. One JSON object
+# per line each way:
+#   -> {"id": 1, "op": "new", "seed": 42}
+#   <- {"id": 1, "ok": true, "sid": 1, "view": {...}}
+#   -> {"id": 2, "op": "take", "sid": 1, "discard": [0, 3]}
+#   <- {"id": 2, "ok": false, "error": "no discards left"}
+# Sessions aren't tied to a connection; one client can drive thousands of them.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+IDLE_TIMEOUT = 300.0        # Seconds without a request before a session is dropped
+SWEEP_INTERVAL = 10.0
+WRITE_HIGH_WATER = 1 << 16
+MAX_COINS = 1 << 62         # Starting coins; leaves headroom under snapshot.SCALARS' i64
+
+class Session:
+    __slots__ = ("sid", "run", "last_seen")
+
+    def __init__(self, sid, run, now):
+        self.sid = sid
+        self.run = run
+        self.last_seen = now
+
+class SessionStore:
+    """ Sessions in least-recently-used order, so eviction only looks at the ones it drops """
+    def __init__(self, idle_timeout=IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.sessions = collections.OrderedDict()
+        self.next_sid = 1
+        self.evicted = 0
+
+    def create(self, run):
+        sid = self.next_sid
+        self.next_sid += 1
+        self.sessions[sid] = Session(sid, run, time.monotonic())
+        return sid
+
+    def get(self, sid):
+        session = self.sessions.get(sid)
+        if session is None:
+            raise engine.ActionError(f"unknown session {sid}")
+        session.last_seen = time.monotonic()
+        self.sessions.move_to_end(sid)
+        return session
+
+    def close(self, sid):
+        self.sessions.pop(sid, None)
+
+    def evict_idle(self, now=None):
+        cutoff = (now or time.monotonic()) - self.idle_timeout
+        while self.sessions:
+            sid, session = next(iter(self.sessions.items()))
+            if session.last_seen > cutoff:
+                break
+            del self.sessions[sid]
+            self.evicted += 1
+
+# --- Request Fields ---
+# Numbers arrive as arbitrary JSON: 1e999 parses to inf and int() of it raises
+# OverflowError, so indices and amounts must already be JSON integers
+
+def _int(req, field, default=None, low=None, high=None):
+    value = req.get(field, default) if default is not None else req[field]
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise engine.ActionError(f"{field} must be an integer")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise engine.ActionError(f"{field} must be between {low} and {high}")
+    return value
+
+def _coins(req):
+    return _int(req, "coins", engine.STARTING_COINS, 0, MAX_COINS)
+
+def _indices(req, field):
+    values = req.get(field, ())
+    if not isinstance(values, (list, tuple)) or any(isinstance(v, bool) or not isinstance(v, int) for v in values):
+        raise engine.ActionError(f"{field} must be a list of integers")
+    return values
+
+# --- Actions ---
+# Same buttons as WarGame; each takes (run, request) and may return extra reply fields
+
+def _take(run, req):
+    run.take(_indices(req, "discard"))
+
+def _play(run, req):
+    return {"scored": run.play()}
+
+def _buy(run, req):
+    run.buy(_int(req, "slot"))
+
+def _sell(run, req):
+    run.sell(_int(req, "joker"))
+
+def _pick(run, req):
+    run.apply_modifier(_int(req, "mod"), _indices(req, "cards"))
+
+def _skip(run, req):
+    run.skip_pack()
+
+def _next(run, req):
+    run.next_level()
+
+def _restart(run, req):
+    run.new_run(_coins(req))
+
+def _state(run, req):
+    pass
+
+ACTIONS = {
+    "take": _take, "play": _play, "buy": _buy, "sell": _sell, "pick": _pick,
+    "skip": _skip, "next": _next, "restart": _restart, "state": _state,
+}
+
+class GameServer:
+    def __init__(self, idle_timeout=IDLE_TIMEOUT):
+        self.store = SessionStore(idle_timeout)
+        self.requests = 0
+
+    def handle(self, req):
+        """ One request dict -> one reply dict. Never raises for bad input. """
+        reply = {"id": req.get("id")} if isinstance(req, dict) else {"id": None}
+        try:
+            op = req["op"]
+            if op == "new":
+                run = engine.RunState(req.get("seed"), _coins(req))
+                reply["sid"] = self.store.create(run)
+            elif op == "close":
+                self.store.close(req["sid"])
+                reply["ok"] = True
+                return reply
+            else:
+                action = ACTIONS.get(op)
+                if action is None:
+                    raise engine.ActionError(f"unknown op {op!r}")
+                run = self.store.get(req["sid"]).run
+                extra = action(run, req)
+                if extra:
+                    reply.update(extra)
+            reply["ok"] = True
+            if req.get("view", True):
+                reply["view"] = run.to_dict()
+        except (engine.ActionError, KeyError, TypeError, ValueError, OverflowError) as e:
+            reply["ok"] = False
+            reply["error"] = str(e) if isinstance(e, engine.ActionError) else f"bad request: {e!r}"
+        return reply
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Over the StreamReader limit; the rest of that line can't be told
+                    # apart from the next request, so say why and hang up
+                    writer.write(b'{"id":null,"ok":false,"error":"request line too long"}\n')
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                self.requests += 1
+                try:
+                    req = json.loads(line)
+                except (ValueError, RecursionError):     # RecursionError: absurdly nested JSON
+                    req = None
+                reply = self.handle(req) if req is not None else {"id": None, "ok": False, "error": "bad json"}
+                writer.write(json.dumps(reply, separators=(",", ":")).encode("utf-8") + b"\n")
+                # write() already sends when the socket is free; only wait when the client lags
+                if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def sweep_forever(self, interval=SWEEP_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            self.store.evict_idle()
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None, idle_timeout=IDLE_TIMEOUT):
+    game_server = GameServer(idle_timeout)
+    if unix_path:
+        server = await asyncio.start_unix_server(game_server.handle_client, path=unix_path)
+        where = unix_path
+    else:
+        server = await asyncio.start_server(game_server.handle_client, host, port)
+        where = f"{host}:{port}"
+    print(f"Warlatro server listening on {where}", flush=True)
+    sweeper = asyncio.ensure_future(game_server.sweep_forever(min(SWEEP_INTERVAL, idle_timeout)))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless multi-session Warlatro server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.idle_timeout))
+    except KeyboardInterrupt:
+        print("Server stopped", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
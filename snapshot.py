@@ -0,0 +1,141 @@
+import struct
+
+import config
+
+# --- Compact Run Snapshot ---
+# Everything needed to resume a run, as plain data. Cards are one byte each:
+#   [suit:2][rank:4][modifier:2]
+# and piles/hand are u16 indices into the master deck, so card identity survives.
+MAGIC = b"WLRS"
+VERSION = 2
+
+SUITS = config.SUITS
+RANKS = config.RANKS
+MODIFIERS = [None, "bonus_chips", "mult_plus", "destroy"]
+NO_CARD = 0xFFFF
+
+HEADER = struct.Struct("<4sB")
+SCALARS = struct.Struct("<BHQQBBBIq")   # state, level, target, score, hands played/max, discards left, run discards, coins
+SCALARS_V1 = struct.Struct("<BHIIBBBIi")    # u32 target/score; overflowed around level 42
+RNG_STATE = struct.Struct("<B625I")     # Mersenne Twister version + key (incl. position)
+HISTORY_RUN = struct.Struct("<q")       # history.HandHistory run id, 0 for none; absent in older files
+
+def encode_card(suit, rank, modifier):
+    return (SUITS.index(suit) << 6) | (RANKS.index(rank) << 2) | MODIFIERS.index(modifier)
+
+def decode_card(byte):
+    return SUITS[byte >> 6], RANKS[(byte >> 2) & 0xF], MODIFIERS[byte & 0x3]
+
+class RunSnapshot:
+    """ Decoded snapshot. Holds no sprites, so it's also usable to warm-start
+    simulations from a real player position. """
+    __slots__ = ("state", "round_level", "target_score", "score_total", "hands_played", "hands_max",
+                 "discards_left", "run_discards", "coins", "master_deck", "draw_pile", "discard_pile",
+                 "hand", "drawn_card", "jokers", "shop", "rng_state", "history_run")
+
+    def __init__(self):
+        self.state = 0
+        self.round_level = 1
+        self.target_score = 0
+        self.score_total = 0
+        self.hands_played = 0
+        self.hands_max = 0
+        self.discards_left = 0
+        self.run_discards = 0
+        self.coins = 0
+        self.master_deck = []       # [(suit, rank, modifier)]
+        self.draw_pile = []         # indices into master_deck, bottom -> top
+        self.discard_pile = []
+        self.hand = []
+        self.drawn_card = None
+        self.jokers = []            # keys, in slot order
+        self.shop = []              # "Pack" or a joker key, per offered slot
+        self.rng_state = None       # random.getstate()
+        self.history_run = None     # Run id in the hand history, so a resumed run stays one row
+
+    # --- Encoding ---
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION))
+        out += SCALARS.pack(self.state, self.round_level, self.target_score, self.score_total,
+                            self.hands_played, self.hands_max, self.discards_left,
+                            self.run_discards, self.coins)
+
+        out += struct.pack("<H", len(self.master_deck))
+        out += bytes(encode_card(*c) for c in self.master_deck)
+        for pile in (self.draw_pile, self.discard_pile, self.hand):
+            out += struct.pack(f"<H{len(pile)}H", len(pile), *pile)
+        out += struct.pack("<H", NO_CARD if self.drawn_card is None else self.drawn_card)
+
+        for keys in (self.jokers, self.shop):
+            out += struct.pack("<B", len(keys))
+            for key in keys:
+                raw = key.encode("ascii")
+                out += struct.pack("<B", len(raw)) + raw
+
+        version, key, gauss = self.rng_state
+        out += RNG_STATE.pack(version, *key)
+        out += struct.pack("<?d", gauss is not None, gauss or 0.0)
+        out += HISTORY_RUN.pack(self.history_run or 0)
+        return bytes(out)
+
+    def to_bytes_or_clear(self):
+        """ For the autosave writer: a snapshot that can't be encoded clears the file
+        (returns None) instead of leaving an older position behind to be resumed """
+        try:
+            return self.to_bytes()
+        except (struct.error, ValueError, UnicodeError) as e:
+            print(f"Warning: Autosave failed; this run can't be resumed. {e}")
+            return None
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"Unsupported run snapshot (magic={magic!r}, version={version})")
+        pos = HEADER.size
+
+        snap = cls()
+        scalars = SCALARS if version == VERSION else SCALARS_V1
+        (snap.state, snap.round_level, snap.target_score, snap.score_total, snap.hands_played,
+         snap.hands_max, snap.discards_left, snap.run_discards, snap.coins) = scalars.unpack_from(data, pos)
+        pos += scalars.size
+
+        (count,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        snap.master_deck = [decode_card(b) for b in data[pos:pos + count]]
+        pos += count
+
+        piles = []
+        for _ in range(3):
+            (count,) = struct.unpack_from("<H", data, pos)
+            pos += 2
+            piles.append(list(struct.unpack_from(f"<{count}H", data, pos)))
+            pos += 2 * count
+        snap.draw_pile, snap.discard_pile, snap.hand = piles
+
+        (drawn,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        snap.drawn_card = None if drawn == NO_CARD else drawn
+
+        key_lists = []
+        for _ in range(2):
+            (count,) = struct.unpack_from("<B", data, pos)
+            pos += 1
+            keys = []
+            for _ in range(count):
+                (length,) = struct.unpack_from("<B", data, pos)
+                pos += 1
+                keys.append(data[pos:pos + length].decode("ascii"))
+                pos += length
+            key_lists.append(keys)
+        snap.jokers, snap.shop = key_lists
+
+        rng = RNG_STATE.unpack_from(data, pos)
+        pos += RNG_STATE.size
+        has_gauss, gauss = struct.unpack_from("<?d", data, pos)
+        pos += struct.calcsize("<?d")
+        snap.rng_state = (rng[0], tuple(rng[1:]), gauss if has_gauss else None)
+        if len(data) >= pos + HISTORY_RUN.size:
+            (snap.history_run,) = HISTORY_RUN.unpack_from(data, pos)
+            snap.history_run = snap.history_run or None
+        return snap
@@ -0,0 +1,162 @@
+import json
+import asyncio
+import threading
+import collections
+
+import config
+import engine
+
+# --- Spectator Stream ---
+# The game hands a plain view dict to publish() a few times a second; a background
+# thread diffs it against the previous one and streams only what changed to every
+# connected viewer, one JSON object per line:
+#   {"t": 1, "k": 1, "s": {...every field...}}     keyframe (on connect / after a drop)
+#   {"t": 2, "d": {"coins": 12, "hand": [...]}}    delta; null means the field went away
+# Every queue is bounded and drops its oldest entry when full. A viewer that falls
+# behind loses its backlog and is resynced with a keyframe; it can never hold up the
+# game loop or the other viewers.
+
+def card_code(card):
+    """ Same short form as the headless engine, e.g. "10H" or "AS+m" """
+    return f"{card.rank}{card.suit[0]}{engine.MODIFIER_CODES[card.modifier]}"
+
+_MISSING = object()
+
+def diff(old, new):
+    """ Fields of `new` that differ from `old`, plus None for fields that were removed """
+    delta = {k: v for k, v in new.items() if old.get(k, _MISSING) != v}
+    for k in old:
+        if k not in new:
+            delta[k] = None
+    return delta
+
+def encode(frame):
+    return json.dumps(frame, separators=(",", ":")).encode("utf-8") + b"\n"
+
+class Subscriber:
+    def __init__(self, writer, maxlen):
+        self.writer = writer
+        self.frames = collections.deque(maxlen=maxlen)
+        self.resync = True          # First thing a viewer gets is a keyframe
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        self.ready.set()
+
+    def push(self, frame):
+        if len(self.frames) == self.frames.maxlen:
+            # Oldest delta is about to fall off, so the ones after it can't be applied
+            self.dropped += 1
+            self.resync = True
+        self.frames.append(frame)
+        self.ready.set()
+
+class SpectatorPublisher:
+    def __init__(self, host=config.SPECTATE_HOST, port=config.SPECTATE_PORT, queue_size=config.SPECTATE_QUEUE):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.inbox = collections.deque(maxlen=queue_size)   # Game thread -> publisher thread
+        self.wake_pending = False
+        self.subscribers = set()
+        self.state = {}             # Last published view (publisher thread only)
+        self.tick = 0
+        self.loop = None
+        self.wake = None
+        self.thread = threading.Thread(target=self._run, name="spectator", daemon=True)
+        self.thread.start()
+
+    # --- Game Thread ---
+    def publish(self, view):
+        """ Queues a view dict; never blocks. Only the latest few are kept if the thread lags. """
+        self.inbox.append(view)
+        loop = self.loop
+        if loop is not None and not self.wake_pending:
+            self.wake_pending = True
+            try:
+                loop.call_soon_threadsafe(self.wake.set)
+            except RuntimeError:
+                pass        # Loop already closed
+
+    def close(self):
+        loop = self.loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(loop.stop)
+            except RuntimeError:
+                pass
+
+    # --- Publisher Thread ---
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self.wake = asyncio.Event()
+            server = loop.run_until_complete(asyncio.start_server(self._on_connect, self.host, self.port))
+            self.loop = loop
+            print(f"Spectator stream on {self.host}:{self.port}")
+            loop.create_task(self._pump())
+            loop.run_forever()
+            server.close()
+        except Exception as e:
+            print(f"Warning: Spectator stream stopped. {e}")
+        finally:
+            self.loop = None
+            loop.close()
+
+    async def _pump(self):
+        while True:
+            await self.wake.wait()
+            self.wake.clear()
+            self.wake_pending = False
+            while self.inbox:
+                view = self.inbox.popleft()
+                delta = diff(self.state, view)
+                if not delta:
+                    continue
+                self.state = view
+                self.tick += 1
+                frame = encode({"t": self.tick, "d": delta})
+                for sub in self.subscribers:
+                    sub.push(frame)
+
+    async def _on_connect(self, reader, writer):
+        sub = Subscriber(writer, self.queue_size)
+        self.subscribers.add(sub)
+        try:
+            while True:
+                await sub.ready.wait()
+                sub.ready.clear()
+                if sub.resync:
+                    sub.resync = False
+                    sub.frames.clear()
+                    writer.write(encode({"t": self.tick, "k": 1, "s": self.state}))
+                while sub.frames:
+                    writer.write(sub.frames.popleft())
+                # A slow viewer only ever waits here, in its own task
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.subscribers.discard(sub)
+            writer.close()
+
+def capture_view(game):
+    """ What a spectator sees, as plain data (game thread) """
+    view = {
+        "state": game.state.name.lower(),
+        "level": game.round_level,
+        "score": game.score_total,
+        "target": game.target_score,
+        "hands": game.hands_max - game.hands_played,
+        "discards": game.discards_left,
+        "coins": game.coins,
+        "message": game.message,
+        "hand": [card_code(c) for c in game.hand_list],
+        "drawn": card_code(game.drawn_card) if game.drawn_card else None,
+        "jokers": [j.key for j in game.joker_list],
+    }
+    if game.hand_details:
+        view["details"] = list(game.hand_details)
+    if game.state.name == "SHOPPING":
+        view["shop"] = game.shop_offer_keys()
+    return view
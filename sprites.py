@@ -2,11 +2,68 @@ import arcade
 import random
 import math
 import config
+import tweens
+
+def spring_step(sprite, delta_time):
+    """ Advances the target spring by delta_time, framerate independent.
+    At exactly one reference step (1/60s) this matches the original per-frame tuning. """
+    steps = delta_time * config.PHYSICS_REFERENCE_RATE
+    damping = config.DAMPING ** steps
+    dx = sprite.target_x - sprite._phys_x
+    dy = sprite.target_y - sprite._phys_y
+    sprite.vel_x = (sprite.vel_x + dx * config.STIFFNESS * steps) * damping
+    sprite.vel_y = (sprite.vel_y + dy * config.STIFFNESS * steps) * damping
+    sprite._phys_x += sprite.vel_x * steps
+    sprite._phys_y += sprite.vel_y * steps
+    # Park it exactly on target once settled, so its transform stops changing
+    if (abs(sprite.vel_x) + abs(sprite.vel_y) < config.REST_EPSILON and
+            abs(sprite.target_x - sprite._phys_x) + abs(sprite.target_y - sprite._phys_y) < config.REST_EPSILON):
+        sprite.vel_x = sprite.vel_y = 0
+        sprite._phys_x = sprite.target_x
+        sprite._phys_y = sprite.target_y
+
+# Set at startup when a packed asset bundle is available
+asset_bundle = None
+# The game's tweens.Timeline, set at startup; without one, fly-offs and fades finish instantly
+timeline = None
+# True once the sprite lists draw with the idle shader (see load_idle_programs); the
+# bob / sway is then left to the GPU and sync_transform only writes real moves
+gpu_idle = False
+
+def card_image_file(suit, rank):
+    return f":resources:images/cards/card{suit}{rank}.png"
+
+def load_idle_programs(ctx):
+    """ (card program, joker program) for SpriteList.data.program, or None to animate on the CPU """
+    try:
+        geometry = ctx.shader_inc(arcade.resources.resolve(":system:shaders/sprites/sprite_list_geometry_cull_geo.glsl").read_text())
+        fragment = arcade.resources.resolve(":system:shaders/sprites/sprite_list_geometry_fs.glsl").read_text()
+        programs = []
+        for rot_range in (0.0, config.JOKER_ROT_RANGE):
+            program = ctx.program(vertex_shader=config.IDLE_VERTEX_SHADER, geometry_shader=geometry,
+                                  fragment_shader=fragment)
+            program["sprite_texture"] = 0
+            program["uv_texture"] = 1
+            program["float_speed"] = config.FLOAT_SPEED
+            program["float_range"] = config.FLOAT_RANGE
+            program["rot_speed"] = config.JOKER_ROT_SPEED
+            program["rot_range"] = rot_range
+            programs.append(program)
+    except Exception as e:
+        print(f"Warning: Idle animation shader unavailable, animating on the CPU. {e}")
+        return None
+    return tuple(programs)
 
 class Joker(arcade.Sprite):
     def __init__(self, key, scale=1.0):
         data = config.JOKER_DATA[key]
-        super().__init__(data['file'], scale)
+        # Bundled art is already downscaled, so the sprite scale is relative to that
+        if asset_bundle and asset_bundle.has_joker(key):
+            self.texture_scale = asset_bundle.atlas_scale
+            super().__init__(asset_bundle.joker_texture(key), scale / self.texture_scale)
+        else:
+            self.texture_scale = 1.0
+            super().__init__(data['file'], scale)
         
         self.key = key
         self.name = data['name']
@@ -24,24 +81,54 @@ class Joker(arcade.Sprite):
         self._phys_y = 0
         self.float_phase = random.uniform(0, 6.28)
         self.rot_phase = random.uniform(0, 6.28)
+        self.depth = self.float_phase   # Read by the idle shader
         self.timer = 0.0
 
+        # Previous simulation step, used to interpolate at draw time
+        self._prev_phys_x = 0
+        self._prev_phys_y = 0
+        self._prev_timer = 0.0
+
+    def snap_to(self, x, y):
+        """ Teleports the sprite without the interpolation smearing it across the screen """
+        self._phys_x = self._prev_phys_x = x
+        self._phys_y = self._prev_phys_y = y
+        self.center_x = x
+        self.center_y = y
+
+    def set_display_scale(self, scale):
+        """ Scale relative to the original joker art, whichever texture is loaded """
+        self.scale = scale / self.texture_scale
+
     def update(self, delta_time: float = 1/60):
+        self._prev_phys_x = self._phys_x
+        self._prev_phys_y = self._phys_y
+        self._prev_timer = self.timer
+
         self.timer += delta_time
-        dx = self.target_x - self._phys_x
-        dy = self.target_y - self._phys_y
-        self.vel_x = (self.vel_x + dx * config.STIFFNESS) * config.DAMPING
-        self.vel_y = (self.vel_y + dy * config.STIFFNESS) * config.DAMPING
-        self._phys_x += self.vel_x
-        self._phys_y += self.vel_y
-        
-        float_offset = math.sin(self.timer * config.FLOAT_SPEED + self.float_phase) * config.FLOAT_RANGE
-        rot_offset = math.sin(self.timer * config.JOKER_ROT_SPEED + self.rot_phase) * config.JOKER_ROT_RANGE
+        spring_step(self, delta_time)
+
+    def sync_transform(self, alpha=1.0):
+        """ Writes the interpolated physics state into the drawn transform """
+        x = self._prev_phys_x + (self._phys_x - self._prev_phys_x) * alpha
+        y = self._prev_phys_y + (self._phys_y - self._prev_phys_y) * alpha
+        if gpu_idle:
+            self.position = (x, y)      # No-op (and no upload) while at rest
+            return
+
+        timer = self._prev_timer + (self.timer - self._prev_timer) * alpha
+        float_offset = math.sin(timer * config.FLOAT_SPEED + self.float_phase) * config.FLOAT_RANGE
+        rot_offset = math.sin(timer * config.JOKER_ROT_SPEED + self.rot_phase) * config.JOKER_ROT_RANGE
         
-        self.center_x = self._phys_x
-        self.center_y = self._phys_y + float_offset
+        self.center_x = x
+        self.center_y = y + float_offset
         self.angle = rot_offset
 
+    def is_at_rest(self):
+        """ True once the spring has settled on its target (ignores the cosmetic bob) """
+        return (abs(self.vel_x) + abs(self.vel_y) < config.REST_EPSILON and
+                abs(self.target_x - self._phys_x) + abs(self.target_y - self._phys_y) < config.REST_EPSILON)
+
 class Pack(arcade.Sprite):
     """ Represents a Booster Pack in the Shop """
     def __init__(self, scale=1.0):
@@ -72,7 +159,7 @@ class Card(arcade.Sprite):
         else:
             self.color_type = 'Black'
 
-        image_file = f":resources:images/cards/card{suit}{rank}.png"
+        image_file = card_image_file(suit, rank)
         super().__init__(image_file, scale)
         self.is_selected = False
         
@@ -88,40 +175,123 @@ class Card(arcade.Sprite):
         self._phys_y = 0
         self.should_despawn = False 
         self.is_spasming = False # NEW: For destroyed cards
+        self.fade_alpha = 255.0
+        self.jitter_x = 0
+        self.jitter_y = 0
         self.float_phase = random.uniform(0, 6.28)
+        self.depth = self.float_phase   # Read by the idle shader; 0 while leaving
         self.timer = 0.0
 
+        self._prev_phys_x = 0
+        self._prev_phys_y = 0
+        self._prev_timer = 0.0
+
+    def snap_to(self, x, y):
+        """ Teleports the sprite without the interpolation smearing it across the screen """
+        if timeline:
+            # Recycled mid fly-off (e.g. restaged for a new round): keep it on screen
+            timeline.cancel((self, "move"))
+            self.should_despawn = False
+        self.depth = self.float_phase
+        self._phys_x = self._prev_phys_x = x
+        self._phys_y = self._prev_phys_y = y
+        self.center_x = x
+        self.center_y = y
+
+    def fly_off(self, y):
+        """ Eases the card off-screen to `y` (carrying on to its target x), then drops it from every sprite list """
+        self.should_despawn = True
+        self.depth = 0.0
+        self.target_y = y
+        self.vel_x = self.vel_y = 0
+        if timeline is None:
+            self._despawn()
+            return
+        x0, y0, x1 = self._phys_x, self._phys_y, self.target_x
+
+        def move(t):
+            self._phys_x = x0 + (x1 - x0) * t
+            self._phys_y = y0 + (y - y0) * t
+        timeline.animate(move, 0.0, 1.0, config.FLY_OFF_TIME, tweens.ease_in_quad,
+                         on_complete=self._despawn, key=(self, "move"))
+
+    def _despawn(self):
+        self.remove_from_sprite_lists()
+        self.should_despawn = False
+
+    def spasm_out(self):
+        """ Destroy effect: jitters while fading to nothing, then drops out of every sprite list """
+        self.is_spasming = True
+        self.depth = 0.0
+        if timeline is None:
+            self._spasm_done()
+            return
+        timeline.animate(self._set_fade, 255.0, 0.0, config.SPASM_FADE_TIME,
+                         on_complete=self._spasm_done, key=(self, "fade"))
+
+    def _set_fade(self, value):
+        self.fade_alpha = value
+        self.alpha = int(value)
+
+    def _spasm_done(self):
+        self.remove_from_sprite_lists()
+        self.is_spasming = False
+        self._set_fade(255.0)
+
+    def recall(self):
+        """ Stops a fly-off or destroy fade part way (practice undo puts the card back in play) """
+        if timeline:
+            timeline.cancel((self, "move"))
+            timeline.cancel((self, "fade"))
+        self.should_despawn = False
+        self.is_spasming = False
+        self.jitter_x = self.jitter_y = 0
+        self.is_selected = False
+        self.depth = self.float_phase
+        self._set_fade(255.0)
+
     def update(self, delta_time: float = 1/60):
+        self._prev_phys_x = self._phys_x
+        self._prev_phys_y = self._phys_y
+        self._prev_timer = self.timer
+
         self.timer += delta_time
         
         if self.is_spasming:
-            self.center_x = self._phys_x + random.uniform(-15, 15)
-            self.center_y = self._phys_y + random.uniform(-15, 15)
-            # Fade out
-            self.alpha = max(0, self.alpha - 6)
-            if self.alpha <= 0:
-                self.remove_from_sprite_lists()
-                self.is_spasming = False
-                self.alpha = 255
+            self.jitter_x = random.uniform(-15, 15)
+            self.jitter_y = random.uniform(-15, 15)
             return 
 
-        dx = self.target_x - self._phys_x
-        dy = self.target_y - self._phys_y
-        self.vel_x = (self.vel_x + dx * config.STIFFNESS) * config.DAMPING
-        self.vel_y = (self.vel_y + dy * config.STIFFNESS) * config.DAMPING
-        self._phys_x += self.vel_x
-        self._phys_y += self.vel_y
+        # Fly-offs are driven by the timeline, not the spring
+        if not self.should_despawn:
+            spring_step(self, delta_time)
 
+    def sync_transform(self, alpha=1.0):
+        """ Writes the interpolated physics state into the drawn transform """
+        if self.is_spasming:
+            self.center_x = self._phys_x + self.jitter_x
+            self.center_y = self._phys_y + self.jitter_y
+            return
+
+        x = self._prev_phys_x + (self._phys_x - self._prev_phys_x) * alpha
+        y = self._prev_phys_y + (self._phys_y - self._prev_phys_y) * alpha
         if self.should_despawn:
-            self.center_x = self._phys_x
-            self.center_y = self._phys_y
-            if (self.center_y < -200 or self.center_y > config.SCREEN_HEIGHT + 400):
-                self.remove_from_sprite_lists()
-                self.should_despawn = False 
+            self.center_x = x
+            self.center_y = y
+        elif gpu_idle:
+            self.position = (x, y)
         else:
-            float_offset = math.sin(self.timer * config.FLOAT_SPEED + self.float_phase) * config.FLOAT_RANGE
-            self.center_x = self._phys_x
-            self.center_y = self._phys_y + float_offset
+            timer = self._prev_timer + (self.timer - self._prev_timer) * alpha
+            float_offset = math.sin(timer * config.FLOAT_SPEED + self.float_phase) * config.FLOAT_RANGE
+            self.center_x = x
+            self.center_y = y + float_offset
+
+    def is_at_rest(self):
+        """ True once the spring has settled on its target (ignores the cosmetic bob) """
+        if self.is_spasming or self.should_despawn:
+            return False
+        return (abs(self.vel_x) + abs(self.vel_y) < config.REST_EPSILON and
+                abs(self.target_x - self._phys_x) + abs(self.target_y - self._phys_y) < config.REST_EPSILON)
 
     def draw_modifier(self):
         if self.modifier:
@@ -1,184 +1,553 @@
 import random
+import time
+import array
+import collections
+import concurrent.futures
 import arcade
+import pyglet
+import pyglet.media.drivers.base
+import pyglet.media.codecs.base
 import config
 import sprites
 import ui_elements
+import tweens
 
-class AudioManager:
-    """ Handles all sound effects and music cross-fading """
-    def __init__(self):
-        # Load sounds safely
+class StartupTimer:
+    """ Records how long each startup stage takes and prints a breakdown """
+    def __init__(self, start_time=None):
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.last_time = self.start_time
+        self.stages = []
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last_time))
+        self.last_time = now
+
+    def total(self):
+        return self.last_time - self.start_time
+
+    def report(self):
+        print("--- Startup Timing ---")
+        for stage, seconds in self.stages:
+            print(f"  {stage:<22} {seconds * 1000:8.1f} ms")
+        print(f"  {'TOTAL':<22} {self.total() * 1000:8.1f} ms")
+
+class AssetLoader:
+    """ Decodes textures and sounds on a small worker pool so the window can open first """
+    def __init__(self, max_workers=4):
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="assets")
+        self.texture_futures = []
+
+    def preload_textures(self, paths):
+        # Sprites pull from arcade's default texture cache, so warming it here
+        # means DeckManager/ShopManager never touch the disk on the main thread
+        cache = arcade.texture.default_texture_cache
+        for path in paths:
+            self.texture_futures.append(self.pool.submit(cache.load_or_get_texture, path))
+
+    def load_sound(self, path, streaming=False):
+        return self.pool.submit(arcade.Sound, path, streaming)
+
+    def progress(self):
+        """ Returns (finished, total) texture jobs """
+        done = sum(1 for f in self.texture_futures if f.done())
+        return done, len(self.texture_futures)
+
+    def is_done(self):
+        done, total = self.progress()
+        return done == total
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+def resample_pcm(data, audio_format, speed):
+    """ Linear-interpolation resample of 16-bit PCM so it plays `speed` times faster
+    (and higher) at the original sample rate. Runs once at load time, not per play. """
+    channels = audio_format.channels
+    samples = array.array('h')
+    samples.frombytes(data[:len(data) - len(data) % (2 * channels)])
+    frames_in = len(samples) // channels
+    frames_out = int(frames_in / speed)
+
+    out = array.array('h', bytes(2 * channels * frames_out))
+    last = frames_in - 1
+    for i in range(frames_out):
+        pos = i * speed
+        f0 = int(pos)
+        f1 = f0 + 1 if f0 < last else last
+        t = pos - f0
+        base0 = f0 * channels
+        base1 = f1 * channels
+        for ch in range(channels):
+            a = samples[base0 + ch]
+            out[i * channels + ch] = int(a + (samples[base1 + ch] - a) * t)
+    return out.tobytes()
+
+class PcmSource(pyglet.media.codecs.base.StaticSource):
+    """ A static source over PCM we already hold in memory (no decoder involved) """
+    def __init__(self, data, audio_format):
+        self._data = data
+        self.audio_format = audio_format
+        self.video_format = None
+        self._duration = len(data) / audio_format.bytes_per_second
+
+class SfxPool:
+    """ Plays one sound effect through a fixed voice budget.
+    Past `max_voices` the oldest voice is stolen, so the number of live players
+    (and the work to start one) stays bounded however fast actions arrive. """
+    def __init__(self, data, fmt, max_voices, pitch_variants=(1.0,)):
+        self.max_voices = max_voices
+        self.voices = collections.deque()
+        self.variants = []
+        self.pcm_bytes = 0
+
+        for speed in pitch_variants:
+            if speed == 1.0 or fmt.sample_size != 16:
+                variant = data
+            else:
+                variant = resample_pcm(data, fmt, speed)
+            self.variants.append(PcmSource(variant, fmt))
+            self.pcm_bytes += len(variant)
+
+    @classmethod
+    def load(cls, path, max_voices, pitch_variants=(1.0,)):
+        """ Decodes the file fully to PCM, then builds the pool """
+        source = arcade.Sound(path).source
+        fmt = source.audio_format
+        data = source.get_queue_source().get_audio_data(int(source.duration * fmt.bytes_per_second) + fmt.bytes_per_sample).data
+        return cls(data, fmt, max_voices, pitch_variants)
+
+    def memory_usage(self):
+        return self.pcm_bytes
+
+    def play(self, volume=1.0, variant=0):
+        # Drop voices that already finished (their player has no source left)
+        while self.voices and self.voices[0].source is None:
+            self.voices.popleft()
+        if len(self.voices) >= self.max_voices:
+            stolen = self.voices.popleft()
+            try: stolen.delete()
+            except Exception: pass
+
+        player = pyglet.media.Player()
+        player.volume = volume
+        player.queue(self.variants[variant])
+        player.play()
+        self.voices.append(player)
+        return player
+
+    def play_random(self, volume=1.0):
+        return self.play(volume, random.randrange(len(self.variants)))
+
+class MusicTrack:
+    """ One looping music track. Music is streamed, so it owns exactly one player
+    for its whole life. Once a fade reaches silence the player is paused (no more
+    decoding or mixing) and a later fade-in resumes it from where it stopped. """
+    def __init__(self, name):
+        self.name = name
+        self.sound = None
+        self.player = None
+        self.target_volume = 0.0
+
+    def fade_to(self, volume, timeline, speed):
+        """ Tweens the volume to `volume` at `speed` per second, starting or resuming the player first """
+        self.target_volume = volume
+        if not self.sound:
+            return
         try:
-            self.bg_music = arcade.Sound(config.MUSIC_BG)
-            self.store_music = arcade.Sound(config.MUSIC_STORE)
-            self.game_over_music = arcade.Sound(config.MUSIC_GAME_OVER)
-            self.card_sound = arcade.Sound(config.SOUND_CARD)
-            self.play_hand_sound = arcade.Sound(config.SOUND_PLAY_HAND)
-            self.buy_joker_sound = arcade.Sound(config.SOUND_BUY_JOKER) 
-            self.mod_sound = arcade.Sound(config.SOUND_MOD)             
+            if self.player is None:
+                if volume <= 0.0:
+                    return
+                self.player = self.sound.play(volume=0.0, loop=True)
+            elif volume > 0.0 and not self.player.playing:
+                self.player.play()
+            current = self.player.volume
         except Exception as e:
-            print(f"Warning: Audio file missing or unreadable. {e}")
-            self.bg_music = None
-            self.store_music = None
-            self.game_over_music = None
-            self.card_sound = None
-            self.play_hand_sound = None
-            self.buy_joker_sound = None
-            self.mod_sound = None
-
-        # Track active players so we can manipulate volume
-        self.bg_player = None
-        self.store_player = None
-        self.game_over_player = None
+            print(f"Warning: Could not start music '{self.name}'. {e}")
+            return
+        timeline.animate(self.set_volume, current, volume, abs(volume - current) / speed,
+                         on_complete=self._fade_done, key=(self, "volume"))
+
+    def set_volume(self, volume):
+        try:
+            self.player.volume = volume
+        except Exception:
+            pass
+
+    def _fade_done(self):
+        try:
+            if self.target_volume == 0.0 and self.player.playing:
+                self.player.pause()
+        except Exception:
+            pass
+
+class AudioManager:
+    """ Handles all sound effects and music cross-fading """
+
+    # Long tracks are streamed with a bounded decode buffer; short SFX stay fully decoded
+    MUSIC_FILES = {
+        "bg": config.MUSIC_BG,
+        "store": config.MUSIC_STORE,
+        "game_over": config.MUSIC_GAME_OVER,
+    }
+    SFX_FILES = {
+        "card": config.SOUND_CARD,
+        "play_hand": config.SOUND_PLAY_HAND,
+        "buy_joker": config.SOUND_BUY_JOKER,
+        "mod": config.SOUND_MOD,
+    }
+
+    def __init__(self, loader=None, bundle=None, timeline=None):
+        # Nothing is decoded here. Sounds are requested from the loader on first
+        # use (or by preload()) and silently skipped until they are ready.
+        self.loader = loader
+        self.bundle = bundle
+        self.timeline = timeline if timeline is not None else tweens.Timeline()
+        self.sounds = {}
+        self.sound_futures = {}
+
+        self.tracks = {name: MusicTrack(name) for name in self.MUSIC_FILES}
+        self.pending_tracks = set()
         
-        # Fading targets
         self.base_volume = 0.5   
-        self.bg_target_volume = self.base_volume
-        self.store_target_volume = 0.5
-        self.game_over_target_volume = 0.5
         
         self.fade_speed = 0.8    
 
+    def preload(self):
+        """ Queue every sound for background decoding """
+        for name in list(self.MUSIC_FILES) + list(self.SFX_FILES):
+            self._request(name)
+
+    def _request(self, name):
+        if name in self.sounds or name in self.sound_futures:
+            return
+        streaming = name in self.MUSIC_FILES
+        path = self.MUSIC_FILES[name] if streaming else self.SFX_FILES[name]
+        if self.loader:
+            if streaming:
+                self.sound_futures[name] = self.loader.load_sound(path, streaming)
+            else:
+                self.sound_futures[name] = self.loader.pool.submit(self._load_sfx, name, path)
+        else:
+            self.sounds[name] = self._load_now(name, path, streaming)
+
+    def _load_sfx(self, name, path):
+        variants = config.CARD_PITCH_VARIANTS if name == "card" else (1.0,)
+        if self.bundle and self.bundle.has_sfx(name):
+            # Already PCM in the bundle, no mp3 decode needed
+            data, channels, sample_size, sample_rate = self.bundle.sfx_pcm(name)
+            fmt = pyglet.media.codecs.base.AudioFormat(channels, sample_size, sample_rate)
+            return SfxPool(data, fmt, config.SFX_MAX_VOICES[name], variants)
+        return SfxPool.load(path, config.SFX_MAX_VOICES[name], variants)
+
+    def _load_now(self, name, path, streaming):
+        try:
+            if streaming:
+                return arcade.Sound(path, streaming=True)
+            return self._load_sfx(name, path)
+        except Exception as e:
+            print(f"Warning: Audio file missing or unreadable. {e}")
+            return None
+
+    def sound(self, name):
+        """ Returns the decoded Sound, or None if it is missing or still loading """
+        if name in self.sounds:
+            return self.sounds[name]
+        self._request(name)
+        future = self.sound_futures.get(name)
+        if future is None or not future.done():
+            return self.sounds.get(name)
+        del self.sound_futures[name]
+        try:
+            self.sounds[name] = future.result()
+        except Exception as e:
+            print(f"Warning: Audio file missing or unreadable. {e}")
+            self.sounds[name] = None
+        return self.sounds[name]
+
+    def get_memory_usage(self):
+        """ Rough resident audio memory in bytes: fully decoded SFX PCM plus the
+        decode buffer each live music stream keeps queued. """
+        sfx_bytes = 0
+        for name in self.SFX_FILES:
+            pool = self.sounds.get(name)
+            if pool:
+                sfx_bytes += pool.memory_usage()
+
+        stream_bytes = 0
+        buffer_seconds = pyglet.media.drivers.base.AbstractAudioPlayer.audio_buffer_length
+        for track in self.tracks.values():
+            if track.sound and track.player:
+                stream_bytes += int(buffer_seconds * track.sound.source.audio_format.bytes_per_second)
+
+        return {"sfx": sfx_bytes, "music_buffers": stream_bytes, "total": sfx_bytes + stream_bytes}
+
     def play_card_sound(self):
-        if self.card_sound:
-            pitch_speed = random.uniform(0.85, 1.2)
-            self.card_sound.play(volume=0.6, speed=pitch_speed)
+        card_sound = self.sound("card")
+        if card_sound:
+            card_sound.play_random(volume=0.6)
 
     def play_hand_fx(self):
-        if self.play_hand_sound:
-            self.play_hand_sound.play(volume=0.8) 
+        play_hand_sound = self.sound("play_hand")
+        if play_hand_sound:
+            play_hand_sound.play(volume=0.8) 
 
     # --- NEW SOUND METHODS ---
     def play_buy_joker_fx(self):
-        if self.buy_joker_sound:
-            self.buy_joker_sound.play(volume=0.8)
+        buy_joker_sound = self.sound("buy_joker")
+        if buy_joker_sound:
+            buy_joker_sound.play(volume=0.8)
             
     def play_mod_fx(self):
-        if self.mod_sound:
-            self.mod_sound.play(volume=1)
+        mod_sound = self.sound("mod")
+        if mod_sound:
+            mod_sound.play(volume=1)
+
+    def active_voice_count(self):
+        return sum(len(self.sounds[name].voices) for name in self.SFX_FILES if self.sounds.get(name))
 
     # --- MUSIC FADING ---
+    def _crossfade_to(self, name):
+        """ Fades every other track out and `name` in (resuming where it paused) """
+        for track in self.tracks.values():
+            if track.name == name:
+                track.sound = self.sound(name)
+                track.fade_to(self.base_volume, self.timeline, self.fade_speed)
+                if track.player is None:
+                    # Still decoding; update() starts it once ready
+                    self.pending_tracks.add(track)
+            else:
+                track.fade_to(0.0, self.timeline, self.fade_speed)
+                self.pending_tracks.discard(track)
+
     def start_bg_music(self):
-        self.bg_target_volume = self.base_volume
-        self.store_target_volume = 0.0
-        self.game_over_target_volume = 0.0
-        
-        if self.bg_music:
-            if self.bg_player:
-                try: self.bg_player.pause()
-                except Exception: pass
-            self.bg_player = self.bg_music.play(volume=0.0, loop=True)
+        self._crossfade_to("bg")
 
     def enter_store(self):
-        self.bg_target_volume = 0.0
-        self.store_target_volume = self.base_volume
-        self.game_over_target_volume = 0.0
-        
-        if self.store_music:
-            if self.store_player:
-                try: self.store_player.pause()
-                except Exception: pass
-            self.store_player = self.store_music.play(volume=0.0, loop=True)
+        self._crossfade_to("store")
 
     def exit_store(self):
         self.start_bg_music()
 
     def enter_game_over(self):
-        self.bg_target_volume = 0.0
-        self.store_target_volume = 0.0
-        self.game_over_target_volume = self.base_volume
-        
-        if self.game_over_music:
-            if self.game_over_player:
-                try: self.game_over_player.pause()
-                except Exception: pass
-            self.game_over_player = self.game_over_music.play(volume=0.0, loop=True)
+        self._crossfade_to("game_over")
+
+    def is_fading(self):
+        """ True while any music player is still moving towards its target volume """
+        if self.pending_tracks:
+            return True
+        return any(self.timeline.is_active((track, "volume")) for track in self.tracks.values())
+
+    def live_player_count(self):
+        return sum(1 for track in self.tracks.values() if track.player and track.player.playing)
 
     def update(self, delta_time):
-        if self.bg_player:
-            try:
-                if self.bg_player.volume < self.bg_target_volume:
-                    self.bg_player.volume = min(self.bg_target_volume, self.bg_player.volume + self.fade_speed * delta_time)
-                elif self.bg_player.volume > self.bg_target_volume:
-                    self.bg_player.volume = max(self.bg_target_volume, self.bg_player.volume - self.fade_speed * delta_time)
-            except Exception: pass
+        # Music that was requested before it finished decoding starts as soon as it's ready.
+        # The fades themselves run on the timeline.
+        for track in list(self.pending_tracks):
+            track.sound = self.sound(track.name)
+            if track.sound:
+                track.fade_to(track.target_volume, self.timeline, self.fade_speed)
+            if track.sound or track.name not in self.sound_futures:
+                self.pending_tracks.discard(track)
 
-        if self.store_player:
-            try:
-                if self.store_player.volume < self.store_target_volume:
-                    self.store_player.volume = min(self.store_target_volume, self.store_player.volume + self.fade_speed * delta_time)
-                elif self.store_player.volume > self.store_target_volume:
-                    self.store_player.volume = max(self.store_target_volume, self.store_player.volume - self.fade_speed * delta_time)
-            except Exception: pass
+# Filter default for DeckManager.count, since None is a real modifier value
+ANY = object()
 
-        if self.game_over_player:
-            try:
-                if self.game_over_player.volume < self.game_over_target_volume:
-                    self.game_over_player.volume = min(self.game_over_target_volume, self.game_over_player.volume + self.fade_speed * delta_time)
-                elif self.game_over_player.volume > self.game_over_target_volume:
-                    self.game_over_player.volume = max(self.game_over_target_volume, self.game_over_player.volume - self.fade_speed * delta_time)
-            except Exception: pass
+class PileIndex:
+    """ Live composition counts for one pile, kept in step with every move """
+    def __init__(self, cards=()):
+        self.total = 0
+        self.by_suit = collections.Counter()
+        self.by_rank = collections.Counter()       # keyed by card.value (2-14)
+        self.by_modifier = collections.Counter()   # None counts unmodified cards
+        self.by_card = collections.Counter()       # (value, suit, modifier) -> copies
+        for card in cards:
+            self.add(card)
+
+    def add(self, card):
+        self.total += 1
+        self.by_suit[card.suit] += 1
+        self.by_rank[card.value] += 1
+        self.by_modifier[card.modifier] += 1
+        self.by_card[(card.value, card.suit, card.modifier)] += 1
+
+    def remove(self, card):
+        self.total -= 1
+        self.by_suit[card.suit] -= 1
+        self.by_rank[card.value] -= 1
+        self.by_modifier[card.modifier] -= 1
+        self.by_card[(card.value, card.suit, card.modifier)] -= 1
 
 class DeckManager:
-    """ Handles the Master Deck, Draw Pile, and Discard Pile logic """
-    def __init__(self):
+    """ Handles the Master Deck, Draw Pile, and Discard Pile logic.
+    Every move goes through draw_card/discard/set_modifier so the pile indexes
+    always answer composition questions in O(1). """
+    SUITS = config.SUITS
+    RANKS = config.RANKS
+
+    def __init__(self, cards=None):
         self.master_deck = []
         self.draw_pile = []
         self.discard_pile = []
-        self._create_initial_deck()
+        if cards is None:
+            self._create_initial_deck()
+        else:
+            self._create_deck_from(cards)
+
+        # Non-destroyed cards in master order, and one index per pile
+        self.valid_cards = [c for c in self.master_deck if c.modifier != "destroy"]
+        self.indexes = {
+            "master": PileIndex(self.valid_cards),
+            "draw": PileIndex(),
+            "discard": PileIndex(),
+        }
+        self.modifier_version = 0   # Bumped on every modifier change
 
     def _create_initial_deck(self):
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-        for suit in suits:
-            for rank in ranks:
-                card = sprites.Card(suit, rank, config.CARD_SCALE)
-                self.master_deck.append(card)
+        for _ in range(config.NUM_DECKS):
+            for suit in self.SUITS:
+                for rank in self.RANKS:
+                    card = sprites.Card(suit, rank, config.CARD_SCALE)
+                    card.deck_index = len(self.master_deck)
+                    card.pile = None
+                    self.master_deck.append(card)
+
+    def _create_deck_from(self, cards):
+        """ Rebuilds a saved deck from (suit, rank, modifier) tuples """
+        for suit, rank, modifier in cards:
+            card = sprites.Card(suit, rank, config.CARD_SCALE)
+            card.modifier = modifier
+            card.deck_index = len(self.master_deck)
+            card.pile = None
+            self.master_deck.append(card)
+
+    def _leave_pile(self, card):
+        if card.pile:
+            self.indexes[card.pile].remove(card)
+            card.pile = None
+
+    def set_piles(self, draw_pile, discard_pile):
+        """ Replaces both piles wholesale (round start, resuming a run) and rebuilds their indexes """
+        for card in self.master_deck:
+            card.pile = None
+        self.draw_pile = draw_pile
+        self.discard_pile = discard_pile
+        for card in draw_pile:
+            card.pile = "draw"
+        for card in discard_pile:
+            card.pile = "discard"
+        self.indexes["draw"] = PileIndex(draw_pile)
+        self.indexes["discard"] = PileIndex(discard_pile)
 
     def start_round(self, visual_card_list):
         """ Resets piles for a new round and repopulates the visual sprite list """
-        self.draw_pile = [c for c in self.master_deck if c.modifier != "destroy"]
-        self.discard_pile = []
-        random.shuffle(self.draw_pile)
-        
-        # Add to Arcade's visual list but keep hidden off-screen
+        draw_pile = list(self.valid_cards)
+        random.shuffle(draw_pile)
+        self.set_piles(draw_pile, [])
+        self.stage_draw_pile(visual_card_list)
+
+    def stage_draw_pile(self, visual_card_list):
+        # Park undrawn cards hidden off-screen. They only join the visual list when drawn,
+        # so per-frame update/draw cost doesn't grow with the size of the deck.
         for card in self.draw_pile:
             card.should_despawn = False
             card.visible = False
-            card.center_x = config.SCREEN_WIDTH + 200
-            card.center_y = config.DRAWN_CARD_Y
+            card.snap_to(config.SCREEN_WIDTH + 200, config.DRAWN_CARD_Y)
+            card.vel_x = 0
+            card.vel_y = 0
             card.target_x = config.SCREEN_WIDTH + 200
             card.target_y = config.DRAWN_CARD_Y
-            if card not in visual_card_list:
-                visual_card_list.append(card)
+            if card in visual_card_list:
+                visual_card_list.remove(card)
 
     def draw_card(self, visual_card_list):
         """ Draws one card. Deck is finite per round; no recycling! """
         # Try to draw
         if len(self.draw_pile) > 0:
             card = self.draw_pile.pop()
+            self._leave_pile(card)
             card.visible = True
             card.should_despawn = False 
+            if card not in visual_card_list:
+                visual_card_list.append(card)
             return card
         return None
+
+    def discard(self, card):
+        """ Played or swapped-out cards land here until the round ends """
+        self._leave_pile(card)
+        self.discard_pile.append(card)
+        card.pile = "discard"
+        self.indexes["discard"].add(card)
+
+    def set_modifier(self, card, modifier):
+        """ Applies a pack modifier, keeping every index (and the valid list) current """
+        if card.modifier == modifier:
+            return
+        was_valid = card.modifier != "destroy"
+        if was_valid:
+            self.indexes["master"].remove(card)
+        if card.pile:
+            self.indexes[card.pile].remove(card)
+
+        card.modifier = modifier
+        self.modifier_version += 1
+
+        if modifier != "destroy":
+            self.indexes["master"].add(card)
+            if not was_valid:
+                self.valid_cards = [c for c in self.master_deck if c.modifier != "destroy"]
+        elif was_valid:
+            # Destroying is rare (pack screen only), so an O(n) removal is fine here
+            self.valid_cards.remove(card)
+        if card.pile:
+            self.indexes[card.pile].add(card)
+
+    def restore_modifiers(self, modifiers):
+        """ Puts back every card's modifier at once (practice undo); call set_piles() after """
+        for card, modifier in zip(self.master_deck, modifiers):
+            card.modifier = modifier
+        self.valid_cards = [c for c in self.master_deck if c.modifier != "destroy"]
+        self.indexes["master"] = PileIndex(self.valid_cards)
+        self.modifier_version += 1
+
+    # --- Composition Queries (all O(1)) ---
+    def count(self, pile="draw", suit=None, rank=None, modifier=ANY):
+        """ How many cards in `pile` ("master", "draw" or "discard") match ONE filter,
+        e.g. count("draw", suit="Clubs"), count("master", rank=14) or count(modifier=None). """
+        index = self.indexes[pile]
+        if suit is not None:
+            return index.by_suit[suit]
+        if rank is not None:
+            return index.by_rank[rank]
+        if modifier is not ANY:
+            return index.by_modifier[modifier]
+        return index.total
+
+    def valid_count(self):
+        return self.indexes["master"].total
     
     def get_deck_counts(self):
         """ Returns (current_cards_in_draw_pile, total_valid_cards) """
-        total = len([c for c in self.master_deck if c.modifier != "destroy"])
         # Now strictly reflects what is left to draw in the current round
-        current = len(self.draw_pile) 
-        return current, total
+        return self.indexes["draw"].total, self.indexes["master"].total
 
 class ShopManager:
     """ Handles generating shop items and Pack cards """
     
-    def generate_shop(self, shop_list, shop_buttons, current_jokers):
+    def generate_shop(self, shop_list, shop_buttons, current_jokers, offers=None):
+        """ Rolls a new shop, or rebuilds exactly `offers` ("Pack" or joker keys) when resuming """
         shop_list.clear()
         shop_buttons.clear()
         
         # 1. Determine Slots (Pack, Joker, Random)
-        slots = ['Pack', 'Joker']
-        slots.append(random.choice(['Pack', 'Joker']))
+        if offers is None:
+            slots = ['Pack', 'Joker']
+            slots.append(random.choice(['Pack', 'Joker']))
+        else:
+            slots = ['Pack' if o == 'Pack' else 'Joker' for o in offers]
         
         owned_keys = [j.key for j in current_jokers]
         available_jokers = [k for k in config.JOKER_DATA.keys() if k not in owned_keys]
@@ -197,13 +566,15 @@ class ShopManager:
                 btn = ui_elements.TextButton(pos_x, pos_y - 170, 120, 40, f"BUY ${config.PACK_COST}", config.COLOR_PURPLE)
                 shop_buttons.append(btn)
                 
-            elif item_type == 'Joker' and available_jokers:
-                key = random.choice(available_jokers)
-                available_jokers.remove(key)
+            elif item_type == 'Joker' and (offers is not None or available_jokers):
+                if offers is not None:
+                    key = offers[i]
+                else:
+                    key = random.choice(available_jokers)
+                    available_jokers.remove(key)
                 
                 item = sprites.Joker(key, config.JOKER_SCALE)
-                item._phys_x = pos_x
-                item._phys_y = pos_y
+                item.snap_to(pos_x, pos_y)
                 item.target_x = pos_x
                 item.target_y = pos_y
                 shop_list.append(item)
@@ -211,11 +582,10 @@ class ShopManager:
                 btn = ui_elements.TextButton(pos_x, pos_y - 170, 120, 40, f"BUY ${item.cost}", config.COLOR_BTN_SHOP)
                 shop_buttons.append(btn)
 
-    def get_pack_cards(self, master_deck):
+    def get_pack_cards(self, valid_cards):
         """ Selects 8 random valid cards for the pack opening screen """
-        available = [c for c in master_deck if c.modifier != "destroy"]
-        num = min(8, len(available))
-        return random.sample(available, num)
+        num = min(8, len(valid_cards))
+        return random.sample(valid_cards, num)
 
     def get_pack_modifiers(self):
         """ Returns 2 random modifier keys """
@@ -0,0 +1,102 @@
+import heapq
+import itertools
+
+# --- Tweens ---
+# One Timeline owns every time-based animation (music fades, card fly-offs, the destroy
+# fade). Only tweens in flight are stored: a dict of active tweens for per-tick updates
+# and a heap ordered by end time for completions, so a tick costs O(active tweens) no
+# matter how many sprites exist. advance() handles any step size: tweens finish (and
+# their callbacks run) in end-time order, at their own end time, even in one big step.
+
+# --- Easing (t in 0..1 -> 0..1) ---
+def linear(t):
+    return t
+
+def ease_in_quad(t):
+    return t * t
+
+def ease_out_quad(t):
+    return t * (2 - t)
+
+def ease_in_out_quad(t):
+    return 2 * t * t if t < 0.5 else 1 - 2 * (1 - t) * (1 - t)
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+class Tween:
+    __slots__ = ("apply", "start", "end", "start_time", "end_time", "ease", "on_complete", "key", "active")
+
+    def __init__(self, apply, start, end, start_time, duration, ease, on_complete, key):
+        self.apply = apply
+        self.start = start
+        self.end = end
+        self.start_time = start_time
+        self.end_time = start_time + max(0.0, duration)
+        self.ease = ease
+        self.on_complete = on_complete
+        self.key = key
+        self.active = True
+
+    def value_at(self, now):
+        span = self.end_time - self.start_time
+        t = 1.0 if span <= 0 else min(1.0, max(0.0, (now - self.start_time) / span))
+        return self.start + (self.end - self.start) * self.ease(t)
+
+class Timeline:
+    def __init__(self):
+        self.now = 0.0
+        self.active = {}            # key -> Tween
+        self.heap = []              # (end_time, seq, Tween); cancelled entries are skipped lazily
+        self.seq = itertools.count()
+
+    def animate(self, apply, start, end, duration, ease=linear, on_complete=None, key=None):
+        """ Calls apply(value) every tick while value goes start -> end over `duration` seconds.
+        A tween with the same key is cancelled first (a new fade replaces the old one). """
+        if key is None:
+            key = object()
+        self.cancel(key)
+        tween = Tween(apply, start, end, self.now, duration, ease, on_complete, key)
+        self.active[key] = tween
+        heapq.heappush(self.heap, (tween.end_time, next(self.seq), tween))
+        return tween
+
+    def tween(self, obj, attr, end, duration, ease=linear, on_complete=None):
+        """ animate() on an attribute, starting from its current value """
+        return self.animate(lambda v: setattr(obj, attr, v), getattr(obj, attr), end, duration,
+                            ease, on_complete, key=(obj, attr))
+
+    def call_later(self, delay, callback, key=None):
+        return self.animate(_ignore, 0.0, 0.0, delay, on_complete=callback, key=key)
+
+    def cancel(self, key):
+        """ Stops a tween where it is, without its callback """
+        tween = self.active.pop(key, None)
+        if tween:
+            tween.active = False
+
+    def is_active(self, key):
+        return key in self.active
+
+    def active_count(self):
+        return len(self.active)
+
+    def advance(self, dt):
+        target = self.now + dt
+        heap = self.heap
+        while heap and heap[0][0] <= target:
+            end_time, _, tween = heapq.heappop(heap)
+            if not tween.active:
+                continue
+            self.now = max(self.now, end_time)
+            del self.active[tween.key]
+            tween.active = False
+            tween.apply(tween.end)
+            if tween.on_complete:
+                tween.on_complete()
+        self.now = target
+        for tween in list(self.active.values()):
+            tween.apply(tween.value_at(target))
+
+def _ignore(value):
+    pass
@@ -45,6 +45,15 @@ class TextButton:
     def is_clicked(self, x, y):
         return self.visible and self.active and self.is_hovered
 
+def hand_layout(count):
+    """ (start_x, spacing) for a row of `count` cards centred on screen.
+    Big hands squeeze together so they stay clear of the PLAY HAND button. """
+    spacing = config.CARD_WIDTH + 20
+    if count * spacing > config.HAND_MAX_WIDTH:
+        spacing = config.HAND_MAX_WIDTH / count
+    start_x = (config.SCREEN_WIDTH - count * spacing) / 2 + config.CARD_WIDTH / 2
+    return start_x, spacing
+
 def get_rotated_points(cx, cy, w, h, angle_deg):
     """ Helper to calculate the 4 corners of a rotated rectangle """
     angle_rad = math.radians(angle_deg)
@@ -100,15 +109,17 @@ def draw_shadows(sprite_list):
 
         arcade.draw_polygon_filled(points, config.COLOR_SHADOW)
 
-def draw_tooltip(hovered_joker, mouse_x, mouse_y):
+def draw_tooltip(hovered_joker, mouse_x, mouse_y, advice=None):
+    """ `advice`: optional extra lines (shop offer estimates) under the description """
     if not hovered_joker:
         return
 
     name_text = hovered_joker.name
     desc_text = hovered_joker.desc
+    advice = advice or []
     
     width = 220
-    height = 80
+    height = 80 + 18 * len(advice)
 
     tip_x = mouse_x + 20
     tip_y = mouse_y - 20
@@ -121,4 +132,6 @@ def draw_tooltip(hovered_joker, mouse_x, mouse_y):
     arcade.draw_rect_outline(bg_rect, config.COLOR_WHITE, 1)
     
     arcade.draw_text(name_text, tip_x + 10, tip_y - 25, config.COLOR_GOLD, 14, bold=True)
-    arcade.draw_text(desc_text, tip_x + 10, tip_y - 50, config.COLOR_WHITE, 12)
\ No newline at end of file
+    arcade.draw_text(desc_text, tip_x + 10, tip_y - 50, config.COLOR_WHITE, 12)
+    for i, line in enumerate(advice):
+        arcade.draw_text(line, tip_x + 10, tip_y - 80 - 18 * i, config.COLOR_GOLD, 11)
\ No newline at end of file
@@ -0,0 +1,81 @@
+import sys
+import json
+import asyncio
+import argparse
+
+import config
+
+# --- Spectator Viewer ---
+# Minimal terminal viewer for the spectator stream: applies keyframes and deltas to a
+# local copy of the state and redraws it. No arcade needed, so it runs anywhere.
+
+SUIT_SYMBOLS = {"H": "♥", "D": "♦", "C": "♣", "S": "♠"}
+
+def pretty_card(code):
+    rank = code.rstrip("+mcx")
+    rank, suit = rank[:-1], rank[-1]
+    return f"{rank}{SUIT_SYMBOLS.get(suit, suit)}{code[len(rank) + 1:]}"
+
+def apply_frame(state, frame):
+    """ Returns the new state, or None if a delta arrived before any keyframe """
+    if frame.get("k"):
+        return dict(frame["s"])
+    if state is None:
+        return None
+    for key, value in frame["d"].items():
+        if value is None:
+            state.pop(key, None)
+        else:
+            state[key] = value
+    return state
+
+def render(state, tick, out=sys.stdout):
+    lines = [
+        f"WARLATRO  [{state.get('state', '?').upper()}]  tick {tick}",
+        f"Level {state.get('level')}   Score {state.get('score')} / {state.get('target')}   "
+        f"Hands {state.get('hands')}   Discards {state.get('discards')}   ${state.get('coins')}",
+        "",
+        "Jokers: " + (", ".join(state.get("jokers") or []) or "-"),
+        "Hand:   " + (" ".join(pretty_card(c) for c in state.get("hand") or []) or "-"),
+        "Drawn:  " + (pretty_card(state["drawn"]) if state.get("drawn") else "-"),
+    ]
+    if "shop" in state:
+        lines.append("Shop:   " + (", ".join(state["shop"]) or "sold out"))
+    if state.get("details"):
+        lines.append("Last:   " + " ".join(state["details"]))
+    if state.get("message"):
+        lines += ["", *state["message"].splitlines()]
+    # Clear screen, home the cursor, draw
+    out.write("\x1b[2J\x1b[H" + "\n".join(lines) + "\n")
+    out.flush()
+
+async def watch(host, port):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    state = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            frame = json.loads(line)
+            state = apply_frame(state, frame)
+            if state is not None:
+                render(state, frame["t"])
+    finally:
+        writer.close()
+    print("Stream closed")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a running Warlatro game")
+    parser.add_argument("--host", default=config.SPECTATE_HOST)
+    parser.add_argument("--port", type=int, default=config.SPECTATE_PORT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(watch(args.host, args.port))
+    except ConnectionRefusedError:
+        print(f"Nothing is publishing on {args.host}:{args.port} (start the game with {config.SPECTATE_ENV}=1)")
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()